@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
+        from kaizen_backend import caching  # noqa: F401 - registers the shared cache check
@@ -0,0 +1,104 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from departments.models import Department
+from .models import User
+from .tokens import PrecheckedRefreshToken
+
+
+TOKEN_VERSION_CACHE_TTL = getattr(settings, 'TOKEN_VERSION_CACHE_TTL', 30)
+
+# Cached version for users that are inactive or no longer exist.
+REVOKED_VERSION = -1
+
+USER_CLAIM_FIELDS = ['username', 'email', 'first_name', 'last_name', 'role', 'is_hod', 'is_manager']
+
+
+def _token_version_key(user_id):
+    return f'accounts:token_version:{user_id}'
+
+
+def cache_token_version(user):
+    """Store the user's current token version in the shared version map."""
+    version = user.token_version if user.is_active else REVOKED_VERSION
+    cache.set(_token_version_key(user.pk), version, TOKEN_VERSION_CACHE_TTL)
+
+
+def revoke_token_version(user_id):
+    cache.set(_token_version_key(user_id), REVOKED_VERSION, TOKEN_VERSION_CACHE_TTL)
+
+
+def get_token_version(user_id):
+    """Return the user's current token version, hitting the database only on a cache miss."""
+    version = cache.get(_token_version_key(user_id))
+    if version is None:
+        row = User.objects.filter(pk=user_id).values_list('token_version', 'is_active').first()
+        version = row[0] if row and row[1] else REVOKED_VERSION
+        cache.set(_token_version_key(user_id), version, TOKEN_VERSION_CACHE_TTL)
+    return version
+
+
+def add_user_claims(token, user):
+    """Embed the user's identity, role and department in a token."""
+    for field in USER_CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    department = user.department
+    token['department_id'] = department.id if department else None
+    token['department_name'] = department.name if department else None
+    token['department_display_name'] = department.display_name if department else None
+    token['ver'] = user.token_version
+    return token
+
+
+def tokens_for_user(user):
+    """Issue a refresh token (and derived access token) carrying user claims."""
+    return add_user_claims(PrecheckedRefreshToken.for_user(user), user)
+
+
+def user_from_claims(token):
+    """Build a read-only User instance from token claims without querying the database."""
+    user = User(
+        id=token[api_settings.USER_ID_CLAIM],
+        is_active=True,
+        department_id=token.get('department_id'),
+        token_version=token['ver'],
+        **{field: token.get(field) for field in USER_CLAIM_FIELDS}
+    )
+    if user.department_id:
+        user.department = Department(
+            id=user.department_id,
+            name=token.get('department_name'),
+            display_name=token.get('department_display_name'),
+        )
+    user._state.adding = False
+    user._state.db = 'default'
+    user._from_token_claims = True
+    return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWT authentication that trusts embedded user claims.
+
+    Tokens issued by ``tokens_for_user`` carry role and department claims
+    plus a version number. Instead of loading the User row per request the
+    version is checked against a short-TTL cached map, so disabling a user
+    or changing their role revokes outstanding tokens within
+    ``TOKEN_VERSION_CACHE_TTL`` seconds (immediately in the same cache).
+    Tokens without claims fall back to the database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if 'ver' not in validated_token:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise AuthenticationFailed('Token contained no recognizable user identification', code='token_not_valid')
+
+        if get_token_version(user_id) != validated_token['ver']:
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+
+        return user_from_claims(validated_token)
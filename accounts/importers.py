@@ -0,0 +1,204 @@
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from departments.catalog import resolve_department
+from .models import User
+
+
+HEADER_ALIASES = {
+    'email': 'email',
+    'username': 'username',
+    'first name': 'first_name',
+    'first_name': 'first_name',
+    'last name': 'last_name',
+    'last_name': 'last_name',
+    'role': 'role',
+    'department': 'department',
+    'is active': 'is_active',
+    'is_active': 'is_active',
+    'password': 'password',
+}
+
+VALID_ROLES = {role for role, _ in User.ROLE_CHOICES}
+INACTIVE_VALUES = {'inactive', 'false', 'no', '0'}
+
+
+def _init_hash_worker():
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kaizen_backend.settings')
+    django.setup()
+
+
+def _hash_password(password):
+    # An empty password yields an unusable hash; the user must reset it.
+    return make_password(password or None)
+
+
+def read_csv_rows(stream):
+    """Yield ``(line_number, row)`` from a CSV stream with normalised header names."""
+    reader = csv.reader(stream)
+    try:
+        header = next(reader)
+    except StopIteration:
+        return
+    fields = [HEADER_ALIASES.get(h.strip().lower()) for h in header]
+    for line_number, values in enumerate(reader, start=2):
+        if not any(v.strip() for v in values):
+            continue
+        yield line_number, {f: v.strip() for f, v in zip(fields, values) if f}
+
+
+class UserImporter:
+    """Bulk user provisioning from CSV rows.
+
+    Rows are validated in chunks against the cached department catalog and one
+    existence query per chunk, passwords are hashed in a pool and valid users
+    are inserted with ``bulk_create``. The management command hashes in a
+    process pool; web requests use threads (``processes=False``), since
+    PBKDF2 releases the GIL and forking a server worker per upload is not safe.
+    """
+
+    def __init__(self, chunk_size=1000, workers=None, processes=False, default_password=None, dry_run=False, log=None):
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.processes = processes
+        self.default_password = default_password
+        self.dry_run = dry_run
+        self.log = log or (lambda message: None)
+        self.seen_emails = set()
+        self.seen_usernames = set()
+        self.summary = {'created': 0, 'skipped': 0, 'errors': [], 'rows': 0, 'seconds': 0.0}
+
+    def run(self, rows):
+        start = time.perf_counter()
+
+        with self._hash_pool() as pool:
+            rows = iter(rows)
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                chunk_start = time.perf_counter()
+                created = self._import_chunk(chunk, pool)
+                ms_per_thousand = (time.perf_counter() - chunk_start) / len(chunk) * 1000 * 1000
+                self.summary['rows'] += len(chunk)
+                self.log(
+                    f'Rows {chunk[0][0]}-{chunk[-1][0]}: {created} created, '
+                    f'{ms_per_thousand:.0f} ms per 1,000 rows'
+                )
+
+        self.summary['seconds'] = round(time.perf_counter() - start, 2)
+        if self.summary['created'] and not self.dry_run:
+            from .views import bump_user_list_version
+            bump_user_list_version()
+        return self.summary
+
+    def _hash_pool(self):
+        if self.processes:
+            return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_hash_worker)
+        return ThreadPoolExecutor(max_workers=self.workers)
+
+    def _validate(self, line_number, row):
+        email = row.get('email', '').lower()
+        try:
+            validate_email(email)
+        except ValidationError:
+            raise ValueError(f"Invalid email '{email}'")
+
+        role = (row.get('role') or 'INITIATOR').upper()
+        if role not in VALID_ROLES:
+            raise ValueError(f"Invalid role '{role}'")
+
+        department = None
+        department_name = row.get('department', '')
+        if department_name:
+            # Accept both the department code and its display name.
+            department = resolve_department(department_name, lenient=True)
+            if department is None:
+                raise ValueError(f"Department '{department_name}' does not exist")
+
+        return User(
+            username=row.get('username') or email.split('@')[0],
+            email=email,
+            first_name=row.get('first_name', ''),
+            last_name=row.get('last_name', ''),
+            role=role,
+            department=department,
+            is_manager=role == 'MANAGER',
+            is_hod=role == 'HOD',
+            is_active=row.get('is_active', '').lower() not in INACTIVE_VALUES,
+        )
+
+    def _import_chunk(self, chunk, pool):
+        candidates = []
+        passwords = []
+        for line_number, row in chunk:
+            try:
+                user = self._validate(line_number, row)
+            except ValueError as e:
+                self.summary['errors'].append({'line': line_number, 'error': str(e)})
+                continue
+            candidates.append((line_number, user))
+            passwords.append(row.get('password') or self.default_password)
+
+        emails = [u.email for _, u in candidates]
+        usernames = [u.username for _, u in candidates]
+        existing = set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+        # Emails too, since they are the fallback username.
+        taken_usernames = set(
+            User.objects.filter(username__in=usernames + emails).values_list('username', flat=True)
+        )
+
+        users = []
+        lines = []
+        user_passwords = []
+        for (line_number, user), password in zip(candidates, passwords):
+            if user.email in existing or user.email in self.seen_emails:
+                self.summary['skipped'] += 1
+                continue
+            if user.username in taken_usernames or user.username in self.seen_usernames:
+                if user.email in taken_usernames or user.email in self.seen_usernames:
+                    self.summary['errors'].append(
+                        {'line': line_number, 'error': f"Username '{user.username}' is already taken"}
+                    )
+                    continue
+                user.username = user.email
+            self.seen_emails.add(user.email)
+            self.seen_usernames.add(user.username)
+            users.append(user)
+            lines.append(line_number)
+            user_passwords.append(password)
+
+        hashes = pool.map(_hash_password, user_passwords, chunksize=max(1, len(user_passwords) // 32))
+        for user, password_hash in zip(users, hashes):
+            user.password = password_hash
+
+        if users and not self.dry_run:
+            try:
+                with transaction.atomic():
+                    User.objects.bulk_create(users, batch_size=self.chunk_size)
+            except IntegrityError:
+                # Someone else created a clashing user since the checks above.
+                users = self._create_individually(lines, users)
+        self.summary['created'] += len(users)
+        return len(users)
+
+    def _create_individually(self, lines, users):
+        created = []
+        for line_number, user in zip(lines, users):
+            try:
+                with transaction.atomic():
+                    User.objects.bulk_create([user])
+            except IntegrityError:
+                self.summary['errors'].append(
+                    {'line': line_number, 'error': f"User '{user.username}' already exists"}
+                )
+            else:
+                created.append(user)
+        return created
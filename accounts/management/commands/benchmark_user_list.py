@@ -0,0 +1,75 @@
+import time
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.test import APIClient
+from accounts.models import User
+from departments.models import Department
+
+
+SCENARIOS = [
+    ('first page', '/api/auth/users/'),
+    ('page size 200', '/api/auth/users/?page_size=200'),
+    ('search prefix', '/api/auth/users/?search=bench.user.12'),
+    ('search name', '/api/auth/users/?search=Bench'),
+    ('filter role', '/api/auth/users/?role=MANAGER'),
+    ('filter role + department', '/api/auth/users/?role=HOD&department=ASSEMBLY'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the user list endpoint against a large synthetic user table (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50000, help='Synthetic users to create')
+        parser.add_argument('--repeat', type=int, default=5, help='Requests per scenario')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self._seed(options['users'])
+            self._run(options['repeat'])
+            transaction.set_rollback(True)
+        cache.clear()
+
+    def _seed(self, count):
+        departments = list(Department.objects.all())
+        roles = [r for r, _ in User.ROLE_CHOICES if r != 'ADMIN']
+        start = time.perf_counter()
+        User.objects.bulk_create(
+            [
+                User(
+                    username=f'bench.user.{i}',
+                    email=f'bench.user.{i}@example.com',
+                    first_name=f'Bench{i % 1000}',
+                    last_name=f'User{i}',
+                    role=roles[i % len(roles)],
+                    department=departments[i % len(departments)] if departments else None,
+                    password='!',
+                )
+                for i in range(count)
+            ],
+            batch_size=2000,
+        )
+        self.stdout.write(f'Seeded {count} users in {time.perf_counter() - start:.1f}s')
+
+    def _run(self, repeat):
+        client = APIClient()
+        client.force_authenticate(User.objects.filter(role='ADMIN').first() or User.objects.first())
+
+        for label, url in SCENARIOS:
+            cache.clear()
+            queries = []
+            with connection.execute_wrapper(lambda execute, sql, *a: queries.append(sql) or execute(sql, *a)):
+                start = time.perf_counter()
+                response = client.get(url)
+                cold = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                client.get(url)
+            warm = (time.perf_counter() - start) / repeat
+
+            self.stdout.write(
+                f'  {label:<26} status={response.status_code} rows={len(response.data.get("results", []))} '
+                f'queries={len(queries)} cold={cold * 1000:.1f}ms cached={warm * 1000:.1f}ms'
+            )
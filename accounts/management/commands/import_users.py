@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from accounts.importers import UserImporter, read_csv_rows
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create users from a CSV file (columns as in exports/users.csv, optional Username/Password)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help='Path to the users CSV file')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows validated and inserted per batch')
+        parser.add_argument('--workers', type=int, default=None, help='Password hashing processes (default: CPU count)')
+        parser.add_argument('--default-password', default=None, help='Password for rows without a Password column')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and hash without inserting')
+
+    def handle(self, *args, **options):
+        importer = UserImporter(
+            chunk_size=options['chunk_size'],
+            workers=options['workers'],
+            processes=True,
+            default_password=options['default_password'],
+            dry_run=options['dry_run'],
+            log=lambda message: self.stdout.write(f'  {message}'),
+        )
+
+        try:
+            with open(options['csv_path'], newline='', encoding='utf-8-sig') as stream:
+                summary = importer.run(read_csv_rows(stream))
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for error in summary['errors']:
+            self.stdout.write(self.style.WARNING(f"  Line {error['line']}: {error['error']}"))
+
+        rate = summary['rows'] / summary['seconds'] if summary['seconds'] else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Validated' if options['dry_run'] else 'Imported'} {summary['created']} users "
+            f"({summary['skipped']} existing skipped, {len(summary['errors'])} errors) "
+            f"from {summary['rows']} rows in {summary['seconds']}s ({rate:,.0f} rows/s)"
+        ))
@@ -0,0 +1,48 @@
+import time
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+
+
+class Command(BaseCommand):
+    help = 'Delete expired outstanding and blacklisted refresh tokens in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Tokens deleted per batch')
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between batches')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many tokens would be deleted')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        now = timezone.now()
+        expired = OutstandingToken.objects.filter(expires_at__lt=now)
+
+        if options['dry_run']:
+            self.stdout.write(
+                f'{expired.count()} expired outstanding tokens, '
+                f'{BlacklistedToken.objects.filter(token__expires_at__lt=now).count()} of them blacklisted'
+            )
+            return
+
+        total_outstanding = 0
+        total_blacklisted = 0
+        start = time.monotonic()
+
+        while True:
+            ids = list(expired.order_by('id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+
+            blacklisted, _ = BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            outstanding, _ = OutstandingToken.objects.filter(id__in=ids).delete()
+            total_blacklisted += blacklisted
+            total_outstanding += outstanding
+
+            self.stdout.write(f'  Deleted batch of {len(ids)} expired tokens')
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Pruned {total_outstanding} outstanding and {total_blacklisted} blacklisted tokens '
+            f'in {time.monotonic() - start:.1f}s'
+        ))
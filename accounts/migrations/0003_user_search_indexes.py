@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:16
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_token_version'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('departments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Upper('username'), name='dj_users_username_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Upper('first_name'), name='dj_users_first_name_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Upper('last_name'), name='dj_users_last_name_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Upper('email'), name='dj_users_email_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'department'], name='dj_users_role_dept_idx'),
+        ),
+    ]
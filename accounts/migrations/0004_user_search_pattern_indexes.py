@@ -0,0 +1,58 @@
+from django.db import migrations
+
+
+SEARCH_COLUMNS = ['username', 'first_name', 'last_name', 'email']
+
+
+def _index_name(column):
+    return f'dj_users_{column}_prefix_idx'
+
+
+def create_prefix_indexes(apps, schema_editor):
+    # ``istartswith`` compiles to UPPER(col::text) LIKE 'X%' on PostgreSQL,
+    # which needs a pattern operator class, and to a case-insensitive LIKE on
+    # SQLite, which can only use a NOCASE index.
+    vendor = schema_editor.connection.vendor
+    for column in SEARCH_COLUMNS:
+        if vendor == 'postgresql':
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {_index_name(column)} '
+                f'ON dj_users (UPPER({column}::text) text_pattern_ops)'
+            )
+        elif vendor == 'sqlite':
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {_index_name(column)} ON dj_users ({column} COLLATE NOCASE)'
+            )
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor in ('postgresql', 'sqlite'):
+        for column in SEARCH_COLUMNS:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {_index_name(column)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user',
+            name='dj_users_username_upper_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='dj_users_first_name_upper_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='dj_users_last_name_upper_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='dj_users_email_upper_idx',
+        ),
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
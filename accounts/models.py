@@ -2,6 +2,10 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 
 
+# Changes to these revoke the user's issued tokens (see accounts.authentication).
+TOKEN_FIELDS = ['role', 'department_id', 'is_hod', 'is_manager', 'is_active', 'password']
+
+
 class User(AbstractUser):
     ROLE_CHOICES = [
         ('INITIATOR', 'Initiator'),
@@ -22,9 +26,41 @@ class User(AbstractUser):
     )
     is_hod = models.BooleanField(default=False)
     is_manager = models.BooleanField(default=False)
+    token_version = models.PositiveIntegerField(default=0)
     
     class Meta:
         db_table = 'dj_users'
+        # The prefix search indexes need a pattern operator class (PostgreSQL)
+        # or NOCASE collation (SQLite) and are created in migration 0004.
+        indexes = [
+            models.Index(fields=['role', 'department'], name='dj_users_role_dept_idx'),
+        ]
     
     def __str__(self):
         return f"{self.get_full_name() or self.username} ({self.role})"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_token_fields = {
+            name: value for name, value in zip(field_names, values)
+            if name in TOKEN_FIELDS
+        }
+        return instance
+    
+    def save(self, *args, **kwargs):
+        if getattr(self, '_from_token_claims', False):
+            raise RuntimeError(
+                'User instances built from token claims are read-only; '
+                'load the user from the database before saving.'
+            )
+        # Role, department, status and credential changes revoke issued tokens,
+        # whichever path (API, admin, shell) saves them.
+        loaded = getattr(self, '_loaded_token_fields', None)
+        if loaded and any(name in loaded and loaded[name] != getattr(self, name) for name in TOKEN_FIELDS):
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'token_version' not in update_fields:
+                kwargs['update_fields'] = [*update_fields, 'token_version']
+        super().save(*args, **kwargs)
+        self._loaded_token_fields = {name: getattr(self, name) for name in TOKEN_FIELDS}
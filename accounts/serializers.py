@@ -1,21 +1,8 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
 from .models import User
-from departments.models import Department
-
-
-class DepartmentField(serializers.Field):
-    """Custom field that accepts department name string and returns Department object."""
-    
-    def to_representation(self, value):
-        return value.name if value else None
-    
-    def to_internal_value(self, data):
-        if not data:
-            return None
-        try:
-            return Department.objects.get(name=data)
-        except Department.DoesNotExist:
-            raise serializers.ValidationError(f"Department '{data}' does not exist")
+from departments.serializers import DepartmentField
+from .tokens import PrecheckedRefreshToken
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -64,6 +51,7 @@ class UserUpdateSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         if password:
             instance.set_password(password)
+        # User.save() bumps token_version if role, department, status or password changed.
         instance.save()
         return instance
 
@@ -77,7 +65,7 @@ class LoginSerializer(serializers.Serializer):
         password = data.get('password')
         
         try:
-            user = User.objects.get(email=email)
+            user = User.objects.select_related('department').get(email=email)
         except User.DoesNotExist:
             raise serializers.ValidationError('Invalid credentials')
         
@@ -89,3 +77,8 @@ class LoginSerializer(serializers.Serializer):
         
         data['user'] = user
         return data
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """Token refresh that prechecks the blacklist against the in-memory Bloom filter."""
+    token_class = PrecheckedRefreshToken
@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from .authentication import cache_token_version, revoke_token_version
+from .models import User
+from .tokens import mark_recently_blacklisted
+from .views import bump_user_list_version
+
+
+@receiver(post_save, sender=User)
+def refresh_token_version(sender, instance, **kwargs):
+    cache_token_version(instance)
+    # After commit, so no process caches the list from the old rows under the new version.
+    transaction.on_commit(bump_user_list_version)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    revoke_token_version(instance.pk)
+    transaction.on_commit(bump_user_list_version)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def mark_blacklisted_token(sender, instance, created, **kwargs):
+    if created:
+        mark_recently_blacklisted(instance.token.jti)
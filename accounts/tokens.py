@@ -0,0 +1,116 @@
+import hashlib
+import math
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from kaizen_backend.caching import cache_is_shared
+
+
+BLOOM_REFRESH_SECONDS = getattr(settings, 'TOKEN_BLACKLIST_BLOOM_REFRESH', 300)
+BLOOM_ERROR_RATE = 0.01
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing."""
+
+    def __init__(self, capacity, error_rate=BLOOM_ERROR_RATE):
+        capacity = max(int(capacity), 1)
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+def _recent_blacklist_key(jti):
+    return f'accounts:blacklisted:{jti}'
+
+
+def mark_recently_blacklisted(jti):
+    """Remember a newly blacklisted JTI until every process has rebuilt its filter."""
+    cache.set(_recent_blacklist_key(jti), True, BLOOM_REFRESH_SECONDS * 2)
+
+
+class BlacklistPrecheck:
+    """Process-local Bloom filter of blacklisted refresh token JTIs.
+
+    A negative answer from the filter, combined with the recently-blacklisted
+    markers kept in the cache for twice the rebuild interval, proves that a
+    token is not blacklisted, so the common case skips the database. Positive
+    answers (including false positives) fall through to the real lookup.
+    The markers must be visible to every worker, so with a process-local
+    cache every check goes to the database.
+    """
+
+    def __init__(self, refresh_seconds=BLOOM_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._filter = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def rebuild(self):
+        jtis = list(
+            BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+            .values_list('token__jti', flat=True)
+            .iterator()
+        )
+        bloom = BloomFilter(capacity=max(len(jtis) * 2, 1024))
+        for jti in jtis:
+            bloom.add(jti)
+        self._filter = bloom
+        self._built_at = time.monotonic()
+        return bloom
+
+    def _current_filter(self):
+        if self._filter is None or time.monotonic() - self._built_at > self.refresh_seconds:
+            with self._lock:
+                if self._filter is None or time.monotonic() - self._built_at > self.refresh_seconds:
+                    self.rebuild()
+        return self._filter
+
+    def add(self, jti):
+        if self._filter is not None:
+            self._filter.add(jti)
+
+    def might_be_blacklisted(self, jti):
+        if not cache_is_shared():
+            # Blacklist writes in other processes would be invisible here for up
+            # to the rebuild interval, so always check the table.
+            return True
+        if jti in self._current_filter():
+            return True
+        return cache.get(_recent_blacklist_key(jti)) is not None
+
+
+blacklist_precheck = BlacklistPrecheck()
+
+
+class PrecheckedRefreshToken(RefreshToken):
+    """Refresh token whose blacklist check consults the Bloom filter first."""
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if not blacklist_precheck.might_be_blacklisted(jti):
+            return
+        super().check_blacklist()
+
+    def blacklist(self):
+        blacklisted = super().blacklist()
+        blacklist_precheck.add(self.payload[api_settings.JTI_CLAIM])
+        return blacklisted
@@ -1,6 +1,6 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
-from .views import login_view, logout_view, me_view, UserListView, UserDetailView
+from .views import login_view, logout_view, me_view, UserListView, UserDetailView, import_users_view
 
 urlpatterns = [
     path('login/', login_view, name='login'),
@@ -8,5 +8,6 @@ urlpatterns = [
     path('me/', me_view, name='me'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('users/', UserListView.as_view(), name='user_list'),
+    path('users/import/', import_users_view, name='user_import'),
     path('users/<int:pk>/', UserDetailView.as_view(), name='user_detail'),
 ]
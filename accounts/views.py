@@ -1,9 +1,16 @@
-from rest_framework import status, generics
+import hashlib
+import io
+import uuid
+from django.core.cache import cache
+from rest_framework import status, generics, filters
+from rest_framework.pagination import CursorPagination
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
 from .models import User
+from .importers import UserImporter, read_csv_rows
+from .authentication import tokens_for_user
+from .tokens import PrecheckedRefreshToken
 from .serializers import UserSerializer, LoginSerializer, UserCreateSerializer, UserUpdateSerializer
 
 
@@ -13,7 +20,7 @@ def login_view(request):
     serializer = LoginSerializer(data=request.data)
     if serializer.is_valid():
         user = serializer.validated_data['user']
-        refresh = RefreshToken.for_user(user)
+        refresh = tokens_for_user(user)
         
         return Response({
             'user': UserSerializer(user).data,
@@ -31,7 +38,7 @@ def logout_view(request):
     try:
         refresh_token = request.data.get('refresh')
         if refresh_token:
-            token = RefreshToken(refresh_token)
+            token = PrecheckedRefreshToken(refresh_token)
             token.blacklist()
         return Response({'message': 'Logged out successfully'})
     except Exception:
@@ -44,13 +51,92 @@ def me_view(request):
     return Response(UserSerializer(request.user).data)
 
 
+USER_LIST_VERSION_KEY = 'accounts:user_list:version'
+USER_LIST_CACHE_TTL = 60
+
+
+def bump_user_list_version():
+    """Invalidate cached user list pages."""
+    cache.set(USER_LIST_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_user_list_version():
+    version = cache.get(USER_LIST_VERSION_KEY)
+    if version is None:
+        cache.add(USER_LIST_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(USER_LIST_VERSION_KEY)
+    return version
+
+
+class UserCursorPagination(CursorPagination):
+    ordering = 'id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
 class UserListView(generics.ListCreateAPIView):
-    queryset = User.objects.all()
+    """Cursor-paginated user list with prefix search and role/department filters.
+    
+    ``?search=`` matches the start of username, first name, last name or
+    email. ``?role=`` and ``?department=`` (department name) narrow the list.
+    """
+    queryset = User.objects.select_related('department')
+    pagination_class = UserCursorPagination
+    filter_backends = [filters.SearchFilter]
+    search_fields = ['^username', '^first_name', '^last_name', '^email']
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        
+        if params.get('role'):
+            queryset = queryset.filter(role=params.get('role'))
+        if params.get('department'):
+            queryset = queryset.filter(department__name=params.get('department'))
+        
+        return queryset
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return UserCreateSerializer
         return UserSerializer
+    
+    def list(self, request, *args, **kwargs):
+        signature = f'{get_user_list_version()}:{request.build_absolute_uri()}'
+        cache_key = 'accounts:user_list:' + hashlib.sha256(signature.encode()).hexdigest()
+        
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+        
+        response = super().list(request, *args, **kwargs)
+        cache.set(cache_key, response.data, USER_LIST_CACHE_TTL)
+        return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_users_view(request):
+    """Bulk-create users from an uploaded CSV file (multipart field ``file``)."""
+    if request.user.role != 'ADMIN':
+        return Response({'error': 'Unauthorized'}, status=403)
+    
+    upload = request.FILES.get('file')
+    if not upload:
+        return Response({'error': 'CSV file is required'}, status=400)
+    
+    importer = UserImporter(
+        default_password=request.data.get('default_password') or None,
+        dry_run=str(request.data.get('dry_run', '')).lower() in ('1', 'true'),
+    )
+    stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    try:
+        summary = importer.run(read_csv_rows(stream))
+    except UnicodeDecodeError:
+        return Response({'error': 'CSV file must be UTF-8 encoded'}, status=400)
+    
+    return Response(summary, status=status.HTTP_201_CREATED if summary['created'] else status.HTTP_200_OK)
 
 
 class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -0,0 +1,58 @@
+from departments.catalog import get_catalog
+
+
+def answer_risk(answer):
+    """Return the risk level of a submitted answer in either naming style."""
+    return answer.get('riskLevel') or answer.get('risk_level') or 'LOW'
+
+
+def encode_answers(department_id, answers):
+    """Compact submitted answers into ``[version_id, answer, risk]`` rows.
+    
+    Remarks are appended only when present. Answers are matched to the
+    current question version by ``questionKey``; entries that do not match
+    a live question are kept as submitted.
+    """
+    current_versions = get_catalog().current_versions
+    encoded = []
+    for answer in answers:
+        if not isinstance(answer, dict):
+            encoded.append(answer)
+            continue
+        version_id = current_versions.get((department_id, answer.get('questionKey')))
+        if version_id is None:
+            encoded.append(answer)
+            continue
+        row = [version_id, answer.get('answer'), answer_risk(answer)]
+        if answer.get('remarks'):
+            row.append(answer['remarks'])
+        encoded.append(row)
+    return encoded
+
+
+def decode_answers(answers):
+    """Expand stored answers with question key and text from the cached catalog."""
+    question_versions = get_catalog().question_versions
+    decoded = []
+    for answer in answers:
+        if isinstance(answer, dict):
+            decoded.append({
+                'questionVersionId': None,
+                'questionKey': answer.get('questionKey') or answer.get('questionId', ''),
+                'questionText': answer.get('questionText', ''),
+                'answer': answer.get('answer', ''),
+                'riskLevel': answer_risk(answer),
+                'remarks': answer.get('remarks', ''),
+            })
+            continue
+        version_id, value, risk = answer[:3]
+        key, text = question_versions.get(version_id, ('', ''))
+        decoded.append({
+            'questionVersionId': version_id,
+            'questionKey': key,
+            'questionText': text,
+            'answer': value,
+            'riskLevel': risk,
+            'remarks': answer[3] if len(answer) > 3 else '',
+        })
+    return decoded
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ApprovalsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'approvals'
+    
+    def ready(self):
+        from . import notifications  # noqa: F401 - registers transition subscribers
@@ -0,0 +1,57 @@
+import logging
+from dataclasses import dataclass
+from functools import partial
+from django.db import transaction
+
+
+logger = logging.getLogger(__name__)
+
+_subscribers = []
+
+
+@dataclass(frozen=True)
+class TransitionEvent:
+    """A kaizen request moved from one workflow status to another."""
+    kaizen_id: int
+    request_id: str
+    previous_status: str
+    status: str
+    actor_id: int = None
+    remarks: str = ''
+
+
+def subscribe(handler):
+    """Register a handler called with every committed TransitionEvent."""
+    if handler not in _subscribers:
+        _subscribers.append(handler)
+    return handler
+
+
+def emit_transition(kaizen, previous_status, actor=None, remarks=''):
+    """Publish a status transition once the surrounding transaction commits.
+
+    Nothing is emitted when the status did not change (for example a cross
+    department approval that still waits on other departments). Outside a
+    transaction the event is dispatched immediately.
+    """
+    if kaizen.status == previous_status:
+        return None
+
+    event = TransitionEvent(
+        kaizen_id=kaizen.pk,
+        request_id=kaizen.request_id,
+        previous_status=previous_status,
+        status=kaizen.status,
+        actor_id=actor.pk if actor is not None else None,
+        remarks=remarks or '',
+    )
+    transaction.on_commit(partial(_dispatch, event))
+    return event
+
+
+def _dispatch(event):
+    for handler in list(_subscribers):
+        try:
+            handler(event)
+        except Exception:
+            logger.exception('Transition subscriber %s failed for %s', handler, event.request_id)
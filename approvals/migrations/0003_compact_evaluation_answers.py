@@ -0,0 +1,74 @@
+from django.db import migrations
+
+
+def _version_lookup(apps):
+    EvaluationQuestion = apps.get_model('departments', 'EvaluationQuestion')
+    EvaluationQuestionVersion = apps.get_model('departments', 'EvaluationQuestionVersion')
+    question_keys = dict(EvaluationQuestion.objects.values_list('id', 'key'))
+    by_key = {}
+    by_text = {}
+    for version in EvaluationQuestionVersion.objects.order_by('id'):
+        by_key[(version.department_id, version.key)] = version.id
+        by_text[(version.department_id, version.key, version.text)] = version.id
+    return question_keys, by_key, by_text
+
+
+def compact_answers(apps, schema_editor):
+    DepartmentEvaluation = apps.get_model('approvals', 'DepartmentEvaluation')
+    question_keys, by_key, by_text = _version_lookup(apps)
+
+    for evaluation in DepartmentEvaluation.objects.iterator():
+        encoded = []
+        for answer in evaluation.answers:
+            if not isinstance(answer, dict):
+                encoded.append(answer)
+                continue
+            key = answer.get('questionKey') or answer.get('questionId')
+            key = question_keys.get(key, key) if isinstance(key, int) else key
+            # Prefer the version whose wording was copied into the answer.
+            version_id = by_text.get((evaluation.department_id, key, answer.get('questionText')))
+            if version_id is None:
+                version_id = by_key.get((evaluation.department_id, key))
+            if version_id is None:
+                encoded.append(answer)
+                continue
+            row = [version_id, answer.get('answer'), answer.get('riskLevel') or answer.get('risk_level') or 'LOW']
+            if answer.get('remarks'):
+                row.append(answer['remarks'])
+            encoded.append(row)
+        if encoded != evaluation.answers:
+            DepartmentEvaluation.objects.filter(pk=evaluation.pk).update(answers=encoded)
+
+
+def expand_answers(apps, schema_editor):
+    DepartmentEvaluation = apps.get_model('approvals', 'DepartmentEvaluation')
+    EvaluationQuestionVersion = apps.get_model('departments', 'EvaluationQuestionVersion')
+    versions = {v.id: v for v in EvaluationQuestionVersion.objects.all()}
+
+    for evaluation in DepartmentEvaluation.objects.iterator():
+        expanded = []
+        for answer in evaluation.answers:
+            if isinstance(answer, dict) or answer[0] not in versions:
+                expanded.append(answer)
+                continue
+            version = versions[answer[0]]
+            expanded.append({
+                'questionKey': version.key,
+                'questionText': version.text,
+                'answer': answer[1],
+                'riskLevel': answer[2],
+                'remarks': answer[3] if len(answer) > 3 else '',
+            })
+        DepartmentEvaluation.objects.filter(pk=evaluation.pk).update(answers=expanded)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('approvals', '0002_alter_managerapproval_unique_together_and_more'),
+        ('departments', '0002_evaluationquestionversion'),
+    ]
+
+    operations = [
+        migrations.RunPython(compact_answers, expand_answers),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from .answers import encode_answers
 
 
 class ManagerApproval(models.Model):
@@ -155,6 +156,7 @@ class DepartmentEvaluation(models.Model):
         'departments.Department',
         on_delete=models.PROTECT
     )
+    # Compact rows of [question_version_id, answer, risk(, remarks)]; see approvals.answers.
     answers = models.JSONField(default=list)
     overall_risk = models.CharField(max_length=10, choices=RISK_LEVEL_CHOICES, default='LOW')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -165,3 +167,7 @@ class DepartmentEvaluation(models.Model):
     
     def __str__(self):
         return f"{self.kaizen_request.request_id} - {self.department.name} ({self.evaluator_role})"
+    
+    def save(self, *args, **kwargs):
+        self.answers = encode_answers(self.department_id, self.answers)
+        super().save(*args, **kwargs)
@@ -0,0 +1,150 @@
+from django.db.models import Q, Case, When, Value, BooleanField, ExpressionWrapper
+from accounts.models import User
+from audit.models import AuditLog
+from audit.services import NotificationService
+from kaizen_requests.bulk_export import touch_requests
+from kaizen_requests.models import KaizenRequest
+from .events import subscribe
+from .models import ManagerApproval, HodApproval
+
+
+STAGE_LABELS = {
+    'DRAFT': 'Draft',
+    'PENDING_OWN_MANAGER': 'Own Manager',
+    'PENDING_OWN_HOD': 'Own HOD',
+    'PENDING_CROSS_MANAGER': 'Cross-Department Manager',
+    'PENDING_CROSS_HOD': 'Cross-Department HOD',
+    'PENDING_AGM': 'AGM',
+    'PENDING_GM': 'GM',
+    'APPROVED': 'Completed',
+    'REJECTED': 'Completed',
+}
+
+
+def next_approvers_filter(kaizen):
+    """Return a Q selecting the users who must act on the request's current status."""
+    status = kaizen.status
+
+    if status == 'PENDING_OWN_MANAGER':
+        return Q(role='MANAGER', department_id=kaizen.department_id)
+    elif status == 'PENDING_OWN_HOD':
+        return Q(role='HOD', department_id=kaizen.department_id)
+    elif status == 'PENDING_CROSS_MANAGER':
+        approved_departments = ManagerApproval.objects.filter(
+            kaizen_request_id=kaizen.pk,
+            stage_type='CROSS_MANAGER',
+            decision='APPROVED'
+        ).values('department_id')
+        return (
+            Q(role='MANAGER') &
+            ~Q(department_id=kaizen.department_id) &
+            ~Q(department_id__in=approved_departments)
+        )
+    elif status == 'PENDING_CROSS_HOD':
+        approved_departments = HodApproval.objects.filter(
+            kaizen_request_id=kaizen.pk,
+            stage_type='CROSS_HOD',
+            decision='APPROVED'
+        ).values('department_id')
+        return (
+            Q(role='HOD') &
+            ~Q(department_id=kaizen.department_id) &
+            ~Q(department_id__in=approved_departments)
+        )
+    elif status == 'PENDING_AGM':
+        return Q(role='AGM')
+    elif status == 'PENDING_GM':
+        return Q(role='GM')
+    return None
+
+
+def resolve_recipients(kaizen):
+    """Load next approvers and the initiator in a single query.
+
+    Returns ``(approvers, initiator)`` where initiator is None when the
+    initiator is also one of the approvers.
+    """
+    approver_filter = next_approvers_filter(kaizen)
+    recipient_filter = Q(id=kaizen.initiator_id)
+    is_approver = Value(False)
+    if approver_filter is not None:
+        recipient_filter |= approver_filter
+        is_approver = Case(When(approver_filter, then=Value(True)), default=Value(False))
+
+    users = list(
+        User.objects.filter(recipient_filter, is_active=True)
+        .annotate(is_next_approver=ExpressionWrapper(is_approver, output_field=BooleanField()))
+    )
+    approvers = [u for u in users if u.is_next_approver]
+    initiator = next((u for u in users if u.id == kaizen.initiator_id and not u.is_next_approver), None)
+    return approvers, initiator
+
+
+def build_event_context(kaizen, event, actor=None):
+    return {
+        'request_id': kaizen.request_id,
+        'title': kaizen.title,
+        'department': kaizen.department.display_name,
+        'initiator_name': kaizen.initiator.get_full_name() or kaizen.initiator.username,
+        'stage': STAGE_LABELS.get(kaizen.status, kaizen.status),
+        'previous_stage': STAGE_LABELS.get(event.previous_status, event.previous_status),
+        'next_stage': STAGE_LABELS.get(kaizen.status, kaizen.status),
+        'actor_name': (actor.get_full_name() or actor.username) if actor else 'System',
+        'reason': kaizen.rejection_reason or event.remarks or 'No reason provided',
+        'cost_estimate': kaizen.cost_estimate,
+        'cost_currency': kaizen.cost_currency,
+    }
+
+
+def deliver_transition_notifications(event):
+    """Resolve recipients for a committed transition and send their notifications."""
+    try:
+        kaizen = KaizenRequest.objects.select_related('department', 'initiator').get(pk=event.kaizen_id)
+    except KaizenRequest.DoesNotExist:
+        return
+
+    actor = User.objects.filter(pk=event.actor_id).first() if event.actor_id else None
+    context = build_event_context(kaizen, event, actor)
+    approvers, initiator = resolve_recipients(kaizen)
+
+    deliveries = [(user, 'APPROVAL_REQUIRED') for user in approvers]
+    if initiator is not None:
+        if kaizen.status == 'APPROVED':
+            deliveries.append((initiator, 'KAIZEN_APPROVED'))
+        elif kaizen.status == 'REJECTED':
+            # Rejections report the stage the request was rejected at.
+            context = dict(context, stage=context['previous_stage'])
+            deliveries.append((initiator, 'KAIZEN_REJECTED'))
+        elif event.previous_status == 'DRAFT' or not event.previous_status:
+            deliveries.append((initiator, 'KAIZEN_SUBMITTED'))
+        else:
+            deliveries.append((initiator, 'STAGE_APPROVED'))
+
+    logs = []
+    for user, template_event in deliveries:
+        event_context = context
+        if template_event == 'STAGE_APPROVED':
+            event_context = dict(context, stage=context['previous_stage'])
+        results = NotificationService.send_event(user, template_event, event_context)
+        for channel, result in results.items():
+            outcome = 'SENT' if result.get('success') else 'FAILED'
+            logs.append(AuditLog(
+                kaizen_request_id=kaizen.pk,
+                user=user,
+                action=f'{channel.upper()}_{outcome}',
+                details={
+                    'request_id': kaizen.request_id,
+                    'event': template_event,
+                    'error': result.get('error', ''),
+                }
+            ))
+
+    if logs:
+        AuditLog.objects.bulk_create(logs)
+        touch_requests([kaizen.pk])
+
+
+@subscribe
+def notify_transition(event):
+    """Hand committed transitions to the background notification pool."""
+    NotificationService.enqueue(deliver_transition_notifications, event)
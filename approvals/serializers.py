@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from .answers import decode_answers
 from .models import ManagerApproval, HodApproval, AgmApproval, GmApproval, DepartmentEvaluation
 
 
@@ -57,6 +58,7 @@ class GmApprovalSerializer(serializers.ModelSerializer):
 class DepartmentEvaluationSerializer(serializers.ModelSerializer):
     evaluator_name = serializers.CharField(source='evaluator.get_full_name', read_only=True)
     department_name = serializers.CharField(source='department.display_name', read_only=True)
+    answers = serializers.SerializerMethodField()
     
     class Meta:
         model = DepartmentEvaluation
@@ -66,6 +68,9 @@ class DepartmentEvaluationSerializer(serializers.ModelSerializer):
             'answers', 'overall_risk', 'created_at'
         ]
         read_only_fields = ['id', 'kaizen_request', 'evaluator', 'department', 'created_at']
+    
+    def get_answers(self, obj):
+        return decode_answers(obj.answers)
 
 
 class OwnManagerDecisionSerializer(serializers.Serializer):
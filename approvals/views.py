@@ -7,6 +7,8 @@ from kaizen_requests.models import KaizenRequest
 from kaizen_requests.serializers import KaizenRequestDetailSerializer
 from departments.models import Department
 from audit.models import AuditLog
+from .answers import answer_risk
+from .events import emit_transition
 from .models import HodApproval, ManagerApproval, AgmApproval, GmApproval, DepartmentEvaluation
 from .serializers import (
     OwnManagerDecisionSerializer, OwnHodDecisionSerializer, ManagerEvaluationSerializer,
@@ -44,6 +46,7 @@ def own_manager_decision(request, pk):
     except KaizenRequest.DoesNotExist:
         return Response({'error': 'Request not found or not pending your approval'}, status=status.HTTP_404_NOT_FOUND)
     
+    previous_status = kaizen.status
     with transaction.atomic():
         decision = serializer.validated_data['decision']
         remarks = serializer.validated_data.get('remarks', '')
@@ -82,6 +85,7 @@ def own_manager_decision(request, pk):
             create_audit_log(request, kaizen, 'OWN_MANAGER_REJECTED', {'remarks': remarks})
         
         kaizen.save()
+        emit_transition(kaizen, previous_status, request.user, remarks)
     
     return Response(KaizenRequestDetailSerializer(kaizen).data)
 
@@ -105,6 +109,7 @@ def own_hod_decision(request, pk):
     except KaizenRequest.DoesNotExist:
         return Response({'error': 'Request not found or not pending your approval'}, status=status.HTTP_404_NOT_FOUND)
     
+    previous_status = kaizen.status
     with transaction.atomic():
         decision = serializer.validated_data['decision']
         remarks = serializer.validated_data.get('remarks', '')
@@ -143,6 +148,7 @@ def own_hod_decision(request, pk):
             create_audit_log(request, kaizen, 'OWN_HOD_REJECTED', {'remarks': remarks})
         
         kaizen.save()
+        emit_transition(kaizen, previous_status, request.user, remarks)
     
     return Response(KaizenRequestDetailSerializer(kaizen).data)
 
@@ -162,6 +168,7 @@ def manager_evaluation(request, pk):
     except KaizenRequest.DoesNotExist:
         return Response({'error': 'Request not found'}, status=status.HTTP_404_NOT_FOUND)
     
+    previous_status = kaizen.status
     with transaction.atomic():
         decision = serializer.validated_data['decision']
         remarks = serializer.validated_data.get('remarks', '')
@@ -207,6 +214,7 @@ def manager_evaluation(request, pk):
             create_audit_log(request, kaizen, 'CROSS_MANAGER_APPROVED', {'department': request.user.department.name})
         
         kaizen.save()
+        emit_transition(kaizen, previous_status, request.user, remarks)
     
     return Response(KaizenRequestDetailSerializer(kaizen).data)
 
@@ -226,6 +234,7 @@ def cross_hod_evaluation(request, pk):
     except KaizenRequest.DoesNotExist:
         return Response({'error': 'Request not found'}, status=status.HTTP_404_NOT_FOUND)
     
+    previous_status = kaizen.status
     with transaction.atomic():
         decision = serializer.validated_data['decision']
         remarks = serializer.validated_data.get('remarks', '')
@@ -274,6 +283,7 @@ def cross_hod_evaluation(request, pk):
             create_audit_log(request, kaizen, 'CROSS_HOD_APPROVED', {'department': request.user.department.name})
         
         kaizen.save()
+        emit_transition(kaizen, previous_status, request.user, remarks)
     
     return Response(KaizenRequestDetailSerializer(kaizen).data)
 
@@ -293,6 +303,7 @@ def agm_decision(request, pk):
     except KaizenRequest.DoesNotExist:
         return Response({'error': 'Request not found'}, status=status.HTTP_404_NOT_FOUND)
     
+    previous_status = kaizen.status
     with transaction.atomic():
         approved = serializer.validated_data['approved']
         
@@ -319,6 +330,7 @@ def agm_decision(request, pk):
             create_audit_log(request, kaizen, 'AGM_REJECTED')
         
         kaizen.save()
+        emit_transition(kaizen, previous_status, request.user, serializer.validated_data.get('comments', ''))
     
     return Response(KaizenRequestDetailSerializer(kaizen).data)
 
@@ -338,6 +350,7 @@ def gm_decision(request, pk):
     except KaizenRequest.DoesNotExist:
         return Response({'error': 'Request not found'}, status=status.HTTP_404_NOT_FOUND)
     
+    previous_status = kaizen.status
     with transaction.atomic():
         approved = serializer.validated_data['approved']
         
@@ -360,6 +373,7 @@ def gm_decision(request, pk):
             create_audit_log(request, kaizen, 'GM_REJECTED')
         
         kaizen.save()
+        emit_transition(kaizen, previous_status, request.user, serializer.validated_data.get('comments', ''))
     
     return Response(KaizenRequestDetailSerializer(kaizen).data)
 
@@ -368,8 +382,9 @@ def _calculate_risk(answers):
     if not answers:
         return 'LOW'
     
-    high_count = sum(1 for a in answers if a.get('risk_level') == 'HIGH')
-    medium_count = sum(1 for a in answers if a.get('risk_level') == 'MEDIUM')
+    risks = [answer_risk(a) for a in answers]
+    high_count = risks.count('HIGH')
+    medium_count = risks.count('MEDIUM')
     
     if high_count > 0:
         return 'HIGH'
@@ -418,6 +433,7 @@ def own_manager_decision_by_request_id(request, request_id):
     except KaizenRequest.DoesNotExist:
         return Response({'error': 'Request not found or not pending your approval'}, status=status.HTTP_404_NOT_FOUND)
     
+    previous_status = kaizen.status
     with transaction.atomic():
         decision = serializer.validated_data['decision']
         remarks = serializer.validated_data.get('remarks', '')
@@ -456,6 +472,7 @@ def own_manager_decision_by_request_id(request, request_id):
             create_audit_log(request, kaizen, 'OWN_MANAGER_REJECTED', {'remarks': remarks})
         
         kaizen.save()
+        emit_transition(kaizen, previous_status, request.user, remarks)
     
     return Response(KaizenRequestDetailSerializer(kaizen).data)
 
@@ -479,6 +496,7 @@ def own_hod_decision_by_request_id(request, request_id):
     except KaizenRequest.DoesNotExist:
         return Response({'error': 'Request not found or not pending your approval'}, status=status.HTTP_404_NOT_FOUND)
     
+    previous_status = kaizen.status
     with transaction.atomic():
         decision = serializer.validated_data['decision']
         remarks = serializer.validated_data.get('remarks', '')
@@ -517,6 +535,7 @@ def own_hod_decision_by_request_id(request, request_id):
             create_audit_log(request, kaizen, 'OWN_HOD_REJECTED', {'remarks': remarks})
         
         kaizen.save()
+        emit_transition(kaizen, previous_status, request.user, remarks)
     
     return Response(KaizenRequestDetailSerializer(kaizen).data)
 
@@ -536,6 +555,7 @@ def manager_evaluation_by_request_id(request, request_id):
     except KaizenRequest.DoesNotExist:
         return Response({'error': 'Request not found'}, status=status.HTTP_404_NOT_FOUND)
     
+    previous_status = kaizen.status
     with transaction.atomic():
         decision = serializer.validated_data['decision']
         remarks = serializer.validated_data.get('remarks', '')
@@ -581,6 +601,7 @@ def manager_evaluation_by_request_id(request, request_id):
             create_audit_log(request, kaizen, 'MANAGER_APPROVED', {'department': request.user.department.name})
         
         kaizen.save()
+        emit_transition(kaizen, previous_status, request.user, remarks)
     
     return Response(KaizenRequestDetailSerializer(kaizen).data)
 
@@ -600,6 +621,7 @@ def cross_hod_evaluation_by_request_id(request, request_id):
     except KaizenRequest.DoesNotExist:
         return Response({'error': 'Request not found'}, status=status.HTTP_404_NOT_FOUND)
     
+    previous_status = kaizen.status
     with transaction.atomic():
         decision = serializer.validated_data['decision']
         remarks = serializer.validated_data.get('remarks', '')
@@ -648,6 +670,7 @@ def cross_hod_evaluation_by_request_id(request, request_id):
             create_audit_log(request, kaizen, 'CROSS_HOD_APPROVED', {'department': request.user.department.name})
         
         kaizen.save()
+        emit_transition(kaizen, previous_status, request.user, remarks)
     
     return Response(KaizenRequestDetailSerializer(kaizen).data)
 
@@ -667,6 +690,7 @@ def agm_decision_by_request_id(request, request_id):
     except KaizenRequest.DoesNotExist:
         return Response({'error': 'Request not found'}, status=status.HTTP_404_NOT_FOUND)
     
+    previous_status = kaizen.status
     with transaction.atomic():
         approved = serializer.validated_data['approved']
         
@@ -693,6 +717,7 @@ def agm_decision_by_request_id(request, request_id):
             create_audit_log(request, kaizen, 'AGM_REJECTED')
         
         kaizen.save()
+        emit_transition(kaizen, previous_status, request.user, serializer.validated_data.get('comments', ''))
     
     return Response(KaizenRequestDetailSerializer(kaizen).data)
 
@@ -712,6 +737,7 @@ def gm_decision_by_request_id(request, request_id):
     except KaizenRequest.DoesNotExist:
         return Response({'error': 'Request not found'}, status=status.HTTP_404_NOT_FOUND)
     
+    previous_status = kaizen.status
     with transaction.atomic():
         approved = serializer.validated_data['approved']
         
@@ -734,5 +760,6 @@ def gm_decision_by_request_id(request, request_id):
             create_audit_log(request, kaizen, 'GM_REJECTED')
         
         kaizen.save()
+        emit_transition(kaizen, previous_status, request.user, serializer.validated_data.get('comments', ''))
     
     return Response(KaizenRequestDetailSerializer(kaizen).data)
@@ -0,0 +1,52 @@
+import time
+from django.core.management.base import BaseCommand
+from audit.notification_templates import NOTIFICATION_TEMPLATES, get_template
+
+
+SAMPLE_CONTEXT = {
+    'request_id': 'KZ-2025-001',
+    'title': 'Poka-yoke sensor for <missing> bracket',
+    'initiator_name': 'John Smith',
+    'department': 'Maintenance',
+    'stage': 'Cross HOD',
+    'next_stage': 'AGM',
+    'actor_name': 'Helen Henderson',
+    'reason': 'Cost & risk not justified',
+    'cost_estimate': '75000.00',
+    'cost_currency': 'INR',
+    'hours_pending': 52,
+    'sla_target_hours': 48,
+}
+
+
+class Command(BaseCommand):
+    help = 'Benchmark notification template rendering throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000, help='Renders per event')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        recipients = [{'recipient_name': f'Recipient {i}'} for i in range(100)]
+
+        self.stdout.write(f'Rendering {iterations} notifications per event (plain + HTML + WhatsApp)...')
+        total_renders = 0
+        total_elapsed = 0.0
+
+        for event in NOTIFICATION_TEMPLATES:
+            template = get_template(event)
+            start = time.perf_counter()
+            for i in range(iterations):
+                template.render(SAMPLE_CONTEXT, recipients[i % len(recipients)])
+            elapsed = time.perf_counter() - start
+
+            total_renders += iterations
+            total_elapsed += elapsed
+            self.stdout.write(
+                f'  {event:<20} {iterations / elapsed:>12,.0f} renders/s  '
+                f'({elapsed / iterations * 1e6:.1f} us/render)'
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Overall: {total_renders / total_elapsed:,.0f} renders/s across {len(NOTIFICATION_TEMPLATES)} events'
+        ))
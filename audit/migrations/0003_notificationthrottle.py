@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0002_add_notification_settings_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationThrottle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(choices=[('EMAIL', 'Email'), ('WHATSAPP', 'WhatsApp')], max_length=20, unique=True)),
+                ('tokens', models.FloatField(default=0)),
+                ('refilled_at', models.DateTimeField()),
+                ('sent_count', models.PositiveIntegerField(default=0)),
+                ('throttled_count', models.PositiveIntegerField(default=0)),
+                ('total_wait_seconds', models.FloatField(default=0)),
+                ('max_wait_seconds', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'dj_notification_throttles',
+            },
+        ),
+    ]
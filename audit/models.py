@@ -82,3 +82,35 @@ class Setting(models.Model):
     
     def __str__(self):
         return self.key
+
+
+class NotificationThrottle(models.Model):
+    """Shared token-bucket state for an outbound notification channel.
+
+    One row per channel, locked with SELECT ... FOR UPDATE so that every
+    worker thread and process draws from the same bucket.
+    """
+    channel = models.CharField(max_length=20, choices=NotificationSetting.CHANNEL_CHOICES, unique=True)
+    tokens = models.FloatField(default=0)
+    refilled_at = models.DateTimeField()
+    sent_count = models.PositiveIntegerField(default=0)
+    throttled_count = models.PositiveIntegerField(default=0)
+    total_wait_seconds = models.FloatField(default=0)
+    max_wait_seconds = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'dj_notification_throttles'
+    
+    def __str__(self):
+        return f"{self.channel} - {self.tokens:.2f} tokens"
+    
+    def get_metrics(self):
+        """Return throttle-wait metrics for this channel."""
+        return {
+            'sent': self.sent_count,
+            'throttled': self.throttled_count,
+            'total_wait_seconds': round(self.total_wait_seconds, 3),
+            'avg_wait_seconds': round(self.total_wait_seconds / self.throttled_count, 3) if self.throttled_count else 0,
+            'max_wait_seconds': round(self.max_wait_seconds, 3),
+        }
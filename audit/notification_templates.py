@@ -0,0 +1,141 @@
+from collections import ChainMap, namedtuple
+from functools import lru_cache
+from html import escape
+from string import Formatter
+
+
+RenderedNotification = namedtuple('RenderedNotification', ['subject', 'text', 'html', 'whatsapp'])
+
+
+# Subject and body lines for each workflow event. Placeholders use
+# str.format syntax and are filled from the event context merged with the
+# per-recipient context (``recipient_name``).
+NOTIFICATION_TEMPLATES = {
+    'KAIZEN_SUBMITTED': {
+        'subject': 'Kaizen {request_id} submitted',
+        'lines': [
+            'Hello {recipient_name},',
+            'Kaizen request {request_id} "{title}" has been submitted by {initiator_name} ({department}).',
+            'It is now pending {stage} approval.',
+        ],
+    },
+    'APPROVAL_REQUIRED': {
+        'subject': 'Action required: Kaizen {request_id} awaits {stage} approval',
+        'lines': [
+            'Hello {recipient_name},',
+            'Kaizen request {request_id} "{title}" from {department} is waiting for your {stage} review.',
+            'Estimated cost: {cost_estimate} {cost_currency}.',
+        ],
+    },
+    'STAGE_APPROVED': {
+        'subject': 'Kaizen {request_id} approved at {stage}',
+        'lines': [
+            'Hello {recipient_name},',
+            'Kaizen request {request_id} "{title}" was approved at the {stage} stage by {actor_name}.',
+            'Next step: {next_stage}.',
+        ],
+    },
+    'KAIZEN_APPROVED': {
+        'subject': 'Kaizen {request_id} approved',
+        'lines': [
+            'Hello {recipient_name},',
+            'Kaizen request {request_id} "{title}" has completed all approvals and is approved for implementation.',
+        ],
+    },
+    'KAIZEN_REJECTED': {
+        'subject': 'Kaizen {request_id} rejected',
+        'lines': [
+            'Hello {recipient_name},',
+            'Kaizen request {request_id} "{title}" was rejected at the {stage} stage by {actor_name}.',
+            'Reason: {reason}',
+        ],
+    },
+    'SLA_BREACH': {
+        'subject': 'SLA breach: Kaizen {request_id} pending {stage}',
+        'lines': [
+            'Hello {recipient_name},',
+            'Kaizen request {request_id} "{title}" has been pending {stage} approval for {hours_pending} hours.',
+            'The SLA target for this stage is {sla_target_hours} hours.',
+        ],
+    },
+}
+
+
+class _MissingDefault(dict):
+    """Context fallback that renders unknown placeholders as empty strings."""
+
+    def __missing__(self, key):
+        return ''
+
+
+class NotificationTemplate:
+    """A notification template compiled once into literal/field segments.
+
+    Rendering walks the segments a single time and produces the plain text,
+    HTML and WhatsApp variants together, so per-recipient rendering never
+    re-parses the template or re-wraps the message per channel.
+    """
+
+    def __init__(self, event, subject, lines):
+        self.event = event
+        self.subject_segments = self._compile(subject)
+        self.line_segments = [self._compile(line) for line in lines]
+
+    @staticmethod
+    def _compile(source):
+        segments = []
+        for literal, field, _spec, _conversion in Formatter().parse(source):
+            segments.append((literal, escape(literal), field))
+        return tuple(segments)
+
+    @staticmethod
+    def _render_segments(segments, context):
+        plain = []
+        html = []
+        for literal, html_literal, field in segments:
+            plain.append(literal)
+            html.append(html_literal)
+            if field:
+                value = context[field]
+                value = '' if value is None else str(value)
+                plain.append(value)
+                html.append(escape(value))
+        return ''.join(plain), ''.join(html)
+
+    def render(self, context, recipient_context=None):
+        """Render all channel variants for one recipient."""
+        ctx = ChainMap(recipient_context or {}, context, _MissingDefault())
+
+        subject, html_subject = self._render_segments(self.subject_segments, ctx)
+        text_lines = []
+        html_lines = []
+        for segments in self.line_segments:
+            text, html = self._render_segments(segments, ctx)
+            text_lines.append(text)
+            html_lines.append(f'<p>{html}</p>')
+
+        body = '\n\n'.join(text_lines)
+        return RenderedNotification(
+            subject=subject,
+            text=body,
+            html=f'<h2>{html_subject}</h2>' + ''.join(html_lines),
+            whatsapp=f'*{subject}*\n\n{body}',
+        )
+
+
+@lru_cache(maxsize=None)
+def get_template(event):
+    """Return the compiled template for a workflow event (cached per process)."""
+    try:
+        definition = NOTIFICATION_TEMPLATES[event]
+    except KeyError:
+        raise ValueError(f"Unknown notification event '{event}'")
+    return NotificationTemplate(event, definition['subject'], definition['lines'])
+
+
+def render_notification(event, context, recipient=None):
+    """Render an event for a recipient user (or without recipient details)."""
+    recipient_context = None
+    if recipient is not None:
+        recipient_context = {'recipient_name': recipient.get_full_name() or recipient.username}
+    return get_template(event).render(context, recipient_context)
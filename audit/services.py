@@ -1,11 +1,98 @@
 import smtplib
 import ssl
 import json
+import time
+import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from django.conf import settings
-from .models import NotificationSetting, AuditLog
+from django.db import transaction, connections
+from django.utils import timezone
+from .models import NotificationSetting, NotificationThrottle, AuditLog
+from .notification_templates import render_notification
+
+
+logger = logging.getLogger(__name__)
+
+# Background pool for notification deliveries so request threads never wait on
+# SMTP/HTTP providers or the rate limiter.
+_delivery_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'NOTIFICATION_WORKERS', 4),
+    thread_name_prefix='notifications'
+)
+
+
+class NotificationRateLimiter:
+    """Per-channel token bucket shared by all workers through the database.
+    
+    Each send takes one token. When the bucket is empty the caller reserves
+    the next token and sleeps until it becomes available, so bursts are
+    smoothed to the provider's rate instead of being rejected. Limits are
+    read from ``NotificationSetting.config``:
+    
+    - ``rate_limit_per_second``: sustained sends per second (0 disables)
+    - ``rate_limit_burst``: bucket capacity
+    """
+    
+    DEFAULT_LIMITS = {
+        'EMAIL': {'rate': 5.0, 'burst': 10.0},
+        'WHATSAPP': {'rate': 1.0, 'burst': 5.0},
+    }
+    
+    @classmethod
+    def get_limits(cls, channel, config=None):
+        """Return (rate, burst) for a channel, applying config overrides."""
+        defaults = cls.DEFAULT_LIMITS.get(channel, {'rate': 1.0, 'burst': 1.0})
+        config = config or {}
+        try:
+            rate = float(config.get('rate_limit_per_second', defaults['rate']))
+            burst = float(config.get('rate_limit_burst', defaults['burst']))
+        except (TypeError, ValueError):
+            rate, burst = defaults['rate'], defaults['burst']
+        return rate, max(burst, 1.0)
+    
+    @classmethod
+    def reserve(cls, channel, config=None):
+        """Take a token from the channel bucket and return the seconds to wait."""
+        rate, burst = cls.get_limits(channel, config)
+        if rate <= 0:
+            return 0.0
+        
+        now = timezone.now()
+        with transaction.atomic():
+            throttle, _ = NotificationThrottle.objects.select_for_update().get_or_create(
+                channel=channel,
+                defaults={'tokens': burst, 'refilled_at': now}
+            )
+            elapsed = max(0.0, (now - throttle.refilled_at).total_seconds())
+            tokens = min(burst, throttle.tokens + elapsed * rate) - 1
+            wait = -tokens / rate if tokens < 0 else 0.0
+            
+            throttle.tokens = tokens
+            throttle.refilled_at = now
+            throttle.sent_count += 1
+            if wait > 0:
+                throttle.throttled_count += 1
+                throttle.total_wait_seconds += wait
+                throttle.max_wait_seconds = max(throttle.max_wait_seconds, wait)
+            throttle.save()
+        
+        return wait
+    
+    @classmethod
+    def acquire(cls, channel, config=None):
+        """Block until a send on the channel is allowed. Returns seconds waited."""
+        wait = cls.reserve(channel, config)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    @staticmethod
+    def get_metrics():
+        """Return throttle-wait metrics keyed by channel."""
+        return {t.channel: t.get_metrics() for t in NotificationThrottle.objects.all()}
 
 
 class EmailNotificationService:
@@ -60,6 +147,8 @@ class EmailNotificationService:
                 part2 = MIMEText(html_body, 'html')
                 message.attach(part2)
             
+            NotificationRateLimiter.acquire('EMAIL', config)
+            
             if use_tls:
                 context = ssl.create_default_context()
                 with smtplib.SMTP(smtp_host, smtp_port) as server:
@@ -129,6 +218,8 @@ class WhatsAppNotificationService:
             if not to_number.startswith('+'):
                 to_number = default_country_code + to_number
             
+            NotificationRateLimiter.acquire('WHATSAPP', config)
+            
             if provider.lower() == 'twilio':
                 return cls._send_via_twilio(api_url, account_sid, auth_token, sender_number, to_number, message)
             elif provider.lower() == 'meta':
@@ -226,6 +317,19 @@ class WhatsAppNotificationService:
 class NotificationService:
     """Unified notification service that handles all channels."""
     
+    @staticmethod
+    def enqueue(func, *args, **kwargs):
+        """Run a delivery job on the background notification pool."""
+        def run():
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                logger.exception('Notification job %s failed', getattr(func, '__name__', func))
+            finally:
+                connections.close_all()
+        
+        return _delivery_executor.submit(run)
+    
     @classmethod
     def send_notification(cls, user, subject, message, html_message=None):
         """Send notification via all enabled channels."""
@@ -246,3 +350,32 @@ class NotificationService:
             )
         
         return results
+    
+    @classmethod
+    def send_event(cls, user, event, context):
+        """Render a workflow event template for the user and send each channel its variant."""
+        results = {}
+        email_enabled = EmailNotificationService.is_enabled() and user.email
+        phone_number = getattr(user, 'phone_number', None)
+        whatsapp_enabled = WhatsAppNotificationService.is_enabled() and phone_number
+        
+        if not (email_enabled or whatsapp_enabled):
+            return results
+        
+        rendered = render_notification(event, context, recipient=user)
+        
+        if email_enabled:
+            results['email'] = EmailNotificationService.send_email(
+                to_email=user.email,
+                subject=rendered.subject,
+                body=rendered.text,
+                html_body=rendered.html
+            )
+        
+        if whatsapp_enabled:
+            results['whatsapp'] = WhatsAppNotificationService.send_message(
+                to_number=phone_number,
+                message=rendered.whatsapp
+            )
+        
+        return results
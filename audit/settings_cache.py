@@ -0,0 +1,63 @@
+import json
+import threading
+import uuid
+from django.core.cache import cache
+from .models import Setting
+
+
+SETTINGS_VERSION_KEY = 'audit:settings:version'
+
+_lock = threading.Lock()
+_cached = (None, None)
+
+
+def get_settings_version():
+    """Return the current settings version from the shared cache."""
+    version = cache.get(SETTINGS_VERSION_KEY)
+    if version is None:
+        cache.add(SETTINGS_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(SETTINGS_VERSION_KEY)
+    return version
+
+
+def bump_settings_version():
+    """Invalidate every process's cached settings tree."""
+    cache.set(SETTINGS_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def build_settings_tree():
+    """Load all settings and rebuild the nested structure from dotted keys."""
+    flat_settings = {}
+
+    for key, value in Setting.objects.values_list('key', 'value'):
+        # Try to parse JSON stored values back to their original types
+        try:
+            flat_settings[key] = json.loads(value) if value else value
+        except (json.JSONDecodeError, TypeError):
+            flat_settings[key] = value
+
+    result = {}
+    for key, value in flat_settings.items():
+        parts = key.split('.')
+        current = result
+        for part in parts[:-1]:
+            if part not in current:
+                current[part] = {}
+            current = current[part]
+        current[parts[-1]] = value
+
+    return result
+
+
+def get_settings_tree():
+    """Return ``(version, tree)``, rebuilding the tree only when the version changed."""
+    global _cached
+    version = get_settings_version()
+    cached = _cached
+    if cached[0] == version:
+        return cached
+
+    with _lock:
+        if _cached[0] != version:
+            _cached = (version, build_settings_tree())
+        return _cached
@@ -0,0 +1,11 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Setting
+from .settings_cache import bump_settings_version
+
+
+@receiver([post_save, post_delete], sender=Setting)
+def invalidate_settings_tree(sender, **kwargs):
+    # After commit, so no process caches the tree from the old rows under the new version.
+    transaction.on_commit(bump_settings_version)
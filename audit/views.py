@@ -4,7 +4,8 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import serializers
 from .models import AuditLog, Setting, NotificationSetting
-from .services import EmailNotificationService, WhatsAppNotificationService
+from .services import EmailNotificationService, WhatsAppNotificationService, NotificationRateLimiter
+from .settings_cache import get_settings_version, get_settings_tree
 
 
 class AuditLogSerializer(serializers.ModelSerializer):
@@ -43,29 +44,20 @@ class SettingSerializer(serializers.ModelSerializer):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_settings(request):
-    import json
-    settings = Setting.objects.all()
-    flat_settings = {}
-    
-    for s in settings:
-        # Try to parse JSON stored values back to their original types
-        try:
-            flat_settings[s.key] = json.loads(s.value) if s.value else s.value
-        except (json.JSONDecodeError, TypeError):
-            flat_settings[s.key] = s.value
-    
-    # Reconstruct nested structure from flat key-value pairs
-    result = {}
-    for key, value in flat_settings.items():
-        parts = key.split('.')
-        current = result
-        for part in parts[:-1]:
-            if part not in current:
-                current[part] = {}
-            current = current[part]
-        current[parts[-1]] = value
-    
-    return Response(result)
+    """Return the nested settings tree, or 304 when the client's ETag is current."""
+    version = get_settings_version()
+    etag = f'"{version}"'
+    
+    if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        version, tree = get_settings_tree()
+        etag = f'"{version}"'
+        response = Response(tree)
+    
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 @api_view(['POST'])
@@ -121,19 +113,22 @@ def get_notification_settings(request):
         channel='WHATSAPP',
         defaults={'enabled': False, 'config': {}}
     )
+    throttle_metrics = NotificationRateLimiter.get_metrics()
     
     return Response({
         'email': {
             'enabled': email_setting.enabled,
             'config': email_setting.get_masked_config(),
             'updated_at': email_setting.updated_at,
-            'updated_by': email_setting.updated_by.get_full_name() if email_setting.updated_by else None
+            'updated_by': email_setting.updated_by.get_full_name() if email_setting.updated_by else None,
+            'throttle': throttle_metrics.get('EMAIL')
         },
         'whatsapp': {
             'enabled': whatsapp_setting.enabled,
             'config': whatsapp_setting.get_masked_config(),
             'updated_at': whatsapp_setting.updated_at,
-            'updated_by': whatsapp_setting.updated_by.get_full_name() if whatsapp_setting.updated_by else None
+            'updated_by': whatsapp_setting.updated_by.get_full_name() if whatsapp_setting.updated_by else None,
+            'throttle': throttle_metrics.get('WHATSAPP')
         }
     })
 
@@ -288,12 +288,23 @@ export const settingsApi = {
   },
 };
 
+// DRF builds absolute `next` links from the backend's own host, which the
+// browser cannot reach behind the proxy, so only the cursor is kept.
+function cursorFrom(next: string | null): string | null {
+  return next ? new URL(next, window.location.origin).searchParams.get('cursor') : null;
+}
+
 export const usersApi = {
-  getAll: async () => {
-    const response = await fetch(`${API_BASE}/auth/users/`, {
+  getPage: async (cursor: string | null = null) => {
+    const params = new URLSearchParams({ page_size: '50' });
+    if (cursor) {
+      params.set('cursor', cursor);
+    }
+    const response = await fetch(`${API_BASE}/auth/users/?${params}`, {
       headers: getAuthHeaders(),
     });
-    return handleResponse<any[]>(response);
+    const page = await handleResponse<{ next: string | null; results: any[] }>(response);
+    return { results: page.results, nextCursor: cursorFrom(page.next) };
   },
 
   create: async (data: any) => {
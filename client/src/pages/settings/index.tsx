@@ -10,7 +10,7 @@ import { Checkbox } from "@/components/ui/checkbox";
 import { useState, useEffect } from "react";
 import { User, Shield, Bell, Settings as SettingsIcon, Database, Lock, Users, Loader2, Mail, MessageSquare, CheckCircle2, XCircle, AlertTriangle, Send } from "lucide-react";
 import { Role } from "@/lib/types";
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { settingsApi, usersApi, notificationSettingsApi } from "@/lib/api";
 import { useToast } from "@/hooks/use-toast";
 
@@ -25,11 +25,20 @@ export default function SettingsDashboard() {
     queryFn: settingsApi.get,
   });
 
-  // Fetch users
-  const { data: users = [], isLoading: usersLoading } = useQuery({
+  // Fetch users a page at a time
+  const {
+    data: userPages,
+    isLoading: usersLoading,
+    fetchNextPage: fetchMoreUsers,
+    hasNextPage: hasMoreUsers,
+    isFetchingNextPage: fetchingMoreUsers,
+  } = useInfiniteQuery({
     queryKey: ['users'],
-    queryFn: usersApi.getAll,
+    queryFn: ({ pageParam }) => usersApi.getPage(pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
   });
+  const users = userPages?.pages.flatMap((page) => page.results) ?? [];
 
   // Mutations
   const updateSettingsMutation = useMutation({
@@ -164,6 +173,14 @@ export default function SettingsDashboard() {
                     ))}
                   </TableBody>
                 </Table>
+                {hasMoreUsers && (
+                  <div className="flex justify-center pt-4">
+                    <Button variant="outline" size="sm" onClick={() => fetchMoreUsers()} disabled={fetchingMoreUsers}>
+                      {fetchingMoreUsers && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+                      Load more
+                    </Button>
+                  </div>
+                )}
               </CardContent>
             </Card>
 
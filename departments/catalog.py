@@ -0,0 +1,110 @@
+import threading
+import uuid
+from collections import namedtuple
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+from .models import Department, EvaluationQuestionVersion
+
+
+CATALOG_VERSION_KEY = 'departments:catalog:version'
+
+Catalog = namedtuple('Catalog', [
+    'version', 'departments', 'by_id', 'body', 'rows_by_name', 'rows_by_label',
+    'question_versions', 'current_versions',
+])
+
+DEPARTMENT_FIELDS = ['id', 'name', 'display_name', 'created_at']
+
+_lock = threading.Lock()
+_cached = None
+
+
+def get_catalog_version():
+    """Return the current catalog version from the shared cache."""
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """Invalidate every process's cached department catalog."""
+    cache.set(CATALOG_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def build_catalog(version):
+    """Serialize all departments with their evaluation questions and build lookups.
+
+    Besides the rendered JSON the catalog maps department names to rows,
+    question version ids to ``(key, text)`` and ``(department_id, key)`` of
+    every live question to its current version id.
+    """
+    from .serializers import DepartmentSerializer
+
+    queryset = list(Department.objects.prefetch_related('evaluation_questions').order_by('id'))
+    departments = DepartmentSerializer(queryset, many=True).data
+    rows_by_name = {
+        department.name: tuple(getattr(department, field) for field in DEPARTMENT_FIELDS)
+        for department in queryset
+    }
+    # Upper-cased display names first so department codes win on collisions.
+    rows_by_label = {}
+    for row in rows_by_name.values():
+        rows_by_label[row[2].upper()] = row
+    for row in rows_by_name.values():
+        rows_by_label[row[1].upper()] = row
+    question_versions = {}
+    latest_by_question = {}
+    for version_id, question_id, key, text in EvaluationQuestionVersion.objects.order_by('id').values_list(
+        'id', 'question_id', 'key', 'text'
+    ):
+        question_versions[version_id] = (key, text)
+        latest_by_question[question_id] = version_id
+    current_versions = {
+        (question.department_id, question.key): latest_by_question[question.id]
+        for department in queryset
+        for question in department.evaluation_questions.all()
+        if question.id in latest_by_question
+    }
+
+    return Catalog(
+        version=version,
+        departments=departments,
+        by_id={department['id']: department for department in departments},
+        body=JSONRenderer().render(departments),
+        rows_by_name=rows_by_name,
+        rows_by_label=rows_by_label,
+        question_versions=question_versions,
+        current_versions=current_versions,
+    )
+
+
+def get_catalog():
+    """Return the cached catalog, rebuilding it only when the version changed."""
+    global _cached
+    version = get_catalog_version()
+    cached = _cached
+    if cached is not None and cached.version == version:
+        return cached
+
+    with _lock:
+        if _cached is None or _cached.version != version:
+            _cached = build_catalog(version)
+        return _cached
+
+
+def resolve_department(value, lenient=False):
+    """Return the Department named ``value`` from the cached catalog, or None.
+
+    With ``lenient`` the display name is accepted too and matching ignores
+    case, for bulk imports of hand-edited files. A fresh instance is
+    returned on every call so callers never share state.
+    """
+    catalog = get_catalog()
+    row = catalog.rows_by_name.get(value)
+    if row is None and lenient:
+        row = catalog.rows_by_label.get(value.strip().upper())
+    if row is None:
+        return None
+    return Department.from_db('default', DEPARTMENT_FIELDS, row)
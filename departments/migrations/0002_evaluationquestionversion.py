@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def snapshot_questions(apps, schema_editor):
+    EvaluationQuestion = apps.get_model('departments', 'EvaluationQuestion')
+    EvaluationQuestionVersion = apps.get_model('departments', 'EvaluationQuestionVersion')
+    EvaluationQuestionVersion.objects.bulk_create([
+        EvaluationQuestionVersion(
+            question_id=question.id,
+            department_id=question.department_id,
+            key=question.key,
+            text=question.text,
+            is_required=question.is_required,
+        )
+        for question in EvaluationQuestion.objects.order_by('id')
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvaluationQuestionVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=50)),
+                ('text', models.TextField()),
+                ('is_required', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='question_versions', to='departments.department')),
+                ('question', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='versions', to='departments.evaluationquestion')),
+            ],
+            options={
+                'db_table': 'dj_evaluation_question_versions',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.RunPython(snapshot_questions, migrations.RunPython.noop),
+    ]
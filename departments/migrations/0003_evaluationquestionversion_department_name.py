@@ -0,0 +1,30 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def store_department_names(apps, schema_editor):
+    Department = apps.get_model('departments', 'Department')
+    EvaluationQuestionVersion = apps.get_model('departments', 'EvaluationQuestionVersion')
+    for department in Department.objects.all():
+        EvaluationQuestionVersion.objects.filter(department=department).update(department_name=department.name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0002_evaluationquestionversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluationquestionversion',
+            name='department_name',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.RunPython(store_department_names, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='evaluationquestionversion',
+            name='department',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='question_versions', to='departments.department'),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 
 
 class Department(models.Model):
@@ -35,3 +35,52 @@ class EvaluationQuestion(models.Model):
     
     def __str__(self):
         return f"{self.department.name} - {self.key}"
+    
+    def save(self, *args, **kwargs):
+        # One transaction, so the catalog is invalidated after the snapshot exists.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.snapshot()
+    
+    def snapshot(self):
+        """Record an immutable version when the question's wording changed."""
+        latest = self.versions.order_by('-id').first()
+        if latest and (latest.key, latest.text, latest.is_required) == (self.key, self.text, self.is_required):
+            return latest
+        return EvaluationQuestionVersion.objects.create(
+            question=self,
+            department_id=self.department_id,
+            department_name=self.department.name,
+            key=self.key,
+            text=self.text,
+            is_required=self.is_required,
+        )
+
+
+class EvaluationQuestionVersion(models.Model):
+    """Immutable snapshot of an evaluation question referenced by stored answers."""
+    question = models.ForeignKey(
+        EvaluationQuestion,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='versions'
+    )
+    # Snapshots outlive their department; the name records where they came from.
+    department = models.ForeignKey(
+        Department,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='question_versions'
+    )
+    department_name = models.CharField(max_length=50, blank=True)
+    key = models.CharField(max_length=50)
+    text = models.TextField()
+    is_required = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'dj_evaluation_question_versions'
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"{self.key} (v{self.id})"
@@ -1,5 +1,21 @@
 from rest_framework import serializers
 from .models import Department, EvaluationQuestion
+from .catalog import resolve_department
+
+
+class DepartmentField(serializers.Field):
+    """Custom field that accepts department name string and returns Department object."""
+    
+    def to_representation(self, value):
+        return value.name if value else None
+    
+    def to_internal_value(self, data):
+        if not data:
+            return None
+        department = resolve_department(data)
+        if department is None:
+            raise serializers.ValidationError(f"Department '{data}' does not exist")
+        return department
 
 
 class EvaluationQuestionSerializer(serializers.ModelSerializer):
@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Department, EvaluationQuestion, EvaluationQuestionVersion
+from .catalog import bump_catalog_version
+
+
+@receiver([post_save, post_delete], sender=Department)
+@receiver([post_save, post_delete], sender=EvaluationQuestion)
+@receiver([post_save, post_delete], sender=EvaluationQuestionVersion)
+def invalidate_catalog(sender, **kwargs):
+    # After commit, so no process caches the catalog from a half-written change.
+    transaction.on_commit(bump_catalog_version)
@@ -1,13 +1,42 @@
+from django.http import HttpResponse, Http404
 from rest_framework import generics
+from rest_framework.response import Response
+from .catalog import get_catalog, get_catalog_version
 from .models import Department
 from .serializers import DepartmentSerializer
 
 
 class DepartmentListView(generics.ListAPIView):
+    """Departments with their evaluation questions, served from the cached catalog.
+    
+    The pre-rendered JSON is returned with the catalog version as ETag, and
+    a matching ``If-None-Match`` gets a 304 without loading any departments.
+    """
     queryset = Department.objects.prefetch_related('evaluation_questions').all()
     serializer_class = DepartmentSerializer
+    
+    def list(self, request, *args, **kwargs):
+        version = get_catalog_version()
+        etag = f'"{version}"'
+        
+        if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+            response = HttpResponse(status=304)
+        else:
+            catalog = get_catalog()
+            etag = f'"{catalog.version}"'
+            response = HttpResponse(catalog.body, content_type='application/json')
+        
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
 
 
 class DepartmentDetailView(generics.RetrieveAPIView):
     queryset = Department.objects.prefetch_related('evaluation_questions').all()
     serializer_class = DepartmentSerializer
+    
+    def retrieve(self, request, *args, **kwargs):
+        department = get_catalog().by_id.get(kwargs['pk'])
+        if department is None:
+            raise Http404
+        return Response(department)
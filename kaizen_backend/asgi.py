@@ -2,6 +2,8 @@
 ASGI config for kaizen_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server (e.g. ``uvicorn kaizen_backend.asgi:application``)
+so the /api/kaizen/events/ streams wait on the event loop instead of a thread.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -0,0 +1,32 @@
+"""Checks that the default cache is shared between worker processes.
+
+Version keys (settings tree, department catalog, facet counts, user list),
+token versions and recently blacklisted refresh tokens live in the default
+cache and only work when every worker sees the same cache. A per-process
+backend silently serves stale data and accepts revoked tokens in the other
+workers, so security-relevant callers use ``cache_is_shared()`` to fall back
+to the database, and ``manage.py check`` reports the misconfiguration.
+"""
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+
+PROCESS_LOCAL_CACHE_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def cache_is_shared():
+    return settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHE_BACKENDS
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if cache_is_shared():
+        return []
+    return [Error(
+        'The default cache is local to each process.',
+        hint='Configure REDIS_URL or the database cache (manage.py createcachetable) in CACHES.',
+        id='kaizen_backend.E001',
+    )]
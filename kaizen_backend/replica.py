@@ -0,0 +1,165 @@
+"""Read-replica routing for reports and exports.
+
+When a ``replica`` database is configured (``REPLICA_DATABASE_URL``), reads
+made inside ``read_from_replica()`` go to it; everything else, and every
+write, uses ``default``. ``ReplicaReadMiddleware`` turns replica reads on
+for safe requests under ``REPLICA_READ_PATHS`` (reports and the bulk
+export), so a month-end CSV run does not compete with approvals on the
+primary.
+
+After a user's own successful write their reads stay on the primary for
+``REPLICA_PIN_SECONDS``, so they never see a replica that has not caught up
+yet. The pin is kept in the cache, which must be shared between workers
+for it to hold across processes.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+REPLICA_ALIAS = 'replica'
+REPLICA_READ_PATHS = getattr(settings, 'REPLICA_READ_PATHS', ['/api/reports/', '/api/kaizen/export/'])
+REPLICA_PIN_SECONDS = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_replica_reads = ContextVar('replica_reads', default=None)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in connections.databases
+
+
+def _pin_key(user_id):
+    return f'replica:pinned:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """Keep the user's reads on the primary while the replica catches up."""
+    cache.set(_pin_key(user_id), True, REPLICA_PIN_SECONDS)
+
+
+class _ReplicaReads:
+    """Replica read state for one request (or one ``read_from_replica`` block)."""
+
+    def __init__(self, request=None):
+        self.request = request
+        self._pinned = None
+        self._resolving = False
+
+    def pinned(self):
+        if self._pinned is not None:
+            return self._pinned
+        if self.request is None:
+            return False
+        if self._resolving:
+            # Resolving a session user queries the database; do that on the primary.
+            return True
+        self._resolving = True
+        try:
+            user = getattr(self.request, 'user', None)
+            user_id = user.pk if user is not None and user.is_authenticated else None
+        finally:
+            self._resolving = False
+        if user_id is None:
+            # DRF authenticates later in the request; decide once it has.
+            return False
+        self._pinned = bool(cache.get(_pin_key(user_id)))
+        return self._pinned
+
+
+@contextmanager
+def read_from_replica(request=None):
+    """Send reads in this block to the replica, unless ``request``'s user is pinned."""
+    token = _replica_reads.set(_ReplicaReads(request))
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _replica_reads.get()
+        if state is None or not replica_configured() or model._meta.app_label == 'django_cache':
+            # The database cache holds shared version keys; keep it on the primary.
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block or state.pinned():
+            # Reads inside a transaction must see its own writes.
+            return None
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Explicit, so objects read from the replica are saved to the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives its schema from the primary.
+        return False if db == REPLICA_ALIAS else None
+
+
+def _wrap_sync(iterator, request):
+    with read_from_replica(request):
+        yield from iterator
+
+
+async def _wrap_async(iterator, request):
+    with read_from_replica(request):
+        async for chunk in iterator:
+            yield chunk
+
+
+class ReplicaReadMiddleware:
+    """Read from the replica for report and export requests; pin users after writes."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _uses_replica(self, request):
+        return request.method in SAFE_METHODS and request.path.startswith(tuple(REPLICA_READ_PATHS))
+
+    def _finish(self, request, response):
+        if not replica_configured():
+            return response
+        if self._uses_replica(request) and response.streaming:
+            # Streamed bodies are read after the view returns.
+            if response.is_async:
+                response.streaming_content = _wrap_async(response.streaming_content, request)
+            else:
+                response.streaming_content = _wrap_sync(response.streaming_content, request)
+        elif request.method not in SAFE_METHODS and response.status_code < 400:
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                pin_to_primary(user.pk)
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if self._uses_replica(request):
+            with read_from_replica(request):
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
+        return self._finish(request, response)
+
+    async def __acall__(self, request):
+        if self._uses_replica(request):
+            with read_from_replica(request):
+                response = await self.get_response(request)
+        else:
+            response = await self.get_response(request)
+        return self._finish(request, response)
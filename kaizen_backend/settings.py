@@ -33,6 +33,7 @@ INSTALLED_APPS = [
     'kaizen_requests',
     'approvals',
     'audit',
+    'reports',
 ]
 
 MIDDLEWARE = [
@@ -44,6 +45,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'kaizen_backend.replica.ReplicaReadMiddleware',
 ]
 
 ROOT_URLCONF = 'kaizen_backend.urls'
@@ -89,6 +91,38 @@ else:
         }
     }
 
+# Optional read replica for reports and exports (see kaizen_backend/replica.py):
+# a postgres:// URL, or sqlite:///replica.sqlite3 for a local copy refreshed
+# with `manage.py refresh_sqlite_replica`.
+REPLICA_DATABASE_URL = os.environ.get('REPLICA_DATABASE_URL')
+
+if REPLICA_DATABASE_URL:
+    import urllib.parse as urlparse
+    replica_url = urlparse.urlparse(REPLICA_DATABASE_URL)
+    if replica_url.scheme == 'sqlite':
+        DATABASES['replica'] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / replica_url.path[1:],
+        }
+    else:
+        DATABASES['replica'] = {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': replica_url.path[1:],
+            'USER': replica_url.username,
+            'PASSWORD': replica_url.password,
+            'HOST': replica_url.hostname,
+            'PORT': replica_url.port or 5432,
+        }
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['kaizen_backend.replica.ReplicaRouter']
+
+# Paths whose safe requests read from the replica
+REPLICA_READ_PATHS = ['/api/reports/', '/api/kaizen/export/']
+
+# Seconds a user's reads stay on the primary after their own write
+REPLICA_PIN_SECONDS = 5
+
 AUTH_USER_MODEL = 'accounts.User'
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -100,7 +134,7 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -112,8 +146,37 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.TokenRefreshSerializer',
 }
 
+# Shared cache. Version keys, token versions and blacklist markers must be
+# visible to every worker process, so a per-process cache (LocMemCache) is not
+# supported: Redis when REDIS_URL is set, otherwise a database table created
+# with `python manage.py createcachetable`.
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'dj_cache',
+            'OPTIONS': {'MAX_ENTRIES': 100000},
+        }
+    }
+
+# Seconds a cached user token version is trusted before re-checking the database
+TOKEN_VERSION_CACHE_TTL = 30
+
+# Seconds between rebuilds of the per-process blacklisted refresh token Bloom filter
+TOKEN_BLACKLIST_BLOOM_REFRESH = 300
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 
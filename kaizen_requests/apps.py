@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class KaizenRequestsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'kaizen_requests'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
+        from . import changefeed  # noqa: F401 - registers the transition subscriber
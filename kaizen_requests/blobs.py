@@ -0,0 +1,137 @@
+"""Content-addressed attachment storage.
+
+Attachment content is stored once under ``blobs/<aa>/<bb>/<sha256>`` in the
+default storage, and every ``KaizenAttachment`` with the same bytes points
+at the same ``AttachmentBlob``. ``ref_count`` follows attachment saves and
+deletes; blobs that stay unreferenced past a grace period are removed by
+the ``gc_attachment_blobs`` command.
+"""
+import hashlib
+import os
+import tempfile
+from datetime import timedelta
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import AttachmentBlob, KaizenAttachment
+from .previews import delete_previews
+
+
+BLOB_PREFIX = 'blobs'
+# Kept inside MEDIA_ROOT so finished files are renamed, not copied, into place.
+BLOB_TEMP_DIR = getattr(settings, 'ATTACHMENT_BLOB_TEMP_DIR', os.path.join(settings.MEDIA_ROOT, BLOB_PREFIX, 'tmp'))
+HASH_BLOCK_SIZE = 64 * 1024
+
+
+def blob_name(sha256):
+    return f'{BLOB_PREFIX}/{sha256[:2]}/{sha256[2:4]}/{sha256}'
+
+
+def hash_file(path):
+    """Return ``(sha256, size)`` of a local file, read in blocks."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+            size += len(block)
+    return digest.hexdigest(), size
+
+
+def store_path(path, sha256=None, size=None):
+    """Move a local file into the blob store and return its AttachmentBlob.
+
+    The file at ``path`` is consumed: renamed into place when the default
+    storage is on the same filesystem, otherwise copied and removed. If the
+    content is already stored the file is simply deleted.
+    """
+    if sha256 is None:
+        sha256, size = hash_file(path)
+    name = blob_name(sha256)
+
+    # Touching the row first keeps a concurrent collection from removing it.
+    if AttachmentBlob.objects.filter(sha256=sha256).update(last_used_at=timezone.now()):
+        if default_storage.exists(name):
+            os.remove(path)
+            return AttachmentBlob.objects.get(sha256=sha256)
+
+    if default_storage.exists(name):
+        os.remove(path)
+    elif isinstance(default_storage, FileSystemStorage):
+        target = default_storage.path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+    else:
+        with open(path, 'rb') as f:
+            default_storage.save(name, File(f))
+        os.remove(path)
+
+    blob, _ = AttachmentBlob.objects.get_or_create(sha256=sha256, defaults={'file': name, 'size': size})
+    return blob
+
+
+def store_content(content):
+    """Stream a Django ``File`` into the blob store, hashing it on the way."""
+    os.makedirs(BLOB_TEMP_DIR, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(dir=BLOB_TEMP_DIR, delete=False) as tmp:
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks(HASH_BLOCK_SIZE):
+            digest.update(chunk)
+            tmp.write(chunk)
+            size += len(chunk)
+    return store_path(tmp.name, digest.hexdigest(), size)
+
+
+def adjust_references(sha256, delta):
+    if sha256:
+        AttachmentBlob.objects.filter(sha256=sha256).update(ref_count=F('ref_count') + delta)
+
+
+def collect_garbage(grace_hours=24, dry_run=False):
+    """Delete blobs unreferenced and unused for ``grace_hours``; returns ``(count, bytes)``."""
+    cutoff = timezone.now() - timedelta(hours=grace_hours)
+    candidates = AttachmentBlob.objects.filter(
+        ref_count=0, last_used_at__lt=cutoff, attachments__isnull=True
+    )
+    removed = freed = 0
+    for sha256 in list(candidates.values_list('sha256', flat=True)):
+        with transaction.atomic():
+            # Re-check under a row lock; an upload may have reused the blob.
+            blob = candidates.select_for_update(of=('self',)).filter(sha256=sha256).first()
+            if blob is None:
+                continue
+            if not dry_run:
+                default_storage.delete(blob.file.name)
+                delete_previews(sha256)
+                blob.delete()
+        removed += 1
+        freed += blob.size
+    return removed, freed
+
+
+
+def ingest_legacy_attachments(log=None):
+    """Move attachments stored before the blob store into it; returns ``(moved, blobs)``."""
+    moved = 0
+    blobs = set()
+    for attachment in KaizenAttachment.objects.filter(blob__isnull=True).exclude(file='').iterator():
+        old_name = attachment.file.name
+        if not default_storage.exists(old_name):
+            if log:
+                log(f'  Missing file for attachment {attachment.pk}: {old_name}')
+            continue
+        with attachment.file.open('rb'):
+            blob = store_content(attachment.file)
+        attachment.blob = blob
+        attachment.file = blob.file.name
+        attachment.save(update_fields=['file', 'blob'])
+        default_storage.delete(old_name)
+        blobs.add(blob.sha256)
+        moved += 1
+    return moved, len(blobs)
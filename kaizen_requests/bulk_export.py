@@ -0,0 +1,238 @@
+"""Streaming NDJSON export of kaizen requests with their approvals, evaluations,
+attachment metadata and audit events.
+
+Requests are read in keyset order, ``chunk_size`` at a time, and each
+chunk's children are loaded with one prefetch query per relation. Only one
+chunk is held in memory, and output is gzip-compressed as it is produced,
+so memory use does not grow with the size of the export. Under ASGI,
+``agzip_chunks`` streams the same pieces without Django buffering them.
+"""
+import json
+import zlib
+from datetime import datetime, time
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from approvals.answers import decode_answers
+from approvals.models import DepartmentEvaluation, HodApproval, ManagerApproval
+from audit.models import AuditLog
+from .models import KaizenAttachment, KaizenRequest
+
+
+EXPORT_CHUNK_SIZE = 500
+
+REQUEST_FIELDS = [
+    'id', 'request_id', 'title', 'station_name', 'assembly_line', 'issue_description',
+    'poka_yoke_description', 'reason_for_implementation', 'program', 'customer_part_number',
+    'date_of_origination', 'feasibility_status', 'feasibility_reason', 'expected_benefits',
+    'effect_of_changes', 'cost_estimate', 'cost_currency', 'cost_justification',
+    'spare_cost_included', 'requires_process_addition', 'requires_manpower_addition',
+    'has_pfmea', 'has_crr', 'has_checksheet', 'status', 'current_stage', 'rejection_reason',
+    'rejected_by_department', 'created_at', 'updated_at', 'export_updated_at',
+]
+
+
+def parse_since(value):
+    """Parse an ISO datetime or date (as midnight) into an aware datetime, or None."""
+    since = parse_datetime(value)
+    if since is None:
+        day = parse_date(value)
+        if day is None:
+            return None
+        since = datetime.combine(day, time.min)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def touch_requests(ids):
+    """Advance ``export_updated_at`` of requests whose exported children changed.
+
+    Approvals, evaluations and audit events are part of a request's export
+    record, so incremental exports must see their changes on the request.
+    ``updated_at`` is left alone: reports treat it as the last transition.
+    """
+    ids = {kaizen_id for kaizen_id in ids if kaizen_id is not None}
+    if ids:
+        KaizenRequest.objects.filter(pk__in=ids).update(export_updated_at=timezone.now())
+
+
+def _email(user):
+    return user.email if user else None
+
+
+def _department(department):
+    return department.name if department else None
+
+
+def _approval(approval, user):
+    return {
+        'department': _department(approval.department),
+        user: _email(getattr(approval, user)),
+        'stage_type': approval.stage_type,
+        'decision': approval.decision,
+        'remarks': approval.remarks,
+        'created_at': approval.created_at,
+        'updated_at': approval.updated_at,
+    }
+
+
+def _final_approval(approval, user):
+    if approval is None:
+        return None
+    return {
+        user: _email(getattr(approval, user)),
+        'approved': approval.approved,
+        'comments': approval.comments,
+        'cost_justification': approval.cost_justification,
+        'approved_at': approval.approved_at,
+    }
+
+
+def request_document(kaizen):
+    """Return the export record of a request whose relations are prefetched."""
+    document = {field: getattr(kaizen, field) for field in REQUEST_FIELDS}
+    document.update({
+        'department': _department(kaizen.department),
+        'initiator': _email(kaizen.initiator),
+        'rejected_by': _email(kaizen.rejected_by),
+        'manager_approvals': [_approval(a, 'manager') for a in kaizen.manager_approvals.all()],
+        'hod_approvals': [_approval(a, 'hod') for a in kaizen.hod_approvals.all()],
+        'agm_approval': _final_approval(getattr(kaizen, 'agm_approval', None), 'agm'),
+        'gm_approval': _final_approval(getattr(kaizen, 'gm_approval', None), 'gm'),
+        'evaluations': [
+            {
+                'department': _department(e.department),
+                'evaluator': _email(e.evaluator),
+                'evaluator_role': e.evaluator_role,
+                'overall_risk': e.overall_risk,
+                'answers': decode_answers(e.answers),
+                'created_at': e.created_at,
+            }
+            for e in kaizen.department_evaluations.all()
+        ],
+        'attachments': [
+            {
+                'id': a.id,
+                'file_name': a.file_name,
+                'file_type': a.file_type,
+                'file_size': a.file_size,
+                'document_type': a.document_type,
+                'sha256': a.blob_id,
+                'uploaded_by': _email(a.uploaded_by),
+                'uploaded_at': a.uploaded_at,
+            }
+            for a in kaizen.attachments.all()
+        ],
+        'audit_events': [
+            {
+                'action': log.action,
+                'user': _email(log.user),
+                'details': log.details,
+                'created_at': log.created_at,
+            }
+            for log in kaizen.audit_logs.all()
+        ],
+    })
+    return document
+
+
+class RequestGraphExporter:
+    """Yield one JSON document per request, optionally only those updated since a time.
+
+    Full exports walk the primary key; incremental exports walk
+    ``(export_updated_at, id)`` so they read only changed rows through the
+    index. Child changes reach the request through ``touch_requests``.
+    After iteration ``count`` and ``watermark`` (the latest
+    ``export_updated_at`` seen, to pass as the next ``updated_since``) are set.
+    """
+
+    def __init__(self, updated_since=None, chunk_size=EXPORT_CHUNK_SIZE):
+        self.updated_since = updated_since
+        self.chunk_size = chunk_size
+        self.count = 0
+        self.watermark = None
+
+    def _base_queryset(self):
+        return KaizenRequest.objects.select_related(
+            'department', 'initiator', 'rejected_by', 'agm_approval__agm', 'gm_approval__gm'
+        ).prefetch_related(
+            Prefetch('manager_approvals', ManagerApproval.objects.select_related('department', 'manager').order_by('id')),
+            Prefetch('hod_approvals', HodApproval.objects.select_related('department', 'hod').order_by('id')),
+            Prefetch('department_evaluations', DepartmentEvaluation.objects.select_related('department', 'evaluator').order_by('id')),
+            Prefetch('attachments', KaizenAttachment.objects.select_related('uploaded_by').order_by('id')),
+            Prefetch('audit_logs', AuditLog.objects.select_related('user').order_by('created_at', 'id')),
+        )
+
+    def _chunks(self):
+        queryset = self._base_queryset()
+        if self.updated_since is None:
+            last_id = 0
+            while True:
+                chunk = list(queryset.filter(id__gt=last_id).order_by('id')[:self.chunk_size])
+                if not chunk:
+                    return
+                yield chunk
+                last_id = chunk[-1].id
+        else:
+            queryset = queryset.filter(export_updated_at__gte=self.updated_since)
+            position = None
+            while True:
+                page = queryset
+                if position is not None:
+                    updated_at, last_id = position
+                    page = page.filter(
+                        Q(export_updated_at__gt=updated_at) | Q(export_updated_at=updated_at, id__gt=last_id)
+                    )
+                chunk = list(page.order_by('export_updated_at', 'id')[:self.chunk_size])
+                if not chunk:
+                    return
+                yield chunk
+                position = (chunk[-1].export_updated_at, chunk[-1].id)
+
+    def documents(self):
+        for chunk in self._chunks():
+            for kaizen in chunk:
+                self.count += 1
+                if self.watermark is None or kaizen.export_updated_at > self.watermark:
+                    self.watermark = kaizen.export_updated_at
+                yield request_document(kaizen)
+
+    def lines(self):
+        for document in self.documents():
+            yield json.dumps(document, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+    def gzip_chunks(self, flush_bytes=256 * 1024):
+        """Yield gzip-compressed NDJSON in pieces of roughly ``flush_bytes`` input."""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        buffer = []
+        size = 0
+        for line in self.lines():
+            data = line.encode()
+            buffer.append(data)
+            size += len(data)
+            if size >= flush_bytes:
+                compressed = compressor.compress(b''.join(buffer))
+                buffer, size = [], 0
+                if compressed:
+                    yield compressed
+        yield compressor.compress(b''.join(buffer)) + compressor.flush()
+
+    async def agzip_chunks(self):
+        """Async ``gzip_chunks``; each piece is produced on the sync thread in turn.
+
+        Django's ASGI handler buffers sync iterators whole, which would hold
+        the entire export in memory.
+        """
+        chunks = self.gzip_chunks()
+        done = object()
+        try:
+            while True:
+                chunk = await sync_to_async(next)(chunks, done)
+                if chunk is done:
+                    return
+                yield chunk
+        finally:
+            await sync_to_async(chunks.close)()
@@ -0,0 +1,228 @@
+"""Server-Sent Events feed of request status transitions.
+
+Committed transitions (see ``approvals.events``) are recorded in
+``KaizenStatusEvent`` and wake the streams open in this process at once.
+Streams also poll the table every ``STATUS_STREAM_POLL_INTERVAL`` seconds,
+which picks up transitions committed by other worker processes; ids that
+commit out of order are caught by re-checking the ones skipped. Events carry
+only ids and statuses, so clients refetch just the requests that changed
+instead of reloading their inbox lists.
+
+Under ASGI a stream waits on the event loop and holds no worker thread;
+under WSGI (``runserver``) it falls back to a blocking loop.
+"""
+import asyncio
+import json
+import threading
+import time
+from datetime import timedelta
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Max, Q
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+from accounts.authentication import ClaimsJWTAuthentication, add_user_claims
+from approvals.events import subscribe
+from reports.views import get_role_filter
+from .models import KaizenRequest, KaizenStatusEvent
+
+
+STATUS_STREAM_POLL_INTERVAL = getattr(settings, 'STATUS_STREAM_POLL_INTERVAL', 5)
+STATUS_STREAM_HEARTBEAT = getattr(settings, 'STATUS_STREAM_HEARTBEAT', 20)
+# Streams end after this many seconds and the client reconnects with
+# Last-Event-ID, so a server restart or token expiry never strands it.
+STATUS_STREAM_MAX_DURATION = getattr(settings, 'STATUS_STREAM_MAX_DURATION', 300)
+STATUS_STREAM_TOKEN_LIFETIME = getattr(settings, 'STATUS_STREAM_TOKEN_LIFETIME', 60)
+STATUS_STREAM_RETRY_MS = 3000
+STATUS_EVENT_BATCH = 100
+# Ids are assigned on insert, so a later id can commit first. Missing ids
+# below the cursor are re-checked for this long before they count as
+# rolled back.
+STATUS_STREAM_GAP_TIMEOUT = getattr(settings, 'STATUS_STREAM_GAP_TIMEOUT', 10)
+
+EVENT_FIELDS = ['id', 'kaizen_request_id', 'request_id', 'previous_status', 'status', 'created_at']
+
+_wakers = set()
+_wakers_lock = threading.Lock()
+
+
+def _wake_streams():
+    with _wakers_lock:
+        wakers = list(_wakers)
+    for wake in wakers:
+        try:
+            wake()
+        except RuntimeError:
+            # The stream's event loop has already closed.
+            pass
+
+
+@subscribe
+def record_status_event(event):
+    """Append a committed transition to the change log and wake open streams."""
+    KaizenStatusEvent.objects.create(
+        kaizen_request_id=event.kaizen_id,
+        request_id=event.request_id,
+        previous_status=event.previous_status,
+        status=event.status,
+    )
+    _wake_streams()
+
+
+class StreamToken(AccessToken):
+    """Short-lived token that can only open a status stream.
+
+    EventSource cannot send headers, so the token travels in the query
+    string, where proxies and access logs record it; unlike an access token
+    it is rejected by the API and expires within a minute.
+    """
+    token_type = 'stream'
+    lifetime = timedelta(seconds=STATUS_STREAM_TOKEN_LIFETIME)
+
+
+def issue_stream_token(user):
+    return str(add_user_claims(StreamToken.for_user(user), user))
+
+
+def authenticate_stream(request):
+    """Return the user of a Bearer header or ``stream_token`` parameter, or None."""
+    authentication = ClaimsJWTAuthentication()
+    header = authentication.get_header(request)
+    try:
+        if header:
+            raw_token = authentication.get_raw_token(header)
+            token = authentication.get_validated_token(raw_token) if raw_token else None
+        else:
+            raw_token = request.GET.get('stream_token')
+            token = StreamToken(raw_token) if raw_token else None
+        return authentication.get_user(token) if token else None
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+
+
+def latest_event_id():
+    return KaizenStatusEvent.objects.aggregate(latest=Max('id'))['latest'] or 0
+
+
+def visible_events(user):
+    """Events on requests the user can see, plus cross-department items leaving their inbox."""
+    role_filter = get_role_filter(user)
+    if not role_filter:
+        return KaizenStatusEvent.objects.all()
+    visible = Q(kaizen_request__in=KaizenRequest.objects.filter(role_filter).values('id'))
+    if user.role == 'MANAGER':
+        visible |= Q(previous_status='PENDING_CROSS_MANAGER')
+    elif user.role == 'HOD':
+        visible |= Q(previous_status='PENDING_CROSS_HOD')
+    return KaizenStatusEvent.objects.filter(visible)
+
+
+def format_event(row):
+    data = json.dumps({
+        'id': row['kaizen_request_id'],
+        'request_id': row['request_id'],
+        'previous_status': row['previous_status'],
+        'status': row['status'],
+        'at': row['created_at'],
+    }, cls=DjangoJSONEncoder)
+    return f"id: {row['id']}\nevent: status\ndata: {data}\n\n"
+
+
+class StatusStream:
+    """One client's stream of status events after ``after_id``."""
+
+    def __init__(self, user, after_id):
+        self.user = user
+        self.after_id = after_id
+        # Skipped ids below the cursor, mapped to when to stop waiting for them.
+        self.gaps = {}
+
+    def poll(self):
+        """Return ``(text, more)`` for the next batch of events visible to the user.
+
+        The cheap primary key probe runs first, so idle polls never touch the
+        role filter; the cursor then moves past events the user cannot see.
+        Ids the cursor skipped are probed again until they commit or time out.
+        """
+        now = time.monotonic()
+        self.gaps = {event_id: until for event_id, until in self.gaps.items() if until > now}
+        ids = list(
+            KaizenStatusEvent.objects.filter(Q(id__gt=self.after_id) | Q(id__in=list(self.gaps)))
+            .order_by('id').values_list('id', flat=True)[:STATUS_EVENT_BATCH]
+        )
+        if not ids:
+            return '', False
+        new_ids = [event_id for event_id in ids if event_id > self.after_id]
+        for event_id in ids:
+            self.gaps.pop(event_id, None)
+        if new_ids:
+            present = set(new_ids)
+            # Only ids just below the batch can still be in flight.
+            for event_id in range(max(self.after_id + 1, new_ids[0] - STATUS_EVENT_BATCH), new_ids[-1]):
+                if event_id not in present:
+                    self.gaps[event_id] = now + STATUS_STREAM_GAP_TIMEOUT
+            self.after_id = new_ids[-1]
+        rows = visible_events(self.user).filter(id__in=ids).order_by('id').values(*EVENT_FIELDS)
+        return ''.join(format_event(row) for row in rows), len(ids) == STATUS_EVENT_BATCH
+
+    def _open(self, wake):
+        with _wakers_lock:
+            _wakers.add(wake)
+
+    def _close(self, wake):
+        with _wakers_lock:
+            _wakers.discard(wake)
+
+    async def aevents(self):
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+
+        def wake():
+            loop.call_soon_threadsafe(wakeup.set)
+
+        self._open(wake)
+        try:
+            yield f'retry: {STATUS_STREAM_RETRY_MS}\n\n'
+            deadline = loop.time() + STATUS_STREAM_MAX_DURATION
+            last_write = loop.time()
+            while loop.time() < deadline:
+                wakeup.clear()
+                text, more = await sync_to_async(self.poll)()
+                if text:
+                    yield text
+                    last_write = loop.time()
+                elif loop.time() - last_write >= STATUS_STREAM_HEARTBEAT:
+                    yield ': keepalive\n\n'
+                    last_write = loop.time()
+                if more:
+                    continue
+                timeout = min(STATUS_STREAM_POLL_INTERVAL, deadline - loop.time())
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=max(timeout, 0))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._close(wake)
+
+    def events(self):
+        wakeup = threading.Event()
+        self._open(wakeup.set)
+        try:
+            yield f'retry: {STATUS_STREAM_RETRY_MS}\n\n'
+            deadline = time.monotonic() + STATUS_STREAM_MAX_DURATION
+            last_write = time.monotonic()
+            while time.monotonic() < deadline:
+                wakeup.clear()
+                text, more = self.poll()
+                if text:
+                    yield text
+                    last_write = time.monotonic()
+                elif time.monotonic() - last_write >= STATUS_STREAM_HEARTBEAT:
+                    yield ': keepalive\n\n'
+                    last_write = time.monotonic()
+                if not more:
+                    wakeup.wait(min(STATUS_STREAM_POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+        finally:
+            self._close(wakeup.set)
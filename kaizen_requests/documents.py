@@ -0,0 +1,52 @@
+"""Attachment document types and the per-request compliance flags derived from them."""
+from django.utils import timezone
+from .models import KaizenAttachment, KaizenRequest
+
+
+# Filename markers. An attachment's document_type takes the first match, but
+# compliance counts every marker in the name, as the report always has.
+DOCUMENT_MARKERS = [
+    ('PFMEA', 'pfmea'),
+    ('CRR', 'crr'),
+    ('CHECKSHEET', 'check'),
+]
+
+COMPLIANCE_FLAGS = {
+    'PFMEA': 'has_pfmea',
+    'CRR': 'has_crr',
+    'CHECKSHEET': 'has_checksheet',
+}
+
+DOCUMENT_TYPES = {choice for choice, _ in KaizenAttachment.DOCUMENT_TYPE_CHOICES}
+
+
+def classify_document(file_name):
+    name = (file_name or '').lower()
+    for document_type, marker in DOCUMENT_MARKERS:
+        if marker in name:
+            return document_type
+    return 'OTHER'
+
+
+def document_markers(file_name):
+    """Every document type whose marker appears in ``file_name``."""
+    name = (file_name or '').lower()
+    return {document_type for document_type, marker in DOCUMENT_MARKERS if marker in name}
+
+
+def update_compliance_flags(kaizen_request_id):
+    """Recompute a request's compliance flags from its attachments.
+
+    An attachment satisfies its own document type and every type named in
+    its file name, so ``pfmea_checksheet.pdf`` covers both documents.
+    """
+    present = set()
+    for document_type, file_name in KaizenAttachment.objects.filter(
+        kaizen_request_id=kaizen_request_id
+    ).values_list('document_type', 'file_name'):
+        present.add(document_type)
+        present |= document_markers(file_name)
+    # Only the export watermark: reports read updated_at as the last transition.
+    KaizenRequest.objects.filter(pk=kaizen_request_id).update(export_updated_at=timezone.now(), **{
+        flag: document_type in present for document_type, flag in COMPLIANCE_FLAGS.items()
+    })
@@ -0,0 +1,117 @@
+"""Serving attachment files with conditional requests and byte ranges.
+
+Files are streamed from storage in blocks by ``FileResponse``. When
+``ATTACHMENT_SENDFILE`` is ``'x-accel-redirect'`` (nginx) or
+``'x-sendfile'`` (Apache, lighttpd) the response only names the file and
+the front proxy transfers it, so a large download does not hold a Django
+worker. Authorization and conditional checks always run in Django first.
+"""
+import re
+from urllib.parse import quote
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+
+ATTACHMENT_SENDFILE = getattr(settings, 'ATTACHMENT_SENDFILE', None)
+# Internal nginx location aliased to MEDIA_ROOT, e.g. ``location /protected-media/ { internal; }``.
+ATTACHMENT_ACCEL_PREFIX = getattr(settings, 'ATTACHMENT_ACCEL_PREFIX', '/protected-media/')
+DOWNLOAD_BLOCK_SIZE = getattr(settings, 'ATTACHMENT_DOWNLOAD_BLOCK_SIZE', 256 * 1024)
+DOWNLOAD_CACHE_CONTROL = 'private, max-age=3600'
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """Return ``(start, end)`` (inclusive) for a single byte range, or None for the full file.
+
+    Multiple ranges and malformed headers are ignored, which RFC 9110 allows;
+    a well-formed range outside the file raises ``RangeNotSatisfiable``.
+    """
+    match = _RANGE_RE.match((header or '').strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first == '':
+        # Suffix range: the last N bytes.
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise RangeNotSatisfiable
+    return start, end
+
+
+class _RangeFile:
+    """Read-only view of ``length`` bytes of a file starting at ``start``."""
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def serve_file(request, name, size, content_type, filename, etag, last_modified, as_attachment=True):
+    """Return a response for storage file ``name`` honouring conditional and Range headers."""
+    last_modified_ts = int(last_modified.timestamp())
+    conditional = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    if conditional is not None:
+        conditional['Cache-Control'] = DOWNLOAD_CACHE_CONTROL
+        return conditional
+
+    if ATTACHMENT_SENDFILE:
+        # The proxy handles Range itself; Django only authorizes.
+        response = HttpResponse(content_type=content_type)
+        if ATTACHMENT_SENDFILE == 'x-accel-redirect':
+            response['X-Accel-Redirect'] = quote(ATTACHMENT_ACCEL_PREFIX + name)
+        else:
+            response['X-Sendfile'] = default_storage.path(name)
+    else:
+        byte_range = None
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if not if_range or if_range == etag or parse_http_date_safe(if_range) == last_modified_ts:
+            try:
+                byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+            except RangeNotSatisfiable:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{size}'
+                return response
+
+        file = default_storage.open(name, 'rb')
+        if byte_range is None:
+            response = FileResponse(file, content_type=content_type)
+            response['Content-Length'] = size
+        else:
+            start, end = byte_range
+            response = FileResponse(_RangeFile(file, start, end - start + 1), status=206, content_type=content_type)
+            response['Content-Length'] = end - start + 1
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response.block_size = DOWNLOAD_BLOCK_SIZE
+        response['Accept-Ranges'] = 'bytes'
+
+    response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified_ts)
+    response['Cache-Control'] = DOWNLOAD_CACHE_CONTROL
+    return response
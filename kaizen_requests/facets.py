@@ -0,0 +1,130 @@
+import hashlib
+import uuid
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, Q, Value, When
+from departments.catalog import get_catalog
+from .models import KaizenRequest
+
+
+KAIZEN_VERSION_KEY = 'kaizen_requests:version'
+FACETS_CACHE_TTL = 300
+
+# (key, label, lower bound exclusive, upper bound inclusive)
+COST_BANDS = [
+    ('UP_TO_50K', 'Up to 50,000', None, 50000),
+    ('50K_TO_100K', '50,000 - 100,000', 50000, 100000),
+    ('ABOVE_100K', 'Above 100,000', 100000, None),
+]
+
+# Facet name (also its query parameter) -> grouped column.
+FACETS = {
+    'status': 'status',
+    'department': 'department_id',
+    'program': 'program',
+    'assembly_line': 'assembly_line',
+    'cost_band': 'cost_band',
+}
+
+STATUS_LABELS = dict(KaizenRequest.STATUS_CHOICES)
+COST_BAND_LABELS = {key: label for key, label, _, _ in COST_BANDS}
+
+
+def get_kaizen_version():
+    """Return the current kaizen data version from the shared cache."""
+    version = cache.get(KAIZEN_VERSION_KEY)
+    if version is None:
+        cache.add(KAIZEN_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(KAIZEN_VERSION_KEY)
+    return version
+
+
+def bump_kaizen_version():
+    """Invalidate cached aggregates over kaizen requests."""
+    cache.set(KAIZEN_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def cost_band_filter(band):
+    """Return a Q selecting requests in a cost band, or None for an unknown band."""
+    for key, _, lower, upper in COST_BANDS:
+        if key == band:
+            condition = Q()
+            if lower is not None:
+                condition &= Q(cost_estimate__gt=lower)
+            if upper is not None:
+                condition &= Q(cost_estimate__lte=upper)
+            return condition
+    return None
+
+
+def cost_band_expression():
+    return Case(
+        *[When(cost_estimate__lte=upper, then=Value(key)) for key, _, _, upper in COST_BANDS if upper is not None],
+        default=Value(COST_BANDS[-1][0]),
+        output_field=CharField(),
+    )
+
+
+def _scope_signature(user):
+    # Mirrors what get_role_filter depends on for each role.
+    if user.role in ['AGM', 'GM', 'ADMIN']:
+        return user.role
+    if user.role in ['MANAGER', 'HOD']:
+        return f'{user.role}:{user.department_id}'
+    return f'user:{user.id}'
+
+
+def facets_cache_key(user, params):
+    selected = sorted((key, params.get(key)) for key in params if params.get(key))
+    signature = f'{get_kaizen_version()}:{_scope_signature(user)}:{selected}'
+    return 'kaizen_requests:facets:' + hashlib.sha256(signature.encode()).hexdigest()
+
+
+def _label(facet, value, departments):
+    if facet == 'status':
+        return STATUS_LABELS.get(value, value)
+    if facet == 'department':
+        department = departments.get(value)
+        return department['display_name'] if department else None
+    if facet == 'cost_band':
+        return COST_BAND_LABELS.get(value, value)
+    return value
+
+
+def compute_facets(queryset, selected):
+    """Count every facet value for ``queryset`` in one grouped query.
+    
+    ``queryset`` must not be filtered on the facet columns; ``selected``
+    maps facet names to the values chosen in the UI. Each facet is counted
+    with the other facets' selections applied but not its own, so a chip
+    shows how many requests selecting it would yield.
+    """
+    groups = queryset.order_by().annotate(cost_band=cost_band_expression()).values(
+        *FACETS.values()
+    ).annotate(count=Count('id'))
+    
+    counts = {facet: {} for facet in FACETS}
+    total = 0
+    for group in groups:
+        mismatched = [
+            facet for facet, column in FACETS.items()
+            if facet in selected and str(group[column]) != selected[facet]
+        ]
+        if len(mismatched) > 1:
+            continue
+        for facet in mismatched or FACETS:
+            value = group[FACETS[facet]]
+            counts[facet][value] = counts[facet].get(value, 0) + group['count']
+        if not mismatched:
+            total += group['count']
+    
+    departments = get_catalog().by_id
+    return {
+        'total': total,
+        'facets': {
+            facet: [
+                {'value': value, 'label': _label(facet, value, departments), 'count': count}
+                for value, count in sorted(values.items(), key=lambda item: (-item[1], str(item[0])))
+            ]
+            for facet, values in counts.items()
+        },
+    }
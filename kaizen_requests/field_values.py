@@ -0,0 +1,97 @@
+from collections import Counter
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Q
+from .models import KaizenFieldValue, KaizenRequest
+
+
+def _adjust(field, value, delta):
+    """Add ``delta`` to the frequency of a field value, creating or removing its row."""
+    normalized = KaizenFieldValue.normalize(value or '')
+    if not normalized:
+        return
+    rows = KaizenFieldValue.objects.filter(field=field, normalized=normalized)
+    if delta < 0:
+        rows.filter(frequency__gt=-delta).update(frequency=F('frequency') + delta)
+        rows.filter(frequency__lte=-delta).delete()
+        return
+    if rows.update(frequency=F('frequency') + delta):
+        return
+    try:
+        with transaction.atomic():
+            KaizenFieldValue.objects.create(
+                field=field, value=' '.join(value.split()), normalized=normalized, frequency=delta
+            )
+    except IntegrityError:
+        # Another writer created the row first.
+        rows.update(frequency=F('frequency') + delta)
+
+
+def record_saved(instance, loaded):
+    """Move counts from the values a request was loaded with (``{}`` when new) to its saved values."""
+    for field in KaizenFieldValue.FIELDS:
+        old, new = loaded.get(field), getattr(instance, field)
+        if KaizenFieldValue.normalize(old or '') == KaizenFieldValue.normalize(new or ''):
+            continue
+        _adjust(field, old, -1)
+        _adjust(field, new, 1)
+
+
+def record_created(instances):
+    """Count the values of requests inserted with ``bulk_create``."""
+    for field in KaizenFieldValue.FIELDS:
+        counts = Counter()
+        values = {}
+        for instance in instances:
+            value = getattr(instance, field)
+            normalized = KaizenFieldValue.normalize(value or '')
+            if normalized:
+                counts[normalized] += 1
+                values.setdefault(normalized, value)
+        for normalized, count in counts.items():
+            _adjust(field, values[normalized], count)
+
+
+def record_deleted(instance):
+    for field in KaizenFieldValue.FIELDS:
+        _adjust(field, getattr(instance, field), -1)
+
+
+def rebuild_field_values():
+    """Recount every field value from the requests table; returns the number of rows."""
+    rows = {}
+    for field in KaizenFieldValue.FIELDS:
+        for value, count in KaizenRequest.objects.exclude(**{f'{field}__isnull': True}).values_list(
+            field
+        ).annotate(count=Count('id')).order_by():
+            normalized = KaizenFieldValue.normalize(value)
+            if not normalized:
+                continue
+            row = rows.setdefault((field, normalized), KaizenFieldValue(
+                field=field, value=' '.join(value.split()), normalized=normalized, frequency=0
+            ))
+            row.frequency += count
+
+    with transaction.atomic():
+        KaizenFieldValue.objects.all().delete()
+        KaizenFieldValue.objects.bulk_create(rows.values(), batch_size=1000)
+    return len(rows)
+
+
+def _prefix_filter(prefix):
+    if connection.vendor == 'sqlite':
+        # SQLite's LIKE is case-insensitive and cannot use the index; its
+        # byte-wise range on the unique (field, normalized) index can.
+        return Q(normalized__gte=prefix, normalized__lt=prefix[:-1] + chr(ord(prefix[-1]) + 1))
+    # Linguistic collations (PostgreSQL's default) ignore spaces and
+    # punctuation when comparing, so a range would be wrong there. LIKE uses
+    # the varchar_pattern_ops index from migration 0015.
+    return Q(normalized__startswith=prefix)
+
+
+def suggest(field, prefix, limit=10):
+    """Return the most used values of ``field`` starting with ``prefix``."""
+    rows = KaizenFieldValue.objects.filter(field=field)
+    prefix = KaizenFieldValue.normalize(prefix or '')
+    if prefix:
+        rows = rows.filter(_prefix_filter(prefix))
+    return list(rows.order_by('-frequency', 'normalized').values('value', 'frequency')[:limit])
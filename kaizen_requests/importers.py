@@ -0,0 +1,427 @@
+import csv
+import json
+import os
+import time
+from datetime import datetime, time as dt_time
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from accounts.models import User
+from approvals.answers import encode_answers
+from approvals.models import DepartmentEvaluation, HodApproval, ManagerApproval
+from departments.catalog import resolve_department
+from .facets import bump_kaizen_version
+from .field_values import record_created
+from .models import KaizenRequest, RequestIdSequence
+from .similarity import index_requests
+
+
+# Column headers of exports/kaizen_requests.csv and model field names, lower-cased.
+HEADER_ALIASES = {
+    'request id': 'request_id',
+    'title': 'title',
+    'station name': 'station_name',
+    'assembly line': 'assembly_line',
+    'issue description': 'issue_description',
+    'poka yoke description': 'poka_yoke_description',
+    'reason for implementation': 'reason_for_implementation',
+    'program': 'program',
+    'part number': 'customer_part_number',
+    'customer part number': 'customer_part_number',
+    'date of origination': 'date_of_origination',
+    'department': 'department',
+    'initiator': 'initiator',
+    'initiator email': 'initiator',
+    'feasibility status': 'feasibility_status',
+    'feasibility reason': 'feasibility_reason',
+    'expected benefits': 'expected_benefits',
+    'effect of changes': 'effect_of_changes',
+    'cost estimate': 'cost_estimate',
+    'cost estimate (inr)': 'cost_estimate',
+    'cost currency': 'cost_currency',
+    'cost justification': 'cost_justification',
+    'spare cost included': 'spare_cost_included',
+    'requires process addition': 'requires_process_addition',
+    'requires manpower addition': 'requires_manpower_addition',
+    'status': 'status',
+    'current stage': 'current_stage',
+    'rejection reason': 'rejection_reason',
+    'rejected by department': 'rejected_by_department',
+    'created at': 'created_at',
+    'manager approvals': 'manager_approvals',
+    'hod approvals': 'hod_approvals',
+    'evaluations': 'evaluations',
+}
+
+VALID_STATUSES = {choice for choice, _ in KaizenRequest.STATUS_CHOICES}
+VALID_STAGES = {choice for choice, _ in KaizenRequest.STAGE_CHOICES}
+VALID_FEASIBILITY = {choice for choice, _ in KaizenRequest.FEASIBILITY_CHOICES}
+REQUIRED_FIELDS = ['title', 'station_name', 'issue_description', 'program', 'department']
+TEXT_FIELDS = [
+    'title', 'station_name', 'assembly_line', 'issue_description', 'poka_yoke_description',
+    'reason_for_implementation', 'program', 'customer_part_number', 'feasibility_reason',
+    'cost_justification', 'rejection_reason', 'rejected_by_department',
+]
+BOOLEAN_FIELDS = ['spare_cost_included', 'requires_process_addition', 'requires_manpower_addition']
+TRUE_VALUES = {'true', 'yes', '1', 'y'}
+MAX_LENGTHS = {
+    field.name: field.max_length for field in KaizenRequest._meta.fields if getattr(field, 'max_length', None)
+}
+# Fields read as text; NDJSON may carry any JSON type in them.
+SCALAR_FIELDS = list(dict.fromkeys(TEXT_FIELDS + REQUIRED_FIELDS + [
+    'request_id', 'status', 'current_stage', 'feasibility_status', 'cost_currency',
+    'initiator', 'date_of_origination', 'created_at',
+]))
+LIST_FIELDS = ['expected_benefits', 'effect_of_changes']
+COST_FIELD = KaizenRequest._meta.get_field('cost_estimate')
+
+
+def _header_field(header):
+    key = header.strip().lower().replace('_', ' ')
+    return HEADER_ALIASES.get(key)
+
+
+def read_csv_rows(stream):
+    """Yield ``(line_number, row)`` from a CSV stream with header names mapped to fields."""
+    reader = csv.reader(stream)
+    try:
+        header = next(reader)
+    except StopIteration:
+        return
+    fields = [_header_field(h) for h in header]
+    for line_number, values in enumerate(reader, start=2):
+        if not any(v.strip() for v in values):
+            continue
+        yield line_number, {f: v.strip() for f, v in zip(fields, values) if f}
+
+
+def read_ndjson_rows(stream):
+    """Yield ``(line_number, row)`` from one JSON object per line.
+
+    Objects may carry ``manager_approvals``, ``hod_approvals`` and
+    ``evaluations`` lists; lines that are not JSON objects are yielded as
+    ``None`` so the importer reports them.
+    """
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield line_number, None
+            continue
+        if not isinstance(data, dict):
+            yield line_number, None
+            continue
+        row = {}
+        for key, value in data.items():
+            field = _header_field(key)
+            if field:
+                row[field] = value.strip() if isinstance(value, str) else value
+        yield line_number, row
+
+
+def _parse_timestamp(value):
+    if isinstance(value, str) and value:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                raise ValueError(f"Invalid date '{value}'")
+            parsed = datetime.combine(day, dt_time.min)
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+    return None
+
+
+def _scalars(data, fields):
+    """Return ``data`` with ``fields`` as stripped strings (None when empty).
+
+    Numbers are accepted as text; objects, lists and booleans are not.
+    """
+    data = dict(data)
+    for field in fields:
+        value = data.get(field)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValueError(f'{field} must be text')
+        data[field] = str(value).strip() or None
+    return data
+
+
+def _cost(value):
+    if isinstance(value, bool) or not isinstance(value, (str, int, float, type(None))):
+        raise ValueError('cost_estimate must be a number')
+    try:
+        cost = Decimal(str(value or 0).replace(',', ''))
+        if cost.is_finite():
+            cost = cost.quantize(Decimal(1).scaleb(-COST_FIELD.decimal_places))
+        COST_FIELD.run_validators(cost)
+    except (InvalidOperation, ValidationError):
+        raise ValueError(
+            f"Invalid cost estimate '{value}' (at most {COST_FIELD.max_digits - COST_FIELD.decimal_places} "
+            f"digits before the decimal point)"
+        )
+    return cost
+
+
+def _choice(model, field, value):
+    value = str(value).upper()
+    if value not in {choice for choice, _ in model._meta.get_field(field).choices}:
+        raise ValueError(f"Invalid {field} '{value}'")
+    return value
+
+
+def _restore_timestamps(model, items, fields):
+    """Set ``fields`` to each object's timestamp with one UPDATE per distinct value.
+
+    Historical rows mostly carry dates only, so there are few distinct
+    values per chunk; this is much cheaper than a CASE-based bulk_update.
+    """
+    by_timestamp = {}
+    for obj, timestamp in items:
+        by_timestamp.setdefault(timestamp, []).append(obj.pk)
+        for field in fields:
+            setattr(obj, field, timestamp)
+    for timestamp, ids in by_timestamp.items():
+        model.objects.filter(pk__in=ids).update(**{field: timestamp for field in fields})
+
+
+class KaizenImporter:
+    """Bulk import of historical kaizen requests from CSV or NDJSON rows.
+
+    Rows are validated in chunks against the cached department catalog and
+    a user map loaded once. Request ids missing from the input are reserved
+    in one block per year and chunk, and each chunk is inserted with
+    ``bulk_create`` (requests, then approvals and evaluations) in its own
+    transaction. With a ``checkpoint`` path the last committed line is
+    recorded after every chunk so an interrupted import can resume.
+    """
+
+    def __init__(self, chunk_size=1000, default_initiator=None, dry_run=False, checkpoint=None, resume=False, log=None):
+        self.chunk_size = chunk_size
+        self.default_initiator = (default_initiator or '').lower()
+        self.dry_run = dry_run
+        self.checkpoint = checkpoint
+        self.resume = resume
+        self.log = log or (lambda message: None)
+        self.users = {}
+        self.departments = {}
+        self.seen = set()
+        self.summary = {'created': 0, 'skipped': 0, 'errors': [], 'rows': 0, 'seconds': 0.0, 'resumed_after': 0}
+
+    def run(self, rows):
+        start = time.perf_counter()
+        self.users = {email.lower(): pk for pk, email in User.objects.values_list('id', 'email')}
+        if self.default_initiator and self.default_initiator not in self.users:
+            raise ValueError(f"Initiator '{self.default_initiator}' does not exist")
+
+        resume_after = self._read_checkpoint() if self.resume else 0
+        self.summary['resumed_after'] = resume_after
+        if resume_after:
+            self.log(f'Resuming after line {resume_after}')
+
+        rows = (row for row in rows if row[0] > resume_after)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            chunk_start = time.perf_counter()
+            created = self._import_chunk(chunk)
+            elapsed = time.perf_counter() - chunk_start
+            self.summary['rows'] += len(chunk)
+            if not self.dry_run:
+                self._write_checkpoint(chunk[-1][0])
+            self.log(
+                f'Lines {chunk[0][0]}-{chunk[-1][0]}: {created} created, '
+                f'{len(chunk) / elapsed:,.0f} rows/s'
+            )
+
+        self.summary['seconds'] = round(time.perf_counter() - start, 2)
+        if self.summary['created'] and not self.dry_run:
+            bump_kaizen_version()
+        return self.summary
+
+    def _read_checkpoint(self):
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return 0
+        with open(self.checkpoint) as f:
+            return json.load(f).get('line', 0)
+
+    def _write_checkpoint(self, line):
+        if not self.checkpoint:
+            return
+        tmp = f'{self.checkpoint}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'line': line, 'created': self.summary['created'], 'at': timezone.now().isoformat()}, f)
+        os.replace(tmp, self.checkpoint)
+
+    def _user_id(self, email, label):
+        email = (email or '').strip().lower()
+        if email not in self.users:
+            raise ValueError(f"{label} '{email}' does not exist")
+        return self.users[email]
+
+    def _department_id(self, name):
+        name = (name or '').strip()
+        if name not in self.departments:
+            department = resolve_department(name, lenient=True)
+            self.departments[name] = department.pk if department else None
+        if self.departments[name] is None:
+            raise ValueError(f"Department '{name}' does not exist")
+        return self.departments[name]
+
+    def _validate(self, row):
+        if row is None:
+            raise ValueError('Line is not a JSON object')
+        row = _scalars(row, SCALAR_FIELDS)
+        for field in REQUIRED_FIELDS:
+            if not row.get(field):
+                raise ValueError(f'{field} is required')
+        for field in LIST_FIELDS:
+            if row.get(field) not in (None, '') and not isinstance(row[field], list):
+                raise ValueError(f'{field} must be a list')
+        for field in TEXT_FIELDS + ['request_id', 'cost_currency']:
+            value = row.get(field)
+            if value and field in MAX_LENGTHS and len(str(value)) > MAX_LENGTHS[field]:
+                raise ValueError(f'{field} exceeds {MAX_LENGTHS[field]} characters')
+
+        status = (row.get('status') or 'DRAFT').upper()
+        if status not in VALID_STATUSES:
+            raise ValueError(f"Invalid status '{status}'")
+        stage = (row.get('current_stage') or '').upper()
+        feasibility = (row.get('feasibility_status') or '').upper() or None
+        if feasibility and feasibility not in VALID_FEASIBILITY:
+            raise ValueError(f"Invalid feasibility status '{feasibility}'")
+
+        cost = _cost(row.get('cost_estimate'))
+
+        created_at = _parse_timestamp(row.get('created_at')) or timezone.now()
+        origination = row.get('date_of_origination')
+        date_of_origination = parse_date(origination) if origination else timezone.localdate(created_at)
+        if date_of_origination is None:
+            raise ValueError(f"Invalid date of origination '{origination}'")
+
+        kaizen = KaizenRequest(
+            request_id=row.get('request_id') or '',
+            department_id=self._department_id(row['department']),
+            initiator_id=self._user_id(row.get('initiator') or self.default_initiator, 'Initiator'),
+            status=status,
+            current_stage=stage if stage in VALID_STAGES else 'OWN_MANAGER',
+            feasibility_status=feasibility,
+            cost_estimate=cost,
+            cost_currency=row.get('cost_currency') or 'INR',
+            date_of_origination=date_of_origination,
+            expected_benefits=row.get('expected_benefits') if isinstance(row.get('expected_benefits'), list) else [],
+            effect_of_changes=row.get('effect_of_changes') if isinstance(row.get('effect_of_changes'), list) else [],
+            **{field: row.get(field) or None for field in TEXT_FIELDS if field not in REQUIRED_FIELDS},
+            **{field: row[field] for field in REQUIRED_FIELDS if field != 'department'},
+            **{field: str(row.get(field, '')).lower() in TRUE_VALUES for field in BOOLEAN_FIELDS},
+        )
+        kaizen.created_at = created_at
+        return kaizen, self._validate_children(row)
+
+    def _validate_children(self, row):
+        children = []
+        for key, model, user_field, role_field, default_role in (
+            ('manager_approvals', ManagerApproval, 'manager', 'stage_type', 'CROSS_MANAGER'),
+            ('hod_approvals', HodApproval, 'hod', 'stage_type', 'CROSS_HOD'),
+            ('evaluations', DepartmentEvaluation, 'evaluator', 'evaluator_role', 'MANAGER'),
+        ):
+            items = row.get(key) or []
+            if not isinstance(items, list):
+                raise ValueError(f'{key} must be a list')
+            seen = set()
+            for item in items:
+                if not isinstance(item, dict):
+                    raise ValueError(f'{key} entries must be objects')
+                item = _scalars(item, [
+                    'department', user_field, role_field, 'decision', 'remarks', 'overall_risk', 'created_at',
+                ])
+                answers = item.get('answers') or []
+                if not isinstance(answers, list) or not all(
+                    isinstance(answer, dict) and isinstance(answer.get('questionKey', ''), str) for answer in answers
+                ):
+                    raise ValueError(f'{key} answers must be a list of objects')
+                department_id = self._department_id(item.get('department'))
+                role = _choice(model, role_field, item.get(role_field) or default_role)
+                if (department_id, role) in seen:
+                    raise ValueError(f"Duplicate {key} entry for {item.get('department')} ({role})")
+                seen.add((department_id, role))
+                fields = {
+                    f'{user_field}_id': self._user_id(item.get(user_field), user_field.title()),
+                    'department_id': department_id,
+                    role_field: role,
+                }
+                if model is DepartmentEvaluation:
+                    fields['answers'] = encode_answers(department_id, answers)
+                    fields['overall_risk'] = _choice(model, 'overall_risk', item.get('overall_risk') or 'LOW')
+                else:
+                    fields['decision'] = _choice(model, 'decision', item.get('decision') or 'PENDING')
+                    fields['remarks'] = item.get('remarks')
+                children.append((model(**fields), _parse_timestamp(item.get('created_at'))))
+        return children
+
+    def _import_chunk(self, chunk):
+        candidates = []
+        for line_number, row in chunk:
+            try:
+                candidates.append(self._validate(row))
+            except ValueError as e:
+                self.summary['errors'].append({'line': line_number, 'error': str(e)})
+
+        given_ids = [kaizen.request_id for kaizen, _ in candidates if kaizen.request_id]
+        existing = set(KaizenRequest.objects.filter(request_id__in=given_ids).values_list('request_id', flat=True))
+        requests, children = [], []
+        for kaizen, kaizen_children in candidates:
+            if kaizen.request_id and (kaizen.request_id in existing or kaizen.request_id in self.seen):
+                self.summary['skipped'] += 1
+                continue
+            self.seen.add(kaizen.request_id)
+            requests.append(kaizen)
+            children.append(kaizen_children)
+
+        if requests and not self.dry_run:
+            with transaction.atomic():
+                self._assign_request_ids(requests)
+                self._insert(requests, children)
+        self.summary['created'] += len(requests)
+        return len(requests)
+
+    def _assign_request_ids(self, requests):
+        by_year = {}
+        for kaizen in requests:
+            if kaizen.request_id:
+                match = RequestIdSequence.PATTERN.match(kaizen.request_id)
+                if match:
+                    RequestIdSequence.advance_to(int(match.group(1)), int(match.group(2)))
+            else:
+                by_year.setdefault(kaizen.created_at.year, []).append(kaizen)
+        for year, missing in by_year.items():
+            for kaizen, number in zip(missing, RequestIdSequence.allocate(year, len(missing))):
+                kaizen.request_id = RequestIdSequence.format(year, number)
+
+    def _insert(self, requests, children):
+        created_at = [(kaizen, kaizen.created_at) for kaizen in requests]
+        KaizenRequest.objects.bulk_create(requests, batch_size=500)
+        # bulk_create stamps auto_now_add fields; restore the historical creation
+        # time. export_updated_at keeps the import time so incremental exports
+        # pick the rows up.
+        _restore_timestamps(KaizenRequest, created_at, ['created_at'])
+
+        by_model = {}
+        for kaizen, kaizen_children in zip(requests, children):
+            for child, timestamp in kaizen_children:
+                child.kaizen_request_id = kaizen.pk
+                by_model.setdefault(type(child), []).append((child, timestamp))
+        for model, items in by_model.items():
+            model.objects.bulk_create([child for child, _ in items], batch_size=500)
+            _restore_timestamps(model, [(child, timestamp) for child, timestamp in items if timestamp], ['created_at'])
+
+        record_created(requests)
+        index_requests(requests)
@@ -0,0 +1,93 @@
+import random
+import time
+from datetime import date
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.test import APIClient
+from accounts.models import User
+from departments.models import Department
+from kaizen_requests.models import KaizenRequest
+
+
+WORDS = (
+    'torque wrench fixture jig sensor conveyor pallet gauge chute clamp spindle coolant '
+    'leak vibration alignment misfeed scrap rework cycle time operator ergonomic bolt '
+    'nut washer press weld seam paint robot camera barcode label interlock guard'
+).split()
+
+# Synthetic vocabulary with a Zipf-like distribution so common terms match
+# many rows and rare ones few, as in real request text.
+VOCABULARY = WORDS + [f'term{i}' for i in range(2000)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+SCENARIOS = [
+    ('single term', {'q': 'torque'}),
+    ('two terms', {'q': 'sensor misfeed'}),
+    ('prefix', {'q': 'vibr'}),
+    ('term + status filter', {'q': 'weld', 'status': 'APPROVED'}),
+    ('rare term', {'q': 'term1500'}),
+    ('needle', {'q': 'benchmarkneedle'}),
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the kaizen search endpoint against synthetic requests (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000, help='Synthetic requests to create')
+        parser.add_argument('--repeat', type=int, default=5, help='Requests per scenario')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self._seed(options['rows'])
+            self._run(options['repeat'])
+            transaction.set_rollback(True)
+
+    def _seed(self, count):
+        rng = random.Random(42)
+        departments = list(Department.objects.all())
+        initiator = User.objects.filter(role='INITIATOR').first() or User.objects.first()
+        statuses = [s for s, _ in KaizenRequest.STATUS_CHOICES]
+
+        def sentence(n):
+            return ' '.join(rng.choices(VOCABULARY, WEIGHTS, k=n))
+
+        start = time.perf_counter()
+        batch = []
+        for i in range(count):
+            batch.append(KaizenRequest(
+                request_id=f'BENCH-{i:07d}',
+                title=sentence(5) + (' benchmarkneedle' if i % 100000 == 0 else ''),
+                station_name=f'ST-{i % 500}',
+                program=f'PRG-{i % 40}',
+                issue_description=sentence(30),
+                poka_yoke_description=sentence(15),
+                date_of_origination=date.today(),
+                department=departments[i % len(departments)],
+                initiator=initiator,
+                status=statuses[i % len(statuses)],
+            ))
+            if len(batch) == 5000:
+                KaizenRequest.objects.bulk_create(batch)
+                batch = []
+        KaizenRequest.objects.bulk_create(batch)
+        self.stdout.write(f'Seeded {count} requests in {time.perf_counter() - start:.1f}s')
+
+    def _run(self, repeat):
+        client = APIClient()
+        client.force_authenticate(User.objects.filter(role='ADMIN').first())
+
+        for label, params in SCENARIOS:
+            queries = []
+            with connection.execute_wrapper(lambda execute, sql, *a: queries.append(sql) or execute(sql, *a)):
+                response = client.get('/api/kaizen/search/', params)
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                client.get('/api/kaizen/search/', params)
+            elapsed = (time.perf_counter() - start) / repeat
+
+            self.stdout.write(
+                f'  {label:<22} status={response.status_code} matches={response.data.get("count")} '
+                f'queries={len(queries)} avg={elapsed * 1000:.1f}ms'
+            )
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from kaizen_backend.replica import read_from_replica
+from kaizen_requests.bulk_export import EXPORT_CHUNK_SIZE, RequestGraphExporter, parse_since
+
+
+class Command(BaseCommand):
+    help = 'Write every kaizen request with its approvals, evaluations, attachments and audit events as gzip NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Output path, e.g. kaizen_requests.ndjson.gz')
+        parser.add_argument('--updated-since', help='Only requests updated at or after this ISO datetime or date')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Requests loaded per batch')
+
+    def handle(self, *args, **options):
+        updated_since = None
+        if options['updated_since']:
+            updated_since = parse_since(options['updated_since'])
+            if updated_since is None:
+                raise CommandError(f"Invalid --updated-since '{options['updated_since']}'")
+
+        exporter = RequestGraphExporter(updated_since=updated_since, chunk_size=options['chunk_size'])
+        written = 0
+        try:
+            with open(options['output'], 'wb') as output, read_from_replica():
+                for data in exporter.gzip_chunks():
+                    output.write(data)
+                    written += len(data)
+        except OSError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {exporter.count} requests ({written / 1024:,.0f} KB) to {options["output"]}'
+        ))
+        if exporter.watermark:
+            self.stdout.write(f'Next incremental run: --updated-since {exporter.watermark.isoformat()}')
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from kaizen_requests.blobs import collect_garbage, ingest_legacy_attachments
+
+
+class Command(BaseCommand):
+    help = 'Delete attachment blobs that are no longer referenced by any attachment'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help='Grace period since a blob was last used')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted')
+        parser.add_argument(
+            '--ingest-legacy', action='store_true',
+            help='First move attachments stored outside the blob store into it'
+        )
+
+    def handle(self, *args, **options):
+        if options['ingest_legacy'] and not options['dry_run']:
+            moved, blobs = ingest_legacy_attachments(log=self.stdout.write)
+            self.stdout.write(f'Moved {moved} attachments into {blobs} blobs')
+
+        removed, freed = collect_garbage(options['hours'], options['dry_run'])
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {removed} blobs ({freed / (1024 * 1024):.1f} MB)'))
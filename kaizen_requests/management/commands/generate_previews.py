@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from kaizen_requests.models import AttachmentBlob, KaizenAttachment
+from kaizen_requests.previews import generate_previews
+
+
+class Command(BaseCommand):
+    help = 'Generate thumbnails and previews for image attachments that do not have them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Regenerate existing and failed previews too')
+
+    def handle(self, *args, **options):
+        images = KaizenAttachment.objects.filter(file_type__istartswith='image/').values('blob_id')
+        blobs = AttachmentBlob.objects.filter(sha256__in=images)
+        if options['rebuild']:
+            blobs.update(preview_status='PENDING')
+        else:
+            blobs = blobs.filter(preview_status='PENDING')
+        
+        counts = {'READY': 0, 'FAILED': 0}
+        for sha256 in list(blobs.values_list('sha256', flat=True)):
+            generate_previews(sha256)
+            status = AttachmentBlob.objects.filter(sha256=sha256).values_list('preview_status', flat=True).first()
+            counts[status] = counts.get(status, 0) + 1
+        self.stdout.write(self.style.SUCCESS(f"Generated previews for {counts['READY']} blobs ({counts['FAILED']} failed)"))
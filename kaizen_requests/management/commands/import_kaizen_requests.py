@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+from kaizen_requests.importers import KaizenImporter, read_csv_rows, read_ndjson_rows
+
+
+class Command(BaseCommand):
+    help = 'Bulk-import kaizen requests from CSV (as in exports/kaizen_requests.csv) or NDJSON with approvals'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to a .csv or .ndjson/.jsonl file')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='Input format (default: from the extension)')
+        parser.add_argument('--initiator', help='Email of the initiator for rows without one')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows validated and inserted per batch')
+        parser.add_argument('--checkpoint', help='Checkpoint file (default: <path>.checkpoint)')
+        parser.add_argument('--resume', action='store_true', help='Skip lines committed by a previous run')
+        parser.add_argument('--dry-run', action='store_true', help='Validate without inserting')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+        importer = KaizenImporter(
+            chunk_size=options['chunk_size'],
+            default_initiator=options['initiator'],
+            dry_run=options['dry_run'],
+            checkpoint=options['checkpoint'] or f'{path}.checkpoint',
+            resume=options['resume'],
+            log=lambda message: self.stdout.write(f'  {message}'),
+        )
+
+        try:
+            with open(path, newline='', encoding='utf-8-sig') as stream:
+                rows = read_ndjson_rows(stream) if file_format == 'ndjson' else read_csv_rows(stream)
+                summary = importer.run(rows)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for error in summary['errors']:
+            self.stdout.write(self.style.WARNING(f"  Line {error['line']}: {error['error']}"))
+
+        rate = summary['rows'] / summary['seconds'] if summary['seconds'] else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Validated' if options['dry_run'] else 'Imported'} {summary['created']} requests "
+            f"({summary['skipped']} existing skipped, {len(summary['errors'])} errors) "
+            f"from {summary['rows']} rows in {summary['seconds']}s ({rate:,.0f} rows/s)"
+        ))
@@ -0,0 +1,20 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from kaizen_requests.models import KaizenStatusEvent
+
+
+class Command(BaseCommand):
+    help = 'Delete status events older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'STATUS_EVENT_RETENTION_DAYS', 7),
+            help='Age after which events are deleted; clients further behind reload their lists'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        purged, _ = KaizenStatusEvent.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'Purged {purged} status events'))
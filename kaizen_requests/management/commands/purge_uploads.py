@@ -0,0 +1,20 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from kaizen_requests.models import UploadSession
+from kaizen_requests.uploads import discard
+
+
+class Command(BaseCommand):
+    help = 'Delete abandoned chunked uploads and their partial files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=48, help='Age of the last chunk after which an upload is abandoned')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        purged = 0
+        for session in UploadSession.objects.filter(updated_at__lt=cutoff).iterator():
+            discard(session)
+            purged += 1
+        self.stdout.write(self.style.SUCCESS(f'Purged {purged} upload sessions'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from kaizen_requests.field_values import rebuild_field_values
+
+
+class Command(BaseCommand):
+    help = 'Recount autocomplete values for station, program, assembly line and part number'
+
+    def handle(self, *args, **options):
+        count = rebuild_field_values()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} field values'))
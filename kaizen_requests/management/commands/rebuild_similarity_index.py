@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from kaizen_requests.similarity import rebuild_similarity_index
+
+
+class Command(BaseCommand):
+    help = 'Recompute MinHash signatures and LSH buckets used for duplicate detection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Requests written per batch')
+
+    def handle(self, *args, **options):
+        count = rebuild_similarity_index(options['batch_size'], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} requests for duplicate detection'))
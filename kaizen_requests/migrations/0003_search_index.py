@@ -0,0 +1,35 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_search_index(apps, schema_editor):
+    from kaizen_requests.search import install_search_index
+    install_search_index(schema_editor.connection, rebuild=True)
+
+
+def remove_search_index(apps, schema_editor):
+    from kaizen_requests.search import drop_search_index
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kaizen_requests', '0002_alter_kaizenrequest_current_stage_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KaizenSearchEntry',
+            fields=[
+                ('kaizen_request', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='kaizen_requests.kaizenrequest')),
+                ('document', models.TextField(db_column='dj_kaizen_requests_fts')),
+                ('rank', models.FloatField(db_column='rank')),
+            ],
+            options={
+                'db_table': 'dj_kaizen_requests_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, remove_search_index),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:49
+
+from django.db import migrations, models
+
+
+FIELDS = ['station_name', 'program', 'assembly_line', 'customer_part_number']
+
+
+def backfill_field_values(apps, schema_editor):
+    KaizenRequest = apps.get_model('kaizen_requests', 'KaizenRequest')
+    KaizenFieldValue = apps.get_model('kaizen_requests', 'KaizenFieldValue')
+    rows = {}
+    for field in FIELDS:
+        for value, count in KaizenRequest.objects.exclude(**{f'{field}__isnull': True}).values_list(
+            field
+        ).annotate(count=models.Count('id')).order_by():
+            normalized = ' '.join(value.split()).lower()
+            if not normalized:
+                continue
+            row = rows.setdefault((field, normalized), KaizenFieldValue(
+                field=field, value=' '.join(value.split()), normalized=normalized, frequency=0
+            ))
+            row.frequency += count
+    KaizenFieldValue.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kaizen_requests', '0003_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KaizenFieldValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(choices=[('station_name', 'Station Name'), ('program', 'Program'), ('assembly_line', 'Assembly Line'), ('customer_part_number', 'Customer Part Number')], max_length=30)),
+                ('value', models.CharField(max_length=100)),
+                ('normalized', models.CharField(max_length=100)),
+                ('frequency', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'dj_kaizen_field_values',
+                'indexes': [models.Index(fields=['field', '-frequency'], name='dj_kfv_field_freq_idx')],
+                'unique_together': {('field', 'normalized')},
+            },
+        ),
+        migrations.RunPython(backfill_field_values, migrations.RunPython.noop),
+    ]
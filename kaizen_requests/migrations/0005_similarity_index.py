@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_similarity_index(apps, schema_editor):
+    from kaizen_requests.similarity import band_buckets, minhash, pack_signature
+    KaizenRequest = apps.get_model('kaizen_requests', 'KaizenRequest')
+    KaizenSimilaritySignature = apps.get_model('kaizen_requests', 'KaizenSimilaritySignature')
+    KaizenSimilarityBucket = apps.get_model('kaizen_requests', 'KaizenSimilarityBucket')
+    signatures, buckets = [], []
+    rows = KaizenRequest.objects.values_list('id', 'title', 'issue_description', 'poka_yoke_description')
+    for kaizen_id, *texts in rows.iterator():
+        signature = minhash(' '.join(text or '' for text in texts))
+        if signature is None:
+            continue
+        signatures.append(KaizenSimilaritySignature(kaizen_request_id=kaizen_id, signature=pack_signature(signature)))
+        buckets.extend(KaizenSimilarityBucket(kaizen_request_id=kaizen_id, bucket=b) for b in band_buckets(signature))
+    KaizenSimilaritySignature.objects.bulk_create(signatures, batch_size=1000)
+    KaizenSimilarityBucket.objects.bulk_create(buckets, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kaizen_requests', '0004_kaizenfieldvalue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KaizenSimilaritySignature',
+            fields=[
+                ('kaizen_request', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='similarity_signature', serialize=False, to='kaizen_requests.kaizenrequest')),
+                ('signature', models.BinaryField()),
+            ],
+            options={
+                'db_table': 'dj_kaizen_similarity_signatures',
+            },
+        ),
+        migrations.CreateModel(
+            name='KaizenSimilarityBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField(db_index=True)),
+                ('kaizen_request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarity_buckets', to='kaizen_requests.kaizenrequest')),
+            ],
+            options={
+                'db_table': 'dj_kaizen_similarity_buckets',
+            },
+        ),
+        migrations.RunPython(backfill_similarity_index, migrations.RunPython.noop),
+    ]
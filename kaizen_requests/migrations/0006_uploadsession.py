@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:52
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kaizen_requests', '0005_similarity_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('file_name', models.CharField(max_length=255)),
+                ('file_type', models.CharField(max_length=100)),
+                ('file_size', models.PositiveBigIntegerField()),
+                ('checksum', models.CharField(blank=True, max_length=64)),
+                ('received', models.PositiveBigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('ACTIVE', 'Active'), ('COMPLETED', 'Completed')], default='ACTIVE', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('attachment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='kaizen_requests.kaizenattachment')),
+                ('kaizen_request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='kaizen_requests.kaizenrequest')),
+                ('uploaded_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'dj_upload_sessions',
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kaizen_requests', '0006_uploadsession'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttachmentBlob',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('file', models.FileField(max_length=255, upload_to='')),
+                ('size', models.PositiveBigIntegerField()),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'dj_attachment_blobs',
+            },
+        ),
+        migrations.AlterField(
+            model_name='kaizenattachment',
+            name='file',
+            field=models.FileField(max_length=255, upload_to='attachments/%Y/%m/'),
+        ),
+        migrations.AddField(
+            model_name='kaizenattachment',
+            name='blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='attachments', to='kaizen_requests.attachmentblob'),
+        ),
+    ]
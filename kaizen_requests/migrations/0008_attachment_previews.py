@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kaizen_requests', '0007_attachment_blobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachmentblob',
+            name='preview_status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('READY', 'Ready'), ('FAILED', 'Failed')], default='PENDING', max_length=20),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:59
+
+from django.db import migrations, models
+
+
+# Lowest precedence first so later markers overwrite earlier ones.
+MARKERS = [('CHECKSHEET', 'check'), ('CRR', 'crr'), ('PFMEA', 'pfmea')]
+FLAGS = {'PFMEA': 'has_pfmea', 'CRR': 'has_crr', 'CHECKSHEET': 'has_checksheet'}
+
+
+def classify_attachments(apps, schema_editor):
+    KaizenAttachment = apps.get_model('kaizen_requests', 'KaizenAttachment')
+    KaizenRequest = apps.get_model('kaizen_requests', 'KaizenRequest')
+    KaizenAttachment.objects.update(document_type='OTHER')
+    for document_type, marker in MARKERS:
+        KaizenAttachment.objects.filter(file_name__icontains=marker).update(document_type=document_type)
+    for document_type, flag in FLAGS.items():
+        KaizenRequest.objects.filter(
+            id__in=KaizenAttachment.objects.filter(document_type=document_type).values('kaizen_request_id')
+        ).update(**{flag: True})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kaizen_requests', '0008_attachment_previews'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kaizenattachment',
+            name='document_type',
+            field=models.CharField(blank=True, choices=[('PFMEA', 'PFMEA'), ('CRR', 'CRR'), ('CHECKSHEET', 'Checksheet'), ('OTHER', 'Other')], db_index=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='kaizenrequest',
+            name='has_checksheet',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='kaizenrequest',
+            name='has_crr',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='kaizenrequest',
+            name='has_pfmea',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='uploadsession',
+            name='document_type',
+            field=models.CharField(blank=True, choices=[('PFMEA', 'PFMEA'), ('CRR', 'CRR'), ('CHECKSHEET', 'Checksheet'), ('OTHER', 'Other')], max_length=20),
+        ),
+        migrations.RunPython(classify_attachments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kaizen_requests', '0009_attachment_document_types'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestIdSequence',
+            fields=[
+                ('year', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('last_number', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'dj_request_id_sequences',
+            },
+        ),
+    ]
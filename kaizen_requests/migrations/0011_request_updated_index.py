@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0002_evaluationquestionversion'),
+        ('kaizen_requests', '0010_request_id_sequence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='kaizenrequest',
+            index=models.Index(fields=['updated_at', 'id'], name='dj_kaizen_updated_idx'),
+        ),
+    ]
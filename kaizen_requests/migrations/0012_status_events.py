@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kaizen_requests', '0011_request_updated_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KaizenStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_id', models.CharField(max_length=50)),
+                ('previous_status', models.CharField(choices=[('DRAFT', 'Draft'), ('PENDING_OWN_MANAGER', 'Pending Own Manager Approval'), ('PENDING_OWN_HOD', 'Pending Own HOD Approval'), ('PENDING_CROSS_MANAGER', 'Pending Cross-Department Manager Approval'), ('PENDING_CROSS_HOD', 'Pending Cross-Department HOD Approval'), ('PENDING_AGM', 'Pending AGM Approval'), ('PENDING_GM', 'Pending GM Approval'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected')], max_length=30)),
+                ('status', models.CharField(choices=[('DRAFT', 'Draft'), ('PENDING_OWN_MANAGER', 'Pending Own Manager Approval'), ('PENDING_OWN_HOD', 'Pending Own HOD Approval'), ('PENDING_CROSS_MANAGER', 'Pending Cross-Department Manager Approval'), ('PENDING_CROSS_HOD', 'Pending Cross-Department HOD Approval'), ('PENDING_AGM', 'Pending AGM Approval'), ('PENDING_GM', 'Pending GM Approval'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected')], max_length=30)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('kaizen_request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='kaizen_requests.kaizenrequest')),
+            ],
+            options={
+                'db_table': 'dj_kaizen_status_events',
+                'ordering': ['id'],
+            },
+        ),
+    ]
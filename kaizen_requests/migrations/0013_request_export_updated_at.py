@@ -0,0 +1,32 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def copy_updated_at(apps, schema_editor):
+    KaizenRequest = apps.get_model('kaizen_requests', 'KaizenRequest')
+    KaizenRequest.objects.update(export_updated_at=models.F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kaizen_requests', '0012_status_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kaizenrequest',
+            name='export_updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_updated_at, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='kaizenrequest',
+            name='dj_kaizen_updated_idx',
+        ),
+        migrations.AddIndex(
+            model_name='kaizenrequest',
+            index=models.Index(fields=['export_updated_at', 'id'], name='dj_kaizen_export_updated_idx'),
+        ),
+    ]
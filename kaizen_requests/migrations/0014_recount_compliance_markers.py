@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+MARKERS = [('pfmea', 'has_pfmea'), ('crr', 'has_crr'), ('check', 'has_checksheet')]
+
+
+def flag_every_marker(apps, schema_editor):
+    # 0009 gave each attachment a single type; names with several markers
+    # satisfy all of them.
+    KaizenAttachment = apps.get_model('kaizen_requests', 'KaizenAttachment')
+    KaizenRequest = apps.get_model('kaizen_requests', 'KaizenRequest')
+    for marker, flag in MARKERS:
+        KaizenRequest.objects.filter(
+            id__in=KaizenAttachment.objects.filter(file_name__icontains=marker).values('kaizen_request_id')
+        ).update(**{flag: True})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kaizen_requests', '0013_request_export_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(flag_every_marker, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+INDEX = 'dj_kfv_field_normalized_like_idx'
+
+
+def create_prefix_index(apps, schema_editor):
+    # PostgreSQL only uses an index for LIKE 'x%' with a pattern operator
+    # class (or the C collation); SQLite autocomplete uses a range instead.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {INDEX} '
+            f'ON dj_kaizen_field_values (field, normalized varchar_pattern_ops)'
+        )
+
+
+def drop_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kaizen_requests', '0014_recount_compliance_markers'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
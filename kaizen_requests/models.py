@@ -1,7 +1,15 @@
-from django.db import models
+import re
+import uuid
+from django.db import models, transaction
+from django.db.models import F
 from django.conf import settings
 
 
+# Free-text fields offered by autocomplete and the text compared for duplicates.
+AUTOCOMPLETE_FIELDS = ['station_name', 'program', 'assembly_line', 'customer_part_number']
+SIMILARITY_FIELDS = ['title', 'issue_description', 'poka_yoke_description']
+TRACKED_FIELDS = AUTOCOMPLETE_FIELDS + SIMILARITY_FIELDS
+
 class KaizenRequest(models.Model):
     STATUS_CHOICES = [
         ('DRAFT', 'Draft'),
@@ -66,6 +74,11 @@ class KaizenRequest(models.Model):
     requires_process_addition = models.BooleanField(default=False)
     requires_manpower_addition = models.BooleanField(default=False)
     
+    # Maintained from attachment document types (see documents.py).
+    has_pfmea = models.BooleanField(default=False)
+    has_crr = models.BooleanField(default=False)
+    has_checksheet = models.BooleanField(default=False)
+    
     status = models.CharField(max_length=30, choices=STATUS_CHOICES, default='DRAFT')
     current_stage = models.CharField(max_length=20, choices=STAGE_CHOICES, default='OWN_MANAGER')
     
@@ -81,43 +94,237 @@ class KaizenRequest(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Last change to the request or anything in its export record (approvals,
+    # evaluations, attachments, audit events); see bulk_export.touch_requests.
+    # Reports read updated_at as the time of the last transition, so child
+    # changes only move this column.
+    export_updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'dj_kaizen_requests'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['export_updated_at', 'id'], name='dj_kaizen_export_updated_idx'),
+        ]
     
     def __str__(self):
         return f"{self.request_id} - {self.title}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember loaded values so saves can update autocomplete counts and
+        # the similarity index only when the relevant text changed.
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values)
+            if name in TRACKED_FIELDS
+        }
+        return instance
+    
     def save(self, *args, **kwargs):
         if not self.request_id:
             from django.utils import timezone
             year = timezone.now().year
-            last_request = KaizenRequest.objects.filter(
-                request_id__startswith=f'KZ-{year}-'
-            ).order_by('-id').first()
-            
-            if last_request:
-                last_num = int(last_request.request_id.split('-')[-1])
-                new_num = last_num + 1
-            else:
-                new_num = 1
-            
-            self.request_id = f'KZ-{year}-{new_num:03d}'
+            number = RequestIdSequence.allocate(year)[0]
+            self.request_id = RequestIdSequence.format(year, number)
         
         super().save(*args, **kwargs)
 
 
+class RequestIdSequence(models.Model):
+    """Last request number handed out per year.
+    
+    Numbers are reserved with a single row update, so concurrent saves never
+    collide and bulk imports can take a whole block at once.
+    """
+    PATTERN = re.compile(r'^KZ-(\d{4})-(\d+)$')
+    
+    year = models.PositiveIntegerField(primary_key=True)
+    last_number = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'dj_request_id_sequences'
+    
+    def __str__(self):
+        return f"{self.year}: {self.last_number}"
+    
+    @staticmethod
+    def format(year, number):
+        return f'KZ-{year}-{number:03d}'
+    
+    @classmethod
+    def _existing_max(cls, year):
+        numbers = [0]
+        for request_id in KaizenRequest.objects.filter(
+            request_id__startswith=f'KZ-{year}-'
+        ).values_list('request_id', flat=True).iterator():
+            match = cls.PATTERN.match(request_id)
+            if match:
+                numbers.append(int(match.group(2)))
+        return max(numbers)
+    
+    @classmethod
+    def allocate(cls, year, count=1):
+        """Reserve ``count`` consecutive numbers for ``year`` and return them as a range."""
+        with transaction.atomic():
+            if not cls.objects.filter(year=year).update(last_number=F('last_number') + count):
+                # First number of the year: start after any ids already stored.
+                cls.objects.get_or_create(year=year, defaults={'last_number': cls._existing_max(year)})
+                cls.objects.filter(year=year).update(last_number=F('last_number') + count)
+            last = cls.objects.filter(year=year).values_list('last_number', flat=True).get()
+        return range(last - count + 1, last + 1)
+    
+    @classmethod
+    def advance_to(cls, year, number):
+        """Make sure later allocations for ``year`` come after ``number``."""
+        cls.objects.get_or_create(year=year, defaults={'last_number': cls._existing_max(year)})
+        cls.objects.filter(year=year, last_number__lt=number).update(last_number=number)
+
+
+class KaizenStatusEvent(models.Model):
+    """Change log of committed status transitions, read by the event stream."""
+    kaizen_request = models.ForeignKey(
+        KaizenRequest,
+        on_delete=models.CASCADE,
+        related_name='status_events'
+    )
+    request_id = models.CharField(max_length=50)
+    previous_status = models.CharField(max_length=30, choices=KaizenRequest.STATUS_CHOICES)
+    status = models.CharField(max_length=30, choices=KaizenRequest.STATUS_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = 'dj_kaizen_status_events'
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.request_id}: {self.previous_status} -> {self.status}"
+
+
+class KaizenFieldValue(models.Model):
+    """Distinct free-text values of a request field with how many requests use them."""
+    FIELDS = AUTOCOMPLETE_FIELDS
+    FIELD_CHOICES = [(name, name.replace('_', ' ').title()) for name in FIELDS]
+    
+    field = models.CharField(max_length=30, choices=FIELD_CHOICES)
+    value = models.CharField(max_length=100)
+    normalized = models.CharField(max_length=100)
+    frequency = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'dj_kaizen_field_values'
+        unique_together = ['field', 'normalized']
+        indexes = [
+            models.Index(fields=['field', '-frequency'], name='dj_kfv_field_freq_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.field}: {self.value} ({self.frequency})"
+    
+    @staticmethod
+    def normalize(value):
+        return ' '.join(value.split()).lower()
+
+
+class KaizenSimilaritySignature(models.Model):
+    """MinHash signature of a request's title and descriptions."""
+    kaizen_request = models.OneToOneField(
+        KaizenRequest,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='similarity_signature'
+    )
+    signature = models.BinaryField()
+    
+    class Meta:
+        db_table = 'dj_kaizen_similarity_signatures'
+
+
+class KaizenSimilarityBucket(models.Model):
+    """LSH band bucket of a signature; requests sharing a bucket are duplicate candidates."""
+    kaizen_request = models.ForeignKey(
+        KaizenRequest,
+        on_delete=models.CASCADE,
+        related_name='similarity_buckets'
+    )
+    bucket = models.BigIntegerField(db_index=True)
+    
+    class Meta:
+        db_table = 'dj_kaizen_similarity_buckets'
+
+
+class KaizenSearchEntry(models.Model):
+    """Row of the SQLite FTS5 index over kaizen requests.
+    
+    The virtual table and its sync triggers are created by
+    ``kaizen_requests.search``; this unmanaged model only lets queries join
+    it. ``document`` is FTS5's hidden table-named column used with MATCH and
+    ``rank`` its configured bm25 score (lower is better).
+    """
+    kaizen_request = models.OneToOneField(
+        KaizenRequest,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='search_entry'
+    )
+    document = models.TextField(db_column='dj_kaizen_requests_fts')
+    rank = models.FloatField(db_column='rank')
+    
+    class Meta:
+        managed = False
+        db_table = 'dj_kaizen_requests_fts'
+
+
+class AttachmentBlob(models.Model):
+    """Attachment content stored once under its SHA-256 digest."""
+    PREVIEW_STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('READY', 'Ready'),
+        ('FAILED', 'Failed'),
+    ]
+    
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    file = models.FileField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    preview_status = models.CharField(max_length=20, choices=PREVIEW_STATUS_CHOICES, default='PENDING')
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        db_table = 'dj_attachment_blobs'
+    
+    def __str__(self):
+        return self.sha256
+
+
 class KaizenAttachment(models.Model):
+    DOCUMENT_TYPE_CHOICES = [
+        ('PFMEA', 'PFMEA'),
+        ('CRR', 'CRR'),
+        ('CHECKSHEET', 'Checksheet'),
+        ('OTHER', 'Other'),
+    ]
+    
     kaizen_request = models.ForeignKey(
         KaizenRequest,
         on_delete=models.CASCADE,
         related_name='attachments'
     )
-    file = models.FileField(upload_to='attachments/%Y/%m/')
+    file = models.FileField(upload_to='attachments/%Y/%m/', max_length=255)
+    blob = models.ForeignKey(
+        AttachmentBlob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='attachments'
+    )
     file_name = models.CharField(max_length=255)
     file_type = models.CharField(max_length=100)
     file_size = models.PositiveIntegerField()
+    document_type = models.CharField(max_length=20, choices=DOCUMENT_TYPE_CHOICES, blank=True, db_index=True)
     uploaded_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -128,5 +335,55 @@ class KaizenAttachment(models.Model):
     class Meta:
         db_table = 'dj_kaizen_attachments'
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded blob so saves can move its reference count.
+        if 'blob_id' in field_names:
+            instance._loaded_blob_id = values[field_names.index('blob_id')]
+        return instance
+    
     def __str__(self):
         return self.file_name
+
+
+class UploadSession(models.Model):
+    """A resumable, chunked attachment upload in progress."""
+    STATUS_CHOICES = [
+        ('ACTIVE', 'Active'),
+        ('COMPLETED', 'Completed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kaizen_request = models.ForeignKey(
+        KaizenRequest,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions'
+    )
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions'
+    )
+    file_name = models.CharField(max_length=255)
+    file_type = models.CharField(max_length=100)
+    file_size = models.PositiveBigIntegerField()
+    document_type = models.CharField(max_length=20, choices=KaizenAttachment.DOCUMENT_TYPE_CHOICES, blank=True)
+    checksum = models.CharField(max_length=64, blank=True)
+    received = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ACTIVE')
+    attachment = models.ForeignKey(
+        KaizenAttachment,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'dj_upload_sessions'
+    
+    def __str__(self):
+        return f"{self.file_name} ({self.received}/{self.file_size})"
@@ -0,0 +1,97 @@
+"""Thumbnails and web previews for image attachments.
+
+Previews are generated once per ``AttachmentBlob`` (so shared content is
+processed once) on a background thread pool after the upload commits, and
+stored next to the blob store under deterministic names derived from the
+content hash, then served through the attachment download view. Serializers
+only read ``AttachmentBlob.preview_status``; no image work or storage
+lookups happen while listing requests.
+"""
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from PIL import Image, ImageOps
+from .models import AttachmentBlob
+
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_SIZES = getattr(settings, 'ATTACHMENT_PREVIEW_SIZES', {
+    'preview': (1280, 1280),
+    'thumbnail': (320, 320),
+})
+PREVIEW_FORMAT = 'WEBP'
+PREVIEW_QUALITY = getattr(settings, 'ATTACHMENT_PREVIEW_QUALITY', 80)
+
+# Pillow releases the GIL while decoding, resizing and encoding, so threads
+# overlap well here and share the process's storage and database setup.
+_preview_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'ATTACHMENT_PREVIEW_WORKERS', 2),
+    thread_name_prefix='previews'
+)
+
+
+def preview_name(sha256, variant):
+    return f'previews/{sha256[:2]}/{sha256[2:4]}/{sha256}-{variant}.webp'
+
+
+def is_previewable(file_type):
+    return (file_type or '').lower().startswith('image/')
+
+
+def _render(image, size):
+    """Return the image scaled to fit ``size`` and its encoded bytes."""
+    image = image.copy()
+    image.thumbnail(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+    buffer = io.BytesIO()
+    image.save(buffer, PREVIEW_FORMAT, quality=PREVIEW_QUALITY, method=4)
+    return image, buffer.getvalue()
+
+
+def generate_previews(sha256):
+    """Render every preview size for a blob and mark it READY (or FAILED)."""
+    blob = AttachmentBlob.objects.filter(sha256=sha256).first()
+    if blob is None or blob.preview_status == 'READY':
+        return
+
+    try:
+        with default_storage.open(blob.file.name, 'rb') as source:
+            image = Image.open(source)
+            largest = max(PREVIEW_SIZES.values())
+            # Let the JPEG decoder downscale by a power of two while decoding.
+            image.draft('RGB', largest)
+            image = ImageOps.exif_transpose(image)
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+        # Render from largest to smallest, each from the previous result.
+        for variant, size in sorted(PREVIEW_SIZES.items(), key=lambda item: item[1], reverse=True):
+            image, data = _render(image, size)
+            name = preview_name(sha256, variant)
+            default_storage.delete(name)
+            default_storage.save(name, ContentFile(data))
+        status = 'READY'
+    except Exception:
+        logger.exception('Preview generation failed for blob %s', sha256)
+        status = 'FAILED'
+
+    AttachmentBlob.objects.filter(sha256=sha256).update(preview_status=status)
+
+
+def delete_previews(sha256):
+    for variant in PREVIEW_SIZES:
+        default_storage.delete(preview_name(sha256, variant))
+
+
+def enqueue_previews(sha256):
+    """Generate previews in the background once the current transaction commits."""
+    def run():
+        try:
+            generate_previews(sha256)
+        finally:
+            connections.close_all()
+
+    transaction.on_commit(lambda: _preview_executor.submit(run))
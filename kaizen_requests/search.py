@@ -0,0 +1,194 @@
+"""Full-text search over kaizen requests.
+
+PostgreSQL uses a generated, weighted ``tsvector`` column with a GIN index;
+SQLite uses an FTS5 external-content table kept in sync by triggers. Both
+indexes are maintained by the database on every insert, update and delete,
+including bulk writes. Other backends fall back to ``icontains`` matching.
+"""
+import re
+from html import escape
+from django.db import connection
+from django.db.models import F, FloatField, Lookup, Q, Value
+from django.db.models.expressions import RawSQL
+from .models import KaizenSearchEntry
+
+
+TABLE = 'dj_kaizen_requests'
+FTS_TABLE = 'dj_kaizen_requests_fts'
+SEARCH_FIELDS = ['title', 'station_name', 'program', 'issue_description', 'poka_yoke_description']
+# Control characters mark matches inside raw text; fragments are
+# HTML-escaped before they are swapped for <mark> tags.
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+# Column weights: title, then station/program, then the descriptions.
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(station_name, '') || ' ' || coalesce(program, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(issue_description, '') || ' ' || "
+    "coalesce(poka_yoke_description, '')), 'C')"
+)
+
+POSTGRES_SCHEMA = [
+    f"ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS ({POSTGRES_VECTOR}) STORED",
+    f"CREATE INDEX IF NOT EXISTS {TABLE}_search_gin ON {TABLE} USING GIN (search_vector)",
+]
+
+POSTGRES_DROP = [
+    f"DROP INDEX IF EXISTS {TABLE}_search_gin",
+    f"ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+_columns = ', '.join(SEARCH_FIELDS)
+_new_values = ', '.join(f'new.{field}' for field in SEARCH_FIELDS)
+_old_values = ', '.join(f'old.{field}' for field in SEARCH_FIELDS)
+
+SQLITE_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values}); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values}); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {_columns} ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values}); "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values}); END",
+]
+
+# bm25 weights per FTS5 column, in SEARCH_FIELDS order, stored as the
+# table's default ``rank`` function.
+SQLITE_RANK = 'bm25(10.0, 4.0, 4.0, 1.0, 1.0)'
+
+SQLITE_SCHEMA = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5({_columns}, "
+    f"content='{TABLE}', content_rowid='id', tokenize='porter unicode61')",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', '{SQLITE_RANK}')",
+    *SQLITE_TRIGGERS,
+]
+
+SQLITE_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+
+class Match(Lookup):
+    """``document__match`` filters FTS5 rows with ``MATCH``."""
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+KaizenSearchEntry._meta.get_field('document').register_lookup(Match)
+
+
+def install_search_index(conn, rebuild=False):
+    """Create the search index for the connection's backend if it is missing."""
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            for statement in POSTGRES_SCHEMA:
+                cursor.execute(statement)
+        elif conn.vendor == 'sqlite':
+            for statement in SQLITE_SCHEMA:
+                cursor.execute(statement)
+            if rebuild:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def drop_search_index(conn):
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            for statement in POSTGRES_DROP:
+                cursor.execute(statement)
+        elif conn.vendor == 'sqlite':
+            for statement in SQLITE_DROP:
+                cursor.execute(statement)
+
+
+def parse_terms(query):
+    """Split user input into plain word terms, dropping search syntax."""
+    return re.findall(r'\w+', query or '')[:16]
+
+
+def _match_expression(terms):
+    """All terms must match; the last one also matches as a prefix."""
+    if connection.vendor == 'postgresql':
+        return ' & '.join(terms[:-1] + [f'{terms[-1]}:*'])
+    return ' '.join(f'"{term}"' for term in terms[:-1]) + f' "{terms[-1]}"*'
+
+
+def search(queryset, terms):
+    """Restrict a KaizenRequest queryset to matches, annotated with ``rank`` (higher is better)."""
+    expression = _match_expression(terms)
+
+    if connection.vendor == 'postgresql':
+        tsquery = "to_tsquery('english', %s)"
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT id FROM {TABLE} WHERE search_vector @@ {tsquery}", [expression])
+        ).annotate(
+            rank=RawSQL(f"ts_rank_cd({TABLE}.search_vector, {tsquery})", [expression], output_field=FloatField())
+        )
+
+    if connection.vendor == 'sqlite':
+        # Join the FTS table so MATCH drives the query; bm25 is lower-is-better.
+        return queryset.filter(search_entry__document__match=expression).annotate(
+            rank=-F('search_entry__rank')
+        )
+
+    condition = Q()
+    for term in terms:
+        term_condition = Q()
+        for field in SEARCH_FIELDS:
+            term_condition |= Q(**{f'{field}__icontains': term})
+        condition &= term_condition
+    return queryset.filter(condition).annotate(rank=Value(0.0, output_field=FloatField()))
+
+
+def _render_fragment(fragment):
+    if fragment is None:
+        return None
+    return escape(fragment).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def highlight(ids, terms):
+    """Return ``{id: {'title': ..., 'snippet': ...}}`` with matches wrapped in <mark> tags.
+
+    Only called for the ids on the current page, so highlighting cost does
+    not grow with the number of matches. Text outside the tags is escaped.
+    """
+    if not ids:
+        return {}
+    expression = _match_expression(terms)
+    placeholders = ', '.join(['%s'] * len(ids))
+
+    if connection.vendor == 'postgresql':
+        options = f'StartSel={MARK_START}, StopSel={MARK_END}, MaxWords=30, MinWords=10'
+        sql = (
+            f"SELECT id, "
+            f"ts_headline('english', title, to_tsquery('english', %s), %s), "
+            f"ts_headline('english', issue_description || ' ' || coalesce(poka_yoke_description, ''), "
+            f"to_tsquery('english', %s), %s) "
+            f"FROM {TABLE} WHERE id IN ({placeholders})"
+        )
+        params = [expression, f'HighlightAll=true, {options}', expression, options, *ids]
+    elif connection.vendor == 'sqlite':
+        sql = (
+            f"SELECT rowid, highlight({FTS_TABLE}, 0, %s, %s), "
+            f"snippet({FTS_TABLE}, -1, %s, %s, '…', 24) "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid IN ({placeholders})"
+        )
+        params = [MARK_START, MARK_END, MARK_START, MARK_END, expression, *ids]
+    else:
+        return {}
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {
+            row[0]: {'title': _render_fragment(row[1]), 'snippet': _render_fragment(row[2])}
+            for row in cursor.fetchall()
+        }
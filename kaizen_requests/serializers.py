@@ -1,28 +1,45 @@
+from django.urls import reverse
 from rest_framework import serializers
 from .models import KaizenRequest, KaizenAttachment
-from departments.models import Department
-
-
-class DepartmentField(serializers.Field):
-    """Custom field that accepts department name string and returns Department object."""
-    
-    def to_representation(self, value):
-        return value.name if value else None
-    
-    def to_internal_value(self, data):
-        if not data:
-            return None
-        try:
-            return Department.objects.get(name=data)
-        except Department.DoesNotExist:
-            raise serializers.ValidationError(f"Department '{data}' does not exist")
+from .similarity import find_similar, request_text
+from departments.serializers import DepartmentField
+from approvals.events import emit_transition
+from reports.views import get_role_filter
 
 
 class KaizenAttachmentSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    preview_url = serializers.SerializerMethodField()
+    
     class Meta:
         model = KaizenAttachment
-        fields = ['id', 'file', 'file_name', 'file_type', 'file_size', 'uploaded_at']
+        fields = [
+            'id', 'file', 'file_name', 'file_type', 'file_size', 'document_type', 'uploaded_at',
+            'download_url', 'thumbnail_url', 'preview_url'
+        ]
         read_only_fields = ['id', 'uploaded_at']
+    
+    def _download_url(self, obj, query=''):
+        url = reverse('kaizen_attachment_download', args=[obj.pk]) + query
+        request = self.context.get('request')
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+    
+    def _preview_url(self, obj, variant):
+        if obj.blob is None or obj.blob.preview_status != 'READY':
+            return None
+        return self._download_url(obj, f'?variant={variant}')
+    
+    def get_download_url(self, obj):
+        return self._download_url(obj)
+    
+    def get_thumbnail_url(self, obj):
+        return self._preview_url(obj, 'thumbnail')
+    
+    def get_preview_url(self, obj):
+        return self._preview_url(obj, 'preview')
 
 
 class KaizenRequestSerializer(serializers.ModelSerializer):
@@ -68,7 +85,36 @@ class KaizenRequestCreateSerializer(serializers.ModelSerializer):
         validated_data['initiator'] = self.context['request'].user
         validated_data['status'] = 'PENDING_OWN_HOD'
         validated_data['current_stage'] = 'OWN_HOD'
-        return super().create(validated_data)
+        kaizen = super().create(validated_data)
+        emit_transition(kaizen, 'DRAFT', validated_data['initiator'])
+        return kaizen
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Duplicates are searched across all requests; for ones the initiator
+        # may not open, only the id, status and similarity are shown.
+        duplicates = find_similar(request_text(instance), exclude_id=instance.pk)
+        visible = set(KaizenRequest.objects.filter(
+            get_role_filter(self.context['request'].user),
+            id__in=[duplicate.id for _, duplicate in duplicates],
+        ).values_list('id', flat=True))
+        data['possible_duplicates'] = [
+            {
+                'id': duplicate.id,
+                'request_id': duplicate.request_id,
+                'title': duplicate.title,
+                'station_name': duplicate.station_name,
+                'department': duplicate.department.name,
+                'status': duplicate.status,
+                'similarity': round(similarity, 2),
+            } if duplicate.id in visible else {
+                'request_id': duplicate.request_id,
+                'status': duplicate.status,
+                'similarity': round(similarity, 2),
+            }
+            for similarity, duplicate in duplicates
+        ]
+        return data
 
 
 class KaizenRequestDetailSerializer(KaizenRequestSerializer):
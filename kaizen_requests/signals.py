@@ -0,0 +1,100 @@
+from django.db import connections, transaction
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.signals import post_migrate, pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .blobs import adjust_references, store_content
+from .bulk_export import touch_requests
+from .documents import classify_document, update_compliance_flags
+from .facets import bump_kaizen_version
+from .field_values import record_saved, record_deleted
+from .models import KaizenAttachment, KaizenRequest, SIMILARITY_FIELDS, TRACKED_FIELDS
+from .previews import enqueue_previews, is_previewable
+from .search import install_search_index
+from .similarity import index_request
+
+
+SEARCH_MIGRATION = ('kaizen_requests', '0003_search_index')
+
+
+@receiver(post_migrate)
+def ensure_search_index(sender, app_config=None, using='default', **kwargs):
+    # SQLite drops triggers when a later migration rebuilds the kaizen table,
+    # so reinstall them (idempotently) whenever the search migration is applied.
+    if app_config is None or app_config.label != 'kaizen_requests':
+        return
+    connection = connections[using]
+    if SEARCH_MIGRATION in MigrationRecorder(connection).applied_migrations():
+        install_search_index(connection)
+
+
+# Approvals and evaluations change what get_role_filter and the risk filter
+# select, so they invalidate cached aggregates too.
+@receiver([post_save, post_delete], sender=KaizenRequest)
+@receiver([post_save, post_delete], sender='approvals.ManagerApproval')
+@receiver([post_save, post_delete], sender='approvals.HodApproval')
+@receiver([post_save, post_delete], sender='approvals.DepartmentEvaluation')
+def invalidate_kaizen_aggregates(sender, **kwargs):
+    # After commit, so no process caches aggregates of the old rows under the new version.
+    transaction.on_commit(bump_kaizen_version)
+
+
+@receiver(post_save, sender=KaizenRequest)
+def update_derived_indexes(sender, instance, created, **kwargs):
+    """Update autocomplete counts and the similarity index from changed text."""
+    loaded = {} if created else getattr(instance, '_loaded_values', None)
+    if loaded is None:
+        # Saved without having been loaded from the database: origin unknown.
+        return
+    record_saved(instance, loaded)
+    if created or any(loaded.get(field) != getattr(instance, field) for field in SIMILARITY_FIELDS):
+        index_request(instance)
+    instance._loaded_values = {field: getattr(instance, field) for field in TRACKED_FIELDS}
+
+
+@receiver(post_delete, sender=KaizenRequest)
+def remove_field_values(sender, instance, **kwargs):
+    record_deleted(instance)
+
+
+@receiver(pre_save, sender=KaizenAttachment)
+def store_attachment_blob(sender, instance, **kwargs):
+    """Route newly assigned attachment files into the content-addressed store."""
+    if not instance.document_type:
+        instance.document_type = classify_document(instance.file_name)
+    if instance.file and not instance.file._committed:
+        blob = store_content(instance.file)
+        instance.blob = blob
+        instance.file = blob.file.name
+
+
+@receiver(post_save, sender=KaizenAttachment)
+def move_blob_reference(sender, instance, created, **kwargs):
+    loaded = None if created else getattr(instance, '_loaded_blob_id', instance.blob_id)
+    if loaded != instance.blob_id:
+        adjust_references(instance.blob_id, 1)
+        adjust_references(loaded, -1)
+        if instance.blob_id and is_previewable(instance.file_type) and instance.blob.preview_status == 'PENDING':
+            enqueue_previews(instance.blob_id)
+    instance._loaded_blob_id = instance.blob_id
+
+
+@receiver(post_delete, sender=KaizenAttachment)
+def release_blob_reference(sender, instance, **kwargs):
+    adjust_references(instance.blob_id, -1)
+
+
+@receiver([post_save, post_delete], sender=KaizenAttachment)
+def refresh_compliance_flags(sender, instance, **kwargs):
+    update_compliance_flags(instance.kaizen_request_id)
+
+
+# Exported with their request; attachments already touch it through the
+# compliance flags above.
+@receiver([post_save, post_delete], sender='approvals.ManagerApproval')
+@receiver([post_save, post_delete], sender='approvals.HodApproval')
+@receiver([post_save, post_delete], sender='approvals.AgmApproval')
+@receiver([post_save, post_delete], sender='approvals.GmApproval')
+@receiver([post_save, post_delete], sender='approvals.DepartmentEvaluation')
+@receiver([post_save, post_delete], sender='audit.AuditLog')
+def touch_exported_request(sender, instance, **kwargs):
+    touch_requests([instance.kaizen_request_id])
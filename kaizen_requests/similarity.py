@@ -0,0 +1,167 @@
+"""Near-duplicate detection for kaizen requests with MinHash and LSH.
+
+Each request's title and descriptions are reduced to word-bigram shingles
+and a MinHash signature of ``NUM_PERM`` values. The signature is split into
+``BANDS`` bands of ``ROWS`` values; each band hashes to a bucket row. Two
+requests sharing any bucket are candidates, so a lookup reads only the
+matching bucket rows and never scans the corpus. With 16 bands of 4 rows,
+pairs with a Jaccard similarity around 0.5 or more are very likely to meet.
+"""
+import hashlib
+import random
+import re
+import struct
+from django.db import transaction
+from .models import KaizenRequest, KaizenSimilarityBucket, KaizenSimilaritySignature, SIMILARITY_FIELDS
+
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DUPLICATE_THRESHOLD = 0.5
+MAX_DUPLICATES = 5
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240917)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_SIGNATURE_FORMAT = f'<{NUM_PERM}Q'
+
+
+def _hash64(data):
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def shingles(text):
+    """Word bigrams of the lower-cased text (single words for one-word text)."""
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < 2:
+        return set(words)
+    return {f'{a} {b}' for a, b in zip(words, words[1:])}
+
+
+def request_text(kaizen):
+    return ' '.join(getattr(kaizen, field) or '' for field in SIMILARITY_FIELDS)
+
+
+def minhash(text):
+    """Return the MinHash signature of a text as a tuple, or None if it has no words."""
+    hashes = [_hash64(shingle.encode()) for shingle in shingles(text)]
+    if not hashes:
+        return None
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def band_buckets(signature):
+    """Hash each band of a signature (with its band number) to a signed 64-bit bucket."""
+    buckets = []
+    for band in range(BANDS):
+        values = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(struct.pack(f'<I{ROWS}Q', band, *values), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'little', signed=True))
+    return buckets
+
+
+def pack_signature(signature):
+    return struct.pack(_SIGNATURE_FORMAT, *signature)
+
+
+def unpack_signature(data):
+    return struct.unpack(_SIGNATURE_FORMAT, bytes(data))
+
+
+def estimate_similarity(first, second):
+    return sum(1 for a, b in zip(first, second) if a == b) / NUM_PERM
+
+
+def index_request(kaizen):
+    """Replace a request's signature and buckets."""
+    signature = minhash(request_text(kaizen))
+    with transaction.atomic():
+        KaizenSimilarityBucket.objects.filter(kaizen_request=kaizen).delete()
+        if signature is None:
+            KaizenSimilaritySignature.objects.filter(kaizen_request=kaizen).delete()
+            return
+        KaizenSimilaritySignature.objects.update_or_create(
+            kaizen_request=kaizen, defaults={'signature': pack_signature(signature)}
+        )
+        KaizenSimilarityBucket.objects.bulk_create([
+            KaizenSimilarityBucket(kaizen_request=kaizen, bucket=bucket)
+            for bucket in band_buckets(signature)
+        ])
+
+
+def index_requests(requests):
+    """Add signatures and buckets for requests inserted with ``bulk_create``."""
+    signatures, buckets = [], []
+    for kaizen in requests:
+        signature = minhash(request_text(kaizen))
+        if signature is None:
+            continue
+        signatures.append(KaizenSimilaritySignature(kaizen_request_id=kaizen.pk, signature=pack_signature(signature)))
+        buckets.extend(
+            KaizenSimilarityBucket(kaizen_request_id=kaizen.pk, bucket=bucket)
+            for bucket in band_buckets(signature)
+        )
+    return _flush(signatures, buckets, None)
+
+
+def find_similar(text, exclude_id=None, threshold=DUPLICATE_THRESHOLD, limit=MAX_DUPLICATES):
+    """Return ``[(similarity, KaizenRequest)]`` for indexed requests resembling ``text``."""
+    signature = minhash(text)
+    if signature is None:
+        return []
+
+    candidates = KaizenSimilarityBucket.objects.filter(bucket__in=band_buckets(signature))
+    if exclude_id is not None:
+        candidates = candidates.exclude(kaizen_request_id=exclude_id)
+    candidate_ids = set(candidates.values_list('kaizen_request_id', flat=True))
+
+    scored = []
+    for kaizen_id, packed in KaizenSimilaritySignature.objects.filter(
+        kaizen_request_id__in=candidate_ids
+    ).values_list('kaizen_request_id', 'signature'):
+        similarity = estimate_similarity(signature, unpack_signature(packed))
+        if similarity >= threshold:
+            scored.append((similarity, kaizen_id))
+    scored.sort(reverse=True)
+    scored = scored[:limit]
+
+    requests = KaizenRequest.objects.select_related('department').in_bulk([kaizen_id for _, kaizen_id in scored])
+    return [(similarity, requests[kaizen_id]) for similarity, kaizen_id in scored if kaizen_id in requests]
+
+
+def rebuild_similarity_index(batch_size=1000, log=None):
+    """Recompute signatures and buckets for every request; returns the number indexed."""
+    indexed = 0
+    with transaction.atomic():
+        KaizenSimilarityBucket.objects.all().delete()
+        KaizenSimilaritySignature.objects.all().delete()
+
+        rows = KaizenRequest.objects.order_by('id').values_list('id', *SIMILARITY_FIELDS)
+        signatures, buckets = [], []
+        for kaizen_id, *texts in rows.iterator(chunk_size=batch_size):
+            signature = minhash(' '.join(text or '' for text in texts))
+            if signature is None:
+                continue
+            signatures.append(KaizenSimilaritySignature(
+                kaizen_request_id=kaizen_id, signature=pack_signature(signature)
+            ))
+            buckets.extend(
+                KaizenSimilarityBucket(kaizen_request_id=kaizen_id, bucket=bucket)
+                for bucket in band_buckets(signature)
+            )
+            if len(signatures) >= batch_size:
+                indexed += _flush(signatures, buckets, log)
+        indexed += _flush(signatures, buckets, log)
+    return indexed
+
+
+def _flush(signatures, buckets, log):
+    count = len(signatures)
+    KaizenSimilaritySignature.objects.bulk_create(signatures)
+    KaizenSimilarityBucket.objects.bulk_create(buckets, batch_size=5000)
+    signatures.clear()
+    buckets.clear()
+    if log and count:
+        log(f'  Indexed {count} requests')
+    return count
@@ -1,3 +1,143 @@
+import io
+import json
+import os
+import tempfile
+from datetime import date
+from unittest import mock
 from django.test import TestCase
+from accounts.models import User
+from departments.models import Department
+from .field_values import suggest
+from .importers import KaizenImporter, read_ndjson_rows
+from .models import KaizenAttachment, KaizenFieldValue, KaizenRequest, UploadSession
+from .uploads import UploadError, partial_path, write_chunk
 
-# Create your tests here.
+
+def create_request(department, initiator, **fields):
+    defaults = dict(
+        title='Guard the conveyor', station_name='ST-1', program='PRG', issue_description='Pinch point',
+        date_of_origination=date(2026, 1, 1), department=department, initiator=initiator,
+    )
+    defaults.update(fields)
+    return KaizenRequest.objects.create(**defaults)
+
+
+class ComplianceFlagTests(TestCase):
+    def setUp(self):
+        self.department = Department.objects.create(name='MAINTENANCE', display_name='Maintenance')
+        self.user = User.objects.create_user(username='initiator', email='initiator@example.com', password='x')
+        self.kaizen = create_request(self.department, self.user, status='APPROVED')
+
+    def attach(self, file_name, **fields):
+        return KaizenAttachment.objects.create(
+            kaizen_request=self.kaizen, file=f'attachments/{file_name}', file_name=file_name,
+            file_type='application/pdf', file_size=1, uploaded_by=self.user, **fields
+        )
+
+    def test_every_marker_in_a_file_name_counts(self):
+        attachment = self.attach('pfmea_checksheet.pdf')
+        self.assertEqual(attachment.document_type, 'PFMEA')
+        self.kaizen.refresh_from_db()
+        self.assertEqual((self.kaizen.has_pfmea, self.kaizen.has_crr, self.kaizen.has_checksheet), (True, False, True))
+
+    def test_explicit_document_type_counts(self):
+        self.attach('scan.pdf', document_type='CRR')
+        self.kaizen.refresh_from_db()
+        self.assertTrue(self.kaizen.has_crr)
+
+    def test_attachments_leave_updated_at_alone(self):
+        updated_at = KaizenRequest.objects.get(pk=self.kaizen.pk).updated_at
+        attachment = self.attach('crr.pdf')
+        attachment.delete()
+        self.kaizen.refresh_from_db()
+        self.assertEqual(self.kaizen.updated_at, updated_at)
+        self.assertGreater(self.kaizen.export_updated_at, updated_at)
+        self.assertFalse(self.kaizen.has_crr)
+
+
+class SuggestTests(TestCase):
+    def setUp(self):
+        for value in ['Line A-1', 'Line A1', 'LineA', 'Line B', 'Line A/2']:
+            KaizenFieldValue.objects.create(
+                field='assembly_line', value=value, normalized=KaizenFieldValue.normalize(value), frequency=1
+            )
+
+    def values(self, prefix):
+        return sorted(row['value'] for row in suggest('assembly_line', prefix))
+
+    def test_prefix_with_space(self):
+        self.assertEqual(self.values('line a'), ['Line A-1', 'Line A/2', 'Line A1'])
+
+    def test_prefix_with_punctuation(self):
+        self.assertEqual(self.values('line a-'), ['Line A-1'])
+        self.assertEqual(self.values('Line  A/'), ['Line A/2'])
+
+
+class NdjsonImportTests(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Department.objects.create(name='MAINTENANCE', display_name='Maintenance')
+        User.objects.create_user(username='initiator', email='initiator@example.com', password='x')
+
+    def run_import(self, *records):
+        stream = io.StringIO(''.join(json.dumps(record) + '\n' for record in records))
+        return KaizenImporter(default_initiator='initiator@example.com').run(read_ndjson_rows(stream))
+
+    def record(self, **fields):
+        record = {
+            'title': 'Guard the conveyor', 'station_name': 'ST-1', 'program': 'PRG',
+            'issue_description': 'Pinch point', 'department': 'MAINTENANCE', 'cost_estimate': 1200.5,
+        }
+        record.update(fields)
+        return record
+
+    def test_wrong_types_are_line_errors(self):
+        summary = self.run_import(
+            self.record(),
+            self.record(title={'text': 'nested'}),
+            self.record(status=['APPROVED']),
+            self.record(department=7),
+            self.record(expected_benefits='Less scrap'),
+            self.record(manager_approvals='none'),
+            self.record(evaluations=[{'department': 'MAINTENANCE', 'evaluator': 'initiator@example.com', 'answers': 'yes'}]),
+        )
+        self.assertEqual(summary['created'], 1)
+        self.assertEqual([error['line'] for error in summary['errors']], [2, 3, 4, 5, 6, 7])
+        self.assertEqual(KaizenRequest.objects.get().cost_estimate, 1200.5)
+
+    def test_out_of_range_cost_is_a_line_error(self):
+        summary = self.run_import(self.record(cost_estimate='12345678901'), self.record(cost_estimate='NaN'))
+        self.assertEqual(summary['created'], 0)
+        self.assertEqual(len(summary['errors']), 2)
+        self.assertIn('Invalid cost estimate', summary['errors'][0]['error'])
+
+
+class UploadChunkTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch('kaizen_requests.uploads.UPLOAD_PARTIAL_DIR', directory.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        department = Department.objects.create(name='MAINTENANCE', display_name='Maintenance')
+        user = User.objects.create_user(username='initiator', email='initiator@example.com', password='x')
+        self.session = UploadSession.objects.create(
+            kaizen_request=create_request(department, user), uploaded_by=user,
+            file_name='crr.pdf', file_type='application/pdf', file_size=8,
+        )
+
+    def test_lost_partial_is_not_zero_filled(self):
+        write_chunk(self.session, io.BytesIO(b'abcd'), 0, 4)
+        os.remove(partial_path(self.session))
+
+        with self.assertRaises(UploadError) as raised:
+            write_chunk(self.session, io.BytesIO(b'efgh'), 4, 4)
+        self.assertEqual(raised.exception.status, 409)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.received, 0)
+        self.assertFalse(os.path.exists(partial_path(self.session)))
+
+        write_chunk(self.session, io.BytesIO(b'abcd'), 0, 4)
+        write_chunk(self.session, io.BytesIO(b'efgh'), 4, 4)
+        with open(partial_path(self.session), 'rb') as partial:
+            self.assertEqual(partial.read(), b'abcdefgh')
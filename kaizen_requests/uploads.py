@@ -0,0 +1,135 @@
+"""Chunked, resumable attachment uploads.
+
+A client opens an ``UploadSession``, PUTs the file in chunks at increasing
+offsets and then finalizes it. Chunks are streamed from the request body
+into a partial file on disk in small blocks, so neither a chunk nor the
+whole file is held in memory. Finalizing hashes the partial file and moves
+it into the content-addressed blob store (see ``blobs``).
+"""
+import hashlib
+import os
+from django.conf import settings
+from django.db import transaction
+from .blobs import hash_file, store_path
+from .models import KaizenAttachment
+
+
+UPLOAD_CHUNK_SIZE = getattr(settings, 'UPLOAD_CHUNK_SIZE', 5 * 1024 * 1024)
+UPLOAD_MAX_CHUNK_SIZE = getattr(settings, 'UPLOAD_MAX_CHUNK_SIZE', 16 * 1024 * 1024)
+ATTACHMENT_MAX_SIZE = getattr(settings, 'ATTACHMENT_MAX_SIZE', 200 * 1024 * 1024)
+UPLOAD_PARTIAL_DIR = getattr(settings, 'UPLOAD_PARTIAL_DIR', os.path.join(settings.MEDIA_ROOT, 'uploads', 'partial'))
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """Raised for chunks or finalize requests that cannot be applied."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def partial_path(session):
+    return os.path.join(UPLOAD_PARTIAL_DIR, f'{session.pk}.part')
+
+
+def _check_partial(session):
+    """Raise a 409 if the partial file holds less than ``session.received``.
+
+    The file may have been purged, or written on another worker's disk.
+    ``received`` is reset to what is really there so the client resumes from it.
+    """
+    path = partial_path(session)
+    on_disk = os.path.getsize(path) if os.path.exists(path) else 0
+    if on_disk < session.received:
+        session.received = on_disk
+        session.save(update_fields=['received', 'updated_at'])
+        raise UploadError(f'Partial upload lost; expected offset {on_disk}', status=409)
+
+
+def write_chunk(session, stream, offset, length, checksum=''):
+    """Append ``length`` bytes from ``stream`` at ``offset`` and return the new received size.
+
+    ``session`` must be locked with ``select_for_update``. A chunk must
+    start exactly where the last accepted one ended; a mismatch raises a 409
+    so the client can resume from ``session.received``. When ``checksum``
+    (SHA-256 hex) is given and does not match, the chunk is discarded.
+    """
+    if session.status != 'ACTIVE':
+        raise UploadError('Upload already completed', status=409)
+    if offset != session.received:
+        raise UploadError(f'Expected offset {session.received}', status=409)
+    if length <= 0 or length > UPLOAD_MAX_CHUNK_SIZE:
+        raise UploadError(f'Chunk size must be between 1 and {UPLOAD_MAX_CHUNK_SIZE} bytes')
+    if offset + length > session.file_size:
+        raise UploadError('Chunk extends past the declared file size')
+    # truncate() below would zero-fill a missing or short partial file.
+    _check_partial(session)
+
+    os.makedirs(UPLOAD_PARTIAL_DIR, exist_ok=True)
+    digest = hashlib.sha256()
+    written = 0
+    with open(partial_path(session), 'ab') as partial:
+        partial.truncate(offset)
+        partial.seek(offset)
+        while written < length:
+            block = stream.read(min(STREAM_BLOCK_SIZE, length - written))
+            if not block:
+                break
+            partial.write(block)
+            digest.update(block)
+            written += len(block)
+
+        if written != length or (checksum and digest.hexdigest() != checksum.lower()):
+            partial.truncate(offset)
+            if written != length:
+                raise UploadError(f'Expected {length} bytes, received {written}')
+            raise UploadError('Chunk checksum mismatch')
+
+    session.received = offset + length
+    session.save(update_fields=['received', 'updated_at'])
+    return session.received
+
+
+def finalize(session):
+    """Move a fully received upload into the blob store and return its attachment.
+
+    The assembled file is hashed in one streaming pass and then renamed into
+    the content-addressed store, or dropped if the same content is stored.
+    """
+    if session.status != 'ACTIVE':
+        raise UploadError('Upload already completed', status=409)
+    if session.received != session.file_size:
+        raise UploadError(f'Upload incomplete: {session.received} of {session.file_size} bytes', status=409)
+    _check_partial(session)
+
+    path = partial_path(session)
+    sha256, size = hash_file(path)
+    if session.checksum and sha256 != session.checksum.lower():
+        raise UploadError('File checksum mismatch')
+
+    blob = store_path(path, sha256, size)
+    with transaction.atomic():
+        attachment = KaizenAttachment.objects.create(
+            kaizen_request=session.kaizen_request,
+            file=blob.file.name,
+            blob=blob,
+            file_name=session.file_name,
+            file_type=session.file_type,
+            file_size=session.file_size,
+            document_type=session.document_type,
+            uploaded_by=session.uploaded_by,
+        )
+        session.status = 'COMPLETED'
+        session.attachment = attachment
+        session.save(update_fields=['status', 'attachment', 'updated_at'])
+    return attachment
+
+
+def discard(session):
+    """Remove a session's partial file (if any) and the session itself."""
+    try:
+        os.remove(partial_path(session))
+    except FileNotFoundError:
+        pass
+    session.delete()
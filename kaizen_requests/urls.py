@@ -1,13 +1,27 @@
 from django.urls import path
 from .views import (
     KaizenRequestListView, KaizenRequestDetailView,
-    submit_request, my_requests, pending_approvals, get_by_request_id
+    submit_request, my_requests, pending_approvals, get_by_request_id,
+    search_requests, request_facets, autocomplete,
+    start_upload, upload_chunk, complete_upload, download_attachment, import_requests,
+    export_requests, status_events, status_stream_token
 )
 
 urlpatterns = [
     path('', KaizenRequestListView.as_view(), name='kaizen_list'),
     path('<int:pk>/', KaizenRequestDetailView.as_view(), name='kaizen_detail'),
     path('<int:pk>/submit/', submit_request, name='kaizen_submit'),
+    path('<int:pk>/uploads/', start_upload, name='kaizen_upload_start'),
+    path('uploads/<uuid:upload_id>/', upload_chunk, name='kaizen_upload_chunk'),
+    path('uploads/<uuid:upload_id>/complete/', complete_upload, name='kaizen_upload_complete'),
+    path('attachments/<int:pk>/download/', download_attachment, name='kaizen_attachment_download'),
+    path('import/', import_requests, name='kaizen_import'),
+    path('export/', export_requests, name='kaizen_export'),
+    path('events/', status_events, name='kaizen_status_events'),
+    path('events/token/', status_stream_token, name='kaizen_status_stream_token'),
+    path('search/', search_requests, name='kaizen_search'),
+    path('facets/', request_facets, name='kaizen_facets'),
+    path('autocomplete/', autocomplete, name='kaizen_autocomplete'),
     path('my/', my_requests, name='my_requests'),
     path('pending/', pending_approvals, name='pending_approvals'),
     path('by-request-id/<str:request_id>/', get_by_request_id, name='kaizen_by_request_id'),
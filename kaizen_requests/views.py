@@ -1,12 +1,33 @@
+import io
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
 from django.db.models import Q
-from .models import KaizenRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+from approvals.events import emit_transition
+from reports.views import get_role_filter, apply_common_filters
+from .models import KaizenRequest, KaizenAttachment, KaizenFieldValue, UploadSession
+from .bulk_export import RequestGraphExporter, parse_since
+from .changefeed import (
+    STATUS_STREAM_TOKEN_LIFETIME, StatusStream, authenticate_stream, issue_stream_token, latest_event_id,
+)
+from .documents import DOCUMENT_TYPES
+from .downloads import serve_file
+from .field_values import suggest
+from .importers import KaizenImporter, read_csv_rows, read_ndjson_rows
+from .previews import PREVIEW_SIZES, preview_name
+from .facets import FACETS, FACETS_CACHE_TTL, compute_facets, facets_cache_key
+from .search import parse_terms, search, highlight
+from .uploads import ATTACHMENT_MAX_SIZE, UPLOAD_CHUNK_SIZE, UploadError, finalize, write_chunk
 from .serializers import (
     KaizenRequestSerializer, KaizenRequestCreateSerializer, 
-    KaizenRequestDetailSerializer
+    KaizenRequestDetailSerializer, KaizenAttachmentSerializer
 )
 
 
@@ -15,7 +36,9 @@ class KaizenRequestListView(generics.ListCreateAPIView):
     
     def get_queryset(self):
         user = self.request.user
-        queryset = KaizenRequest.objects.select_related('department', 'initiator').order_by('-created_at')
+        queryset = KaizenRequest.objects.select_related('department', 'initiator').prefetch_related(
+            'attachments__blob'
+        ).order_by('-created_at')
         
         if user.role == 'INITIATOR':
             return queryset.filter(initiator=user)
@@ -62,7 +85,7 @@ class KaizenRequestListView(generics.ListCreateAPIView):
 
 
 class KaizenRequestDetailView(generics.RetrieveUpdateAPIView):
-    queryset = KaizenRequest.objects.select_related('department', 'initiator')
+    queryset = KaizenRequest.objects.select_related('department', 'initiator').prefetch_related('attachments__blob')
     permission_classes = [IsAuthenticated]
     
     def get_serializer_class(self):
@@ -81,7 +104,9 @@ def submit_request(request, pk):
         
         kaizen.status = 'PENDING_OWN_MANAGER'
         kaizen.current_stage = 'OWN_MANAGER'
-        kaizen.save()
+        with transaction.atomic():
+            kaizen.save()
+            emit_transition(kaizen, 'DRAFT', request.user)
         
         return Response(KaizenRequestSerializer(kaizen).data)
     except KaizenRequest.DoesNotExist:
@@ -91,7 +116,7 @@ def submit_request(request, pk):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def my_requests(request):
-    requests = KaizenRequest.objects.filter(initiator=request.user)
+    requests = KaizenRequest.objects.filter(initiator=request.user).prefetch_related('attachments__blob')
     return Response(KaizenRequestSerializer(requests, many=True).data)
 
 
@@ -99,7 +124,7 @@ def my_requests(request):
 @permission_classes([IsAuthenticated])
 def pending_approvals(request):
     user = request.user
-    queryset = KaizenRequest.objects.select_related('department', 'initiator')
+    queryset = KaizenRequest.objects.select_related('department', 'initiator').prefetch_related('attachments__blob')
     
     if user.role == 'HOD' and user.department:
         pending = queryset.filter(
@@ -125,7 +150,347 @@ def pending_approvals(request):
 @permission_classes([IsAuthenticated])
 def get_by_request_id(request, request_id):
     try:
-        kaizen = KaizenRequest.objects.select_related('department', 'initiator').get(request_id=request_id)
+        kaizen = KaizenRequest.objects.select_related('department', 'initiator').prefetch_related(
+            'attachments__blob'
+        ).get(request_id=request_id)
         return Response(KaizenRequestDetailSerializer(kaizen).data)
     except KaizenRequest.DoesNotExist:
         return Response({'error': 'Request not found'}, status=status.HTTP_404_NOT_FOUND)
+
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search_requests(request):
+    """Ranked full-text search over title, station, program and descriptions.
+    
+    ``?q=`` is required; the report filters (status, department, dates,
+    cost) and the caller's role scoping apply. Matches on the returned page
+    carry ``rank`` and ``highlights`` with ``<mark>``-wrapped fragments.
+    """
+    terms = parse_terms(request.query_params.get('q'))
+    if not terms:
+        return Response({'error': 'Search query is required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        page = max(int(request.query_params.get('page', 1)), 1)
+        page_size = min(max(int(request.query_params.get('page_size', SEARCH_PAGE_SIZE)), 1), SEARCH_MAX_PAGE_SIZE)
+    except ValueError:
+        return Response({'error': 'Invalid page'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    queryset = KaizenRequest.objects.filter(get_role_filter(request.user))
+    queryset = search(apply_common_filters(queryset, request), terms)
+    
+    count = queryset.count()
+    offset = (page - 1) * page_size
+    results = list(
+        queryset.select_related('department', 'initiator').prefetch_related('attachments__blob')
+        .order_by('-rank', '-created_at')[offset:offset + page_size]
+    )
+    highlights = highlight([kaizen.id for kaizen in results], terms)
+    
+    data = []
+    for kaizen in results:
+        item = KaizenRequestSerializer(kaizen).data
+        item['rank'] = kaizen.rank
+        item['highlights'] = highlights.get(kaizen.id, {})
+        data.append(item)
+    
+    return Response({'count': count, 'page': page, 'page_size': page_size, 'results': data})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def request_facets(request):
+    """Counts per status, department, program, assembly line and cost band.
+    
+    Accepts the report filters plus ``program``, ``assembly_line`` and
+    ``cost_band``. Each facet's counts ignore its own selection so the UI
+    can show alternatives. Results are cached per role scope and filter set
+    until a request, approval or evaluation changes.
+    """
+    cache_key = facets_cache_key(request.user, request.query_params)
+    data = cache.get(cache_key)
+    if data is None:
+        queryset = KaizenRequest.objects.filter(get_role_filter(request.user))
+        queryset = apply_common_filters(queryset, request, exclude=FACETS)
+        selected = {facet: request.query_params[facet] for facet in FACETS if request.query_params.get(facet)}
+        data = compute_facets(queryset, selected)
+        cache.set(cache_key, data, FACETS_CACHE_TTL)
+    return Response(data)
+
+
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def autocomplete(request):
+    """Most used values of a free-text field starting with ``?q=``.
+    
+    ``?field=`` is one of station_name, program, assembly_line or
+    customer_part_number.
+    """
+    field = request.query_params.get('field')
+    if field not in KaizenFieldValue.FIELDS:
+        return Response(
+            {'error': f"field must be one of {', '.join(KaizenFieldValue.FIELDS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        limit = min(max(int(request.query_params.get('limit', AUTOCOMPLETE_LIMIT)), 1), AUTOCOMPLETE_MAX_LIMIT)
+    except ValueError:
+        return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(suggest(field, request.query_params.get('q', ''), limit))
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_requests(request):
+    """Bulk-import kaizen requests from an uploaded CSV or NDJSON file (multipart field ``file``).
+    
+    Rows without an initiator are attributed to ``initiator`` (an email) or
+    the caller. Rows whose request id already exists are skipped.
+    """
+    if request.user.role != 'ADMIN':
+        return Response({'error': 'Unauthorized'}, status=403)
+    
+    upload = request.FILES.get('file')
+    if not upload:
+        return Response({'error': 'CSV or NDJSON file is required'}, status=400)
+    
+    file_format = request.data.get('format') or (
+        'ndjson' if upload.name.endswith(('.ndjson', '.jsonl')) else 'csv'
+    )
+    importer = KaizenImporter(
+        default_initiator=request.data.get('initiator') or request.user.email,
+        dry_run=str(request.data.get('dry_run', '')).lower() in ('1', 'true'),
+    )
+    stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    rows = read_ndjson_rows(stream) if file_format == 'ndjson' else read_csv_rows(stream)
+    try:
+        summary = importer.run(rows)
+    except UnicodeDecodeError:
+        return Response({'error': 'File must be UTF-8 encoded'}, status=400)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=400)
+    
+    return Response(summary, status=status.HTTP_201_CREATED if summary['created'] else status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_requests(request):
+    """Stream every request with approvals, evaluations, attachments and audit events.
+    
+    The body is gzip-compressed NDJSON, one request per line. With
+    ``?updated_since=`` (ISO datetime or date) only requests updated at or
+    after that time are included.
+    """
+    if request.user.role != 'ADMIN':
+        return Response({'error': 'Unauthorized'}, status=403)
+    
+    updated_since = None
+    if request.query_params.get('updated_since'):
+        updated_since = parse_since(request.query_params['updated_since'])
+        if updated_since is None:
+            return Response({'error': 'Invalid updated_since'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    exporter = RequestGraphExporter(updated_since=updated_since)
+    chunks = exporter.agzip_chunks() if isinstance(request._request, ASGIRequest) else exporter.gzip_chunks()
+    response = StreamingHttpResponse(chunks, content_type='application/gzip')
+    response['Content-Disposition'] = (
+        f'attachment; filename="kaizen_requests_{timezone.now():%Y%m%d%H%M%S}.ndjson.gz"'
+    )
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def status_stream_token(request):
+    """Issue a short-lived ``stream_token`` for opening the event stream with EventSource."""
+    return Response({
+        'stream_token': issue_stream_token(request.user),
+        'expires_in': STATUS_STREAM_TOKEN_LIFETIME,
+    })
+
+
+@require_GET
+def status_events(request):
+    """Stream status transitions visible to the user as Server-Sent Events.
+    
+    Plain Django view so the stream can run asynchronously under ASGI.
+    Authenticates with the Bearer header or ``?stream_token=`` (see
+    ``status_stream_token``; fetch a new one before reconnecting); resumes
+    after the ``Last-Event-ID`` header (or ``?last_event_id=``), otherwise
+    starts with the next transition.
+    """
+    user = authenticate_stream(request)
+    if user is None:
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+    
+    try:
+        after_id = int(request.headers.get('Last-Event-ID') or request.GET['last_event_id'])
+    except (KeyError, ValueError):
+        after_id = latest_event_id()
+    
+    stream = StatusStream(user, after_id)
+    events = stream.aevents() if isinstance(request, ASGIRequest) else stream.events()
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _upload_status(session):
+    return {
+        'upload_id': str(session.id),
+        'file_name': session.file_name,
+        'file_size': session.file_size,
+        'received': session.received,
+        'chunk_size': UPLOAD_CHUNK_SIZE,
+        'status': session.status,
+    }
+
+
+def _get_upload_session(request, upload_id, lock=False):
+    sessions = UploadSession.objects.select_related('kaizen_request')
+    if lock:
+        sessions = sessions.select_for_update()
+    return sessions.filter(id=upload_id, uploaded_by=request.user).first()
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def start_upload(request, pk):
+    """Open a resumable upload for an attachment of request ``pk``.
+    
+    Body: ``file_name``, ``file_size`` in bytes, optional ``file_type``,
+    ``document_type`` (classified from the file name when omitted) and
+    ``checksum`` (SHA-256 hex of the whole file, verified on completion).
+    """
+    kaizen = KaizenRequest.objects.filter(get_role_filter(request.user), pk=pk).first()
+    if kaizen is None:
+        return Response({'error': 'Request not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    file_name = (request.data.get('file_name') or '').strip()
+    if not file_name:
+        return Response({'error': 'file_name is required'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        file_size = int(request.data.get('file_size'))
+    except (TypeError, ValueError):
+        return Response({'error': 'file_size is required'}, status=status.HTTP_400_BAD_REQUEST)
+    if file_size <= 0 or file_size > ATTACHMENT_MAX_SIZE:
+        return Response(
+            {'error': f'file_size must be between 1 and {ATTACHMENT_MAX_SIZE} bytes'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    document_type = (request.data.get('document_type') or '').upper()
+    if document_type and document_type not in DOCUMENT_TYPES:
+        return Response(
+            {'error': f"document_type must be one of {', '.join(sorted(DOCUMENT_TYPES))}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    session = UploadSession.objects.create(
+        kaizen_request=kaizen,
+        uploaded_by=request.user,
+        file_name=file_name[:255],
+        file_type=(request.data.get('file_type') or 'application/octet-stream')[:100],
+        file_size=file_size,
+        document_type=document_type,
+        checksum=(request.data.get('checksum') or '').strip()[:64],
+    )
+    return Response(_upload_status(session), status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET', 'PUT'])
+@permission_classes([IsAuthenticated])
+def upload_chunk(request, upload_id):
+    """GET reports progress; PUT appends the raw request body at ``?offset=``.
+    
+    An ``X-Chunk-Checksum`` header (SHA-256 hex) is verified before the
+    chunk is accepted. A wrong offset returns 409 with the expected one.
+    """
+    if request.method == 'GET':
+        session = _get_upload_session(request, upload_id)
+        if session is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(_upload_status(session))
+    
+    try:
+        offset = int(request.query_params.get('offset', ''))
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return Response({'error': 'offset is required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    with transaction.atomic():
+        session = _get_upload_session(request, upload_id, lock=True)
+        if session is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            write_chunk(session, request.stream, offset, length, request.headers.get('X-Chunk-Checksum', ''))
+        except UploadError as e:
+            return Response({'error': str(e), 'received': session.received}, status=e.status)
+    return Response(_upload_status(session))
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def complete_upload(request, upload_id):
+    """Assemble a fully received upload into a KaizenAttachment."""
+    with transaction.atomic():
+        session = _get_upload_session(request, upload_id, lock=True)
+        if session is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            attachment = finalize(session)
+        except UploadError as e:
+            return Response({'error': str(e), 'received': session.received}, status=e.status)
+    return Response(KaizenAttachmentSerializer(attachment).data, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET', 'HEAD'])
+@permission_classes([IsAuthenticated])
+def download_attachment(request, pk):
+    """Download an attachment, or one of its image previews with ``?variant=``.
+    
+    Supports ``Range``, ``If-Range``, ``If-None-Match`` and
+    ``If-Modified-Since``; see ``downloads.serve_file`` for proxy offload.
+    """
+    visible = KaizenRequest.objects.filter(get_role_filter(request.user)).values('pk')
+    attachment = KaizenAttachment.objects.select_related('blob').filter(
+        pk=pk, kaizen_request__in=visible
+    ).first()
+    if attachment is None or not attachment.file:
+        raise Http404
+    
+    variant = request.query_params.get('variant')
+    if variant:
+        blob = attachment.blob
+        if variant not in PREVIEW_SIZES or blob is None or blob.preview_status != 'READY':
+            raise Http404
+        name = preview_name(blob.sha256, variant)
+        return serve_file(
+            request, name, attachment.file.storage.size(name), 'image/webp',
+            f'{attachment.file_name.rsplit(".", 1)[0]}-{variant}.webp',
+            etag=f'"{blob.sha256}-{variant}"', last_modified=blob.created_at, as_attachment=False
+        )
+    
+    if attachment.blob_id:
+        etag = f'"{attachment.blob_id}"'
+        size = attachment.blob.size
+    else:
+        etag = f'"{attachment.pk}-{attachment.file_size}-{int(attachment.uploaded_at.timestamp())}"'
+        size = attachment.file.size
+    return serve_file(
+        request, attachment.file.name, size, attachment.file_type or 'application/octet-stream',
+        attachment.file_name, etag=etag, last_modified=attachment.uploaded_at,
+        as_attachment=request.query_params.get('inline') != '1'
+    )
@@ -0,0 +1,245 @@
+"""Async versions of the reports that issue several independent queries.
+
+DRF views are synchronous, so under ASGI each report holds a worker thread
+while its queries run one after another. These are plain Django async views
+that authenticate through DRF and then run their independent queries
+concurrently, each on a pool thread with its own database connection, so
+they overlap in the database and the event loop stays free while waiting.
+Responses are the same as the sync endpoints; ``benchmark_reports``
+compares the two.
+"""
+import asyncio
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from kaizen_requests.models import KaizenRequest
+from approvals.models import ManagerApproval, HodApproval
+from accounts.models import User
+from audit.models import AuditLog
+from .views import (
+    AGM_COST_LIMIT, AVAILABLE_REPORTS, GM_COST_LIMIT,
+    apply_common_filters, approval_level, export_csv, get_role_filter,
+)
+
+
+def _json(data, status=200):
+    # Rendered like DRF's Response so both versions return identical bodies.
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
+
+
+def _on_own_connection(func):
+    def run():
+        close_old_connections()
+        try:
+            return func()
+        finally:
+            close_old_connections()
+    return run
+
+
+async def gather_queries(*funcs):
+    """Run blocking ORM callables concurrently and return their results in order."""
+    return await asyncio.gather(*(
+        sync_to_async(_on_own_connection(func), thread_sensitive=False)() for func in funcs
+    ))
+
+
+def async_report(roles=None):
+    """Authenticate like the DRF views and restrict to ``roles`` before running the report.
+
+    The view receives a DRF ``Request`` so shared helpers can read
+    ``query_params``.
+    """
+    def decorator(view):
+        @require_GET
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            api_request = Request(request, authenticators=[
+                authentication() for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+            ])
+            try:
+                user = await sync_to_async(lambda: api_request.user)()
+            except APIException as exc:
+                return _json({'detail': str(exc.detail)}, status=exc.status_code)
+            if not user.is_authenticated:
+                return _json({'detail': 'Authentication credentials were not provided.'}, status=401)
+            if roles and user.role not in roles:
+                return _json({'error': 'Unauthorized'}, status=403)
+            return await view(api_request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@async_report()
+async def report_dashboard(request):
+    """Dashboard summary for the current user's role."""
+    user = request.user
+    base_filter = await sync_to_async(get_role_filter)(user)
+    queryset = KaizenRequest.objects.filter(base_filter) if base_filter else KaizenRequest.objects.all()
+
+    counts, by_status, recent = await gather_queries(
+        lambda: queryset.aggregate(
+            total=Count('id'),
+            approved=Count('id', filter=Q(status='APPROVED')),
+            rejected=Count('id', filter=Q(status='REJECTED')),
+        ),
+        lambda: list(queryset.values('status').annotate(count=Count('id'))),
+        lambda: list(queryset.order_by('-created_at')[:5].values('request_id', 'title', 'status', 'created_at')),
+    )
+
+    return _json({
+        'summary': {
+            'total': counts['total'],
+            'approved': counts['approved'],
+            'rejected': counts['rejected'],
+            'pending': counts['total'] - counts['approved'] - counts['rejected']
+        },
+        'by_status': by_status,
+        'recent': recent,
+        'available_reports': AVAILABLE_REPORTS.get(user.role, [])
+    })
+
+
+@async_report(roles=['AGM', 'GM', 'ADMIN'])
+async def cost_impact_report(request):
+    """Cost impact rows, with the summary aggregated in the database alongside them."""
+    queryset = apply_common_filters(KaizenRequest.objects.all(), request)
+
+    def rows():
+        return [
+            {
+                'id': kr['id'],
+                'request_id': kr['request_id'],
+                'title': kr['title'],
+                'department': kr['department__name'],
+                'cost_estimate': float(kr['cost_estimate']),
+                'approval_level_required': approval_level(
+                    float(kr['cost_estimate']), kr['requires_process_addition'], kr['requires_manpower_addition']
+                ),
+                'status': kr['status'],
+                'requires_process': kr['requires_process_addition'],
+                'requires_manpower': kr['requires_manpower_addition']
+            }
+            for kr in queryset.values(
+                'id', 'request_id', 'title', 'department__name', 'cost_estimate', 'status',
+                'requires_process_addition', 'requires_manpower_addition'
+            )
+        ]
+
+    if request.query_params.get('export') == 'csv':
+        (data,) = await gather_queries(rows)
+        headers = ['Kaizen ID', 'Title', 'Department', 'Cost', 'Approval Level', 'Status', 'Process Change', 'Manpower']
+        csv_rows = [[d['request_id'], d['title'], d['department'], d['cost_estimate'], d['approval_level_required'], d['status'], d['requires_process'], d['requires_manpower']] for d in data]
+        return export_csv(csv_rows, 'cost_impact', headers)
+
+    # Same thresholds as approval_level().
+    gm = Q(cost_estimate__gt=GM_COST_LIMIT)
+    agm = ~gm & (Q(cost_estimate__gt=AGM_COST_LIMIT) | Q(requires_process_addition=True) | Q(requires_manpower_addition=True))
+    data, totals = await gather_queries(rows, lambda: queryset.aggregate(
+        count=Count('id'),
+        total_cost=Sum('cost_estimate'),
+        approved_cost=Sum('cost_estimate', filter=Q(status='APPROVED')),
+        gm=Count('id', filter=gm),
+        agm=Count('id', filter=agm),
+    ))
+
+    total_cost = float(totals['total_cost'] or 0)
+    approved_cost = float(totals['approved_cost'] or 0)
+    return _json({
+        'requests': data,
+        'summary': {
+            'total_cost': total_cost,
+            'approved_cost': approved_cost,
+            'pending_cost': total_cost - approved_cost,
+            'by_level': {
+                'hod': totals['count'] - totals['gm'] - totals['agm'],
+                'agm': totals['agm'],
+                'gm': totals['gm']
+            }
+        }
+    })
+
+
+@async_report(roles=['AGM', 'GM', 'ADMIN'])
+async def budget_report(request):
+    """Approved spend by department and month, and overall totals."""
+    approved = KaizenRequest.objects.filter(status='APPROVED')
+
+    if request.query_params.get('date_from'):
+        approved = approved.filter(created_at__date__gte=request.query_params.get('date_from'))
+    if request.query_params.get('date_to'):
+        approved = approved.filter(created_at__date__lte=request.query_params.get('date_to'))
+
+    by_department, monthly_spend, totals = await gather_queries(
+        lambda: list(approved.values('department__name').annotate(
+            total_cost=Sum('cost_estimate'),
+            count=Count('id')
+        )),
+        lambda: list(approved.annotate(
+            month=TruncMonth('created_at')
+        ).values('month').annotate(
+            total=Sum('cost_estimate'),
+            count=Count('id')
+        ).order_by('month')),
+        lambda: approved.aggregate(total=Sum('cost_estimate'), count=Count('id')),
+    )
+
+    return _json({
+        'by_department': by_department,
+        'monthly_spend': [
+            {'month': item['month'].strftime('%Y-%m') if item['month'] else '',
+             'total': float(item['total'] or 0),
+             'count': item['count']}
+            for item in monthly_spend
+        ],
+        'total_approved_cost': float(totals['total'] or 0),
+        'total_approved_count': totals['count']
+    })
+
+
+@async_report(roles=['ADMIN'])
+async def user_activity_report(request):
+    """Per-user activity, with the three per-user counts grouped in concurrent queries."""
+    decided = ['APPROVED', 'REJECTED']
+    users, manager_counts, hod_counts, action_counts = await gather_queries(
+        lambda: list(User.objects.all().select_related('department')),
+        lambda: dict(ManagerApproval.objects.filter(decision__in=decided).order_by().values('manager').annotate(
+            count=Count('id')
+        ).values_list('manager', 'count')),
+        lambda: dict(HodApproval.objects.filter(decision__in=decided).order_by().values('hod').annotate(
+            count=Count('id')
+        ).values_list('hod', 'count')),
+        lambda: dict(AuditLog.objects.filter(user__isnull=False).order_by().values('user').annotate(
+            count=Count('id')
+        ).values_list('user', 'count')),
+    )
+
+    data = []
+    for user in users:
+        data.append({
+            'id': user.id,
+            'username': user.username,
+            'full_name': user.get_full_name(),
+            'role': user.role,
+            'department': user.department.name if user.department else '',
+            'actions_count': action_counts.get(user.id, 0),
+            'approval_count': manager_counts.get(user.id, 0) + hod_counts.get(user.id, 0),
+            'last_login': user.last_login.isoformat() if user.last_login else 'Never',
+            'is_active': user.is_active
+        })
+
+    if request.query_params.get('export') == 'csv':
+        headers = ['Username', 'Name', 'Role', 'Department', 'Actions', 'Approvals', 'Last Login', 'Active']
+        rows = [[d['username'], d['full_name'], d['role'], d['department'], d['actions_count'], d['approval_count'], d['last_login'], d['is_active']] for d in data]
+        return export_csv(rows, 'user_activity', headers)
+
+    return _json(data)
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import random
+import time
+from datetime import date
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand
+from accounts.authentication import tokens_for_user
+from accounts.models import User
+from departments.models import Department
+from kaizen_requests.models import KaizenRequest
+
+
+ENDPOINTS = [
+    ('dashboard', '/api/reports/dashboard/', '/api/reports/async/dashboard/'),
+    ('cost impact', '/api/reports/cost-impact/', '/api/reports/async/cost-impact/'),
+    ('budget', '/api/reports/budget/', '/api/reports/async/budget/'),
+    ('user activity', '/api/reports/user-activity/', '/api/reports/async/user-activity/'),
+]
+
+BENCH_PREFIX = 'BENCH-RPT-'
+
+
+class Command(BaseCommand):
+    help = 'Compare sync and async report endpoints served through the ASGI handler'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=0, help='Synthetic requests to add for the run (removed afterwards)')
+        parser.add_argument('--repeat', type=int, default=10, help='Sequential requests per endpoint')
+        parser.add_argument('--concurrency', type=int, default=8, help='Simultaneous requests per endpoint')
+
+    def handle(self, *args, **options):
+        # Async queries run on their own connections, so seeded rows must be
+        # committed rather than rolled back as in benchmark_search.
+        if options['rows']:
+            self._seed(options['rows'])
+        admin = User.objects.filter(role='ADMIN').first()
+        token = str(tokens_for_user(admin).access_token)
+        try:
+            asyncio.run(self._run(token, options['repeat'], options['concurrency']))
+        finally:
+            if options['rows']:
+                KaizenRequest.objects.filter(request_id__startswith=BENCH_PREFIX).delete()
+
+    def _seed(self, count):
+        rng = random.Random(42)
+        departments = list(Department.objects.all())
+        initiator = User.objects.filter(role='INITIATOR').first() or User.objects.first()
+        statuses = [s for s, _ in KaizenRequest.STATUS_CHOICES]
+        batch = []
+        for i in range(count):
+            batch.append(KaizenRequest(
+                request_id=f'{BENCH_PREFIX}{i:07d}',
+                title=f'Benchmark request {i}',
+                station_name=f'ST-{i % 500}',
+                program=f'PRG-{i % 40}',
+                issue_description='Synthetic request for report benchmarking',
+                date_of_origination=date.today(),
+                department=departments[i % len(departments)],
+                initiator=initiator,
+                status=statuses[i % len(statuses)],
+                cost_estimate=rng.randrange(0, 200000),
+                requires_process_addition=i % 7 == 0,
+                requires_manpower_addition=i % 11 == 0,
+            ))
+            if len(batch) == 5000:
+                KaizenRequest.objects.bulk_create(batch)
+                batch = []
+        KaizenRequest.objects.bulk_create(batch)
+        self.stdout.write(f'Seeded {count} requests')
+
+    async def _get(self, app, path, token):
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+            'headers': [(b'host', b'testserver'), (b'authorization', f'Bearer {token}'.encode())],
+            'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+        }
+        pending = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+        response = {'status': None, 'body': b''}
+
+        async def receive():
+            if pending:
+                return pending.pop()
+            # The client never disconnects; Django cancels this wait once done.
+            await asyncio.Event().wait()
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+            elif message['type'] == 'http.response.body':
+                response['body'] += message.get('body', b'')
+
+        await app(scope, receive, send)
+        return response
+
+    async def _run(self, token, repeat, concurrency):
+        app = ASGIHandler()
+
+        self.stdout.write(f'{"":<14} {"sync avg":>10} {"async avg":>10} {f"sync x{concurrency}":>10} {f"async x{concurrency}":>10}  same')
+        for label, sync_path, async_path in ENDPOINTS:
+            sync_response = await self._get(app, sync_path, token)
+            async_response = await self._get(app, async_path, token)
+            same = (
+                sync_response['status'] == async_response['status'] == 200 and
+                json.loads(sync_response['body']) == json.loads(async_response['body'])
+            )
+
+            timings = []
+            for path in (sync_path, async_path):
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    await self._get(app, path, token)
+                timings.append((time.perf_counter() - start) / repeat)
+            for path in (sync_path, async_path):
+                start = time.perf_counter()
+                await asyncio.gather(*(self._get(app, path, token) for _ in range(concurrency)))
+                timings.append(time.perf_counter() - start)
+
+            self.stdout.write(
+                f'{label:<14} ' + ' '.join(f'{t * 1000:>8.1f}ms' for t in timings) + f'  {"yes" if same else "NO"}'
+            )
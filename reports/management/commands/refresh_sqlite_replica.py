@@ -0,0 +1,24 @@
+import sqlite3
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from kaizen_backend.replica import REPLICA_ALIAS, replica_configured
+
+
+class Command(BaseCommand):
+    help = 'Copy the SQLite primary database into the SQLite replica (local stand-in for replication)'
+
+    def handle(self, *args, **options):
+        if not replica_configured():
+            raise CommandError('No replica database configured; set REPLICA_DATABASE_URL=sqlite:///replica.sqlite3')
+        primary, replica = connections[DEFAULT_DB_ALIAS], connections[REPLICA_ALIAS]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError('Both databases must be SQLite; use database replication for PostgreSQL')
+
+        source = sqlite3.connect(primary.settings_dict['NAME'])
+        target = sqlite3.connect(replica.settings_dict['NAME'])
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+            target.close()
+        self.stdout.write(self.style.SUCCESS(f'Copied {primary.settings_dict["NAME"]} to {replica.settings_dict["NAME"]}'))
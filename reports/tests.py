@@ -1,3 +1,54 @@
+from datetime import date, timedelta
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from accounts.models import User
+from approvals.models import ManagerApproval
+from audit.models import AuditLog
+from departments.models import Department
+from kaizen_requests.bulk_export import touch_requests
+from kaizen_requests.models import KaizenRequest
 
-# Create your tests here.
+
+class ApprovalTATReportTests(TestCase):
+    def setUp(self):
+        self.department = Department.objects.create(name='MAINTENANCE', display_name='Maintenance')
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='x', role='ADMIN')
+        self.manager = User.objects.create_user(
+            username='manager', email='manager@example.com', password='x', role='MANAGER', department=self.department
+        )
+        self.kaizen = KaizenRequest.objects.create(
+            title='Guard the conveyor', station_name='ST-1', program='PRG', issue_description='Pinch point',
+            date_of_origination=date(2026, 1, 1), department=self.department, initiator=self.manager,
+            status='APPROVED',
+        )
+        self.approval = ManagerApproval.objects.create(
+            kaizen_request=self.kaizen, manager=self.manager, department=self.department,
+            stage_type='OWN_MANAGER', decision='APPROVED',
+        )
+        created_at = timezone.now() - timedelta(days=3)
+        KaizenRequest.objects.filter(pk=self.kaizen.pk).update(
+            created_at=created_at, updated_at=created_at + timedelta(hours=30), export_updated_at=created_at,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def tat(self):
+        response = self.client.get('/api/reports/tat/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['summary']
+
+    def test_child_changes_leave_tat_unchanged(self):
+        before = self.tat()
+        self.assertEqual(before['max_hours'], 30.0)
+
+        self.approval.remarks = 'Checked again'
+        self.approval.save()
+        AuditLog.objects.create(kaizen_request=self.kaizen, user=self.manager, action='EMAIL_SENT')
+        # Notification delivery bulk-creates its audit rows and touches the request itself.
+        AuditLog.objects.bulk_create([AuditLog(kaizen_request=self.kaizen, action='WHATSAPP_SENT')])
+        touch_requests([self.kaizen.pk])
+
+        self.assertEqual(self.tat(), before)
+        self.kaizen.refresh_from_db()
+        self.assertGreater(self.kaizen.export_updated_at, self.kaizen.updated_at)
@@ -1,4 +1,5 @@
 from django.urls import path
+from . import async_views
 from .views import (
     report_dashboard,
     MyKaizenRequestsReport,
@@ -39,4 +40,9 @@ urlpatterns = [
     path('tat/', ApprovalTATReport.as_view(), name='tat_report'),
     path('notifications/', NotificationDeliveryReport.as_view(), name='notifications_report'),
     path('user-activity/', UserActivityReport.as_view(), name='user_activity_report'),
+    # Async versions; serve through kaizen_backend.asgi to benefit.
+    path('async/dashboard/', async_views.report_dashboard, name='async_report_dashboard'),
+    path('async/cost-impact/', async_views.cost_impact_report, name='async_cost_impact_report'),
+    path('async/budget/', async_views.budget_report, name='async_budget_report'),
+    path('async/user-activity/', async_views.user_activity_report, name='async_user_activity_report'),
 ]
@@ -12,12 +12,28 @@ import csv
 import io
 
 from kaizen_requests.models import KaizenRequest
+from kaizen_requests.facets import cost_band_filter
 from approvals.models import ManagerApproval, HodApproval, AgmApproval, GmApproval, DepartmentEvaluation
+from approvals.answers import decode_answers
 from departments.models import Department
 from accounts.models import User
 from audit.models import AuditLog
 
 
+# Costs above these need AGM and GM approval respectively.
+AGM_COST_LIMIT = 50000
+GM_COST_LIMIT = 100000
+
+AVAILABLE_REPORTS = {
+    'INITIATOR': ['my-requests'],
+    'MANAGER': ['my-requests', 'department-summary', 'evaluation-details', 'cross-dept-status'],
+    'HOD': ['my-requests', 'department-summary', 'evaluation-details', 'risk-heatmap', 'cross-dept-status', 'rejection-analysis', 'high-risk', 'sla-delay'],
+    'AGM': ['my-requests', 'department-summary', 'evaluation-details', 'risk-heatmap', 'cross-dept-status', 'rejection-analysis', 'pipeline', 'cost-impact', 'budget', 'manpower-process', 'high-risk', 'compliance', 'audit-trail', 'sla-delay', 'tat'],
+    'GM': ['my-requests', 'department-summary', 'evaluation-details', 'risk-heatmap', 'cross-dept-status', 'rejection-analysis', 'pipeline', 'cost-impact', 'budget', 'manpower-process', 'high-risk', 'compliance', 'audit-trail', 'sla-delay', 'tat'],
+    'ADMIN': ['my-requests', 'department-summary', 'evaluation-details', 'risk-heatmap', 'cross-dept-status', 'rejection-analysis', 'pipeline', 'cost-impact', 'budget', 'manpower-process', 'high-risk', 'compliance', 'audit-trail', 'sla-delay', 'tat', 'notifications', 'user-activity'],
+}
+
+
 def get_role_filter(user, queryset_type='kaizen'):
     """Get queryset filter based on user role.
     
@@ -69,9 +85,9 @@ def apply_role_filter(queryset, user):
     return queryset.filter(role_filter)
 
 
-def apply_common_filters(queryset, request):
-    """Apply common filters to queryset."""
-    params = request.query_params
+def apply_common_filters(queryset, request, exclude=()):
+    """Apply common filters to queryset, skipping parameters named in ``exclude``."""
+    params = {key: value for key, value in request.query_params.items() if key not in exclude}
     
     if params.get('date_from'):
         queryset = queryset.filter(created_at__date__gte=params.get('date_from'))
@@ -85,10 +101,29 @@ def apply_common_filters(queryset, request):
         queryset = queryset.filter(cost_estimate__gte=params.get('cost_min'))
     if params.get('cost_max'):
         queryset = queryset.filter(cost_estimate__lte=params.get('cost_max'))
+    if params.get('cost_band'):
+        queryset = queryset.filter(cost_band_filter(params.get('cost_band')) or Q(pk__in=[]))
+    if params.get('program'):
+        queryset = queryset.filter(program=params.get('program'))
+    if params.get('assembly_line'):
+        queryset = queryset.filter(assembly_line=params.get('assembly_line'))
     if params.get('risk_level'):
-        queryset = queryset.filter(department_evaluations__overall_risk=params.get('risk_level'))
+        # Subquery rather than a join so matching requests are not duplicated
+        # and callers do not need a costly DISTINCT.
+        queryset = queryset.filter(id__in=DepartmentEvaluation.objects.filter(
+            overall_risk=params.get('risk_level')
+        ).values('kaizen_request_id'))
     
-    return queryset.distinct()
+    return queryset
+
+
+def approval_level(cost, requires_process, requires_manpower):
+    """Return the approval level a request's cost and impact require."""
+    if cost > GM_COST_LIMIT:
+        return 'GM'
+    elif cost > AGM_COST_LIMIT or requires_process or requires_manpower:
+        return 'AGM'
+    return 'HOD'
 
 
 def export_csv(data, filename, headers):
@@ -214,17 +249,17 @@ class DepartmentEvaluationDetailReport(APIView):
         
         data = []
         for eval in evals.select_related('kaizen_request', 'evaluator', 'department'):
-            for answer in eval.answers:
+            for answer in decode_answers(eval.answers):
                 data.append({
                     'kaizen_id': eval.kaizen_request.request_id,
                     'evaluator_role': eval.evaluator_role,
                     'evaluator_name': eval.evaluator.get_full_name(),
                     'evaluator_department': eval.department.name,
-                    'question_id': answer.get('questionId', ''),
-                    'question_text': answer.get('questionText', ''),
-                    'answer': answer.get('answer', ''),
-                    'risk_level': answer.get('riskLevel', 'LOW'),
-                    'remarks': answer.get('remarks', ''),
+                    'question_id': answer['questionKey'],
+                    'question_text': answer['questionText'],
+                    'answer': answer['answer'],
+                    'risk_level': answer['riskLevel'],
+                    'remarks': answer['remarks'],
                     'evaluation_date': eval.created_at.isoformat()
                 })
         
@@ -255,24 +290,23 @@ class EvaluationRiskHeatmapReport(APIView):
         question_risk_counts = {}
         monthly_trends = {}
         
-        for eval in evals.select_related('department'):
-            dept_name = eval.department.name
-            month_key = eval.created_at.strftime('%Y-%m')
+        for dept_name, created_at, answers in evals.values_list('department__name', 'created_at', 'answers'):
+            month_key = created_at.strftime('%Y-%m')
             
             if dept_name not in dept_risk_counts:
                 dept_risk_counts[dept_name] = {'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
             if month_key not in monthly_trends:
                 monthly_trends[month_key] = {'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
             
-            for answer in eval.answers:
-                risk = answer.get('riskLevel', 'LOW')
-                q_id = answer.get('questionId', 'unknown')
+            for answer in decode_answers(answers):
+                risk = answer['riskLevel']
+                q_id = answer['questionKey'] or 'unknown'
                 
                 dept_risk_counts[dept_name][risk] += 1
                 monthly_trends[month_key][risk] += 1
                 
                 if q_id not in question_risk_counts:
-                    question_risk_counts[q_id] = {'HIGH': 0, 'MEDIUM': 0, 'LOW': 0, 'text': answer.get('questionText', '')}
+                    question_risk_counts[q_id] = {'HIGH': 0, 'MEDIUM': 0, 'LOW': 0, 'text': answer['questionText']}
                 question_risk_counts[q_id][risk] += 1
         
         high_risk_questions = sorted(
@@ -449,12 +483,6 @@ class CostImpactReport(APIView):
         data = []
         for kr in queryset.select_related('department'):
             cost = float(kr.cost_estimate)
-            if cost > 100000:
-                approval_level = 'GM'
-            elif cost > 50000 or kr.requires_process_addition or kr.requires_manpower_addition:
-                approval_level = 'AGM'
-            else:
-                approval_level = 'HOD'
             
             data.append({
                 'id': kr.id,
@@ -462,7 +490,9 @@ class CostImpactReport(APIView):
                 'title': kr.title,
                 'department': kr.department.name,
                 'cost_estimate': cost,
-                'approval_level_required': approval_level,
+                'approval_level_required': approval_level(
+                    cost, kr.requires_process_addition, kr.requires_manpower_addition
+                ),
                 'status': kr.status,
                 'requires_process': kr.requires_process_addition,
                 'requires_manpower': kr.requires_manpower_addition
@@ -631,32 +661,34 @@ class ComplianceDocumentationReport(APIView):
         queryset = KaizenRequest.objects.all()
         queryset = apply_common_filters(queryset, request)
         
+        # Flags are maintained from attachment document types, so one
+        # grouped query covers every request.
+        rows = queryset.values(
+            'id', 'request_id', 'title', 'department__name', 'status',
+            'has_pfmea', 'has_crr', 'has_checksheet'
+        ).annotate(attachment_count=Count('attachments')).order_by('-created_at')
+        
         data = []
-        for kr in queryset.select_related('department').prefetch_related('attachments'):
-            attachments = list(kr.attachments.values_list('file_name', flat=True))
-            has_pfmea = any('pfmea' in a.lower() for a in attachments)
-            has_crr = any('crr' in a.lower() for a in attachments)
-            has_checksheet = any('check' in a.lower() for a in attachments)
-            
+        for row in rows:
+            missing_docs = [
+                label for label, present in (
+                    ('PFMEA', row['has_pfmea']),
+                    ('CRR', row['has_crr']),
+                    ('Checksheet', row['has_checksheet']),
+                ) if not present
+            ]
             data.append({
-                'id': kr.id,
-                'request_id': kr.request_id,
-                'title': kr.title,
-                'department': kr.department.name,
-                'status': kr.status,
-                'has_pfmea': has_pfmea,
-                'has_crr': has_crr,
-                'has_checksheet': has_checksheet,
-                'attachment_count': len(attachments),
-                'missing_docs': []
+                'id': row['id'],
+                'request_id': row['request_id'],
+                'title': row['title'],
+                'department': row['department__name'],
+                'status': row['status'],
+                'has_pfmea': row['has_pfmea'],
+                'has_crr': row['has_crr'],
+                'has_checksheet': row['has_checksheet'],
+                'attachment_count': row['attachment_count'],
+                'missing_docs': missing_docs
             })
-            
-            if not has_pfmea:
-                data[-1]['missing_docs'].append('PFMEA')
-            if not has_crr:
-                data[-1]['missing_docs'].append('CRR')
-            if not has_checksheet:
-                data[-1]['missing_docs'].append('Checksheet')
         
         incomplete = [d for d in data if d['missing_docs']]
         
@@ -919,19 +951,6 @@ def report_dashboard(request):
     
     recent = queryset.order_by('-created_at')[:5].values('request_id', 'title', 'status', 'created_at')
     
-    available_reports = []
-    
-    if role == 'INITIATOR':
-        available_reports = ['my-requests']
-    elif role == 'MANAGER':
-        available_reports = ['my-requests', 'department-summary', 'evaluation-details', 'cross-dept-status']
-    elif role == 'HOD':
-        available_reports = ['my-requests', 'department-summary', 'evaluation-details', 'risk-heatmap', 'cross-dept-status', 'rejection-analysis', 'high-risk', 'sla-delay']
-    elif role in ['AGM', 'GM']:
-        available_reports = ['my-requests', 'department-summary', 'evaluation-details', 'risk-heatmap', 'cross-dept-status', 'rejection-analysis', 'pipeline', 'cost-impact', 'budget', 'manpower-process', 'high-risk', 'compliance', 'audit-trail', 'sla-delay', 'tat']
-    elif role == 'ADMIN':
-        available_reports = ['my-requests', 'department-summary', 'evaluation-details', 'risk-heatmap', 'cross-dept-status', 'rejection-analysis', 'pipeline', 'cost-impact', 'budget', 'manpower-process', 'high-risk', 'compliance', 'audit-trail', 'sla-delay', 'tat', 'notifications', 'user-activity']
-    
     return Response({
         'summary': {
             'total': total,
@@ -941,5 +960,5 @@ def report_dashboard(request):
         },
         'by_status': by_status,
         'recent': list(recent),
-        'available_reports': available_reports
+        'available_reports': AVAILABLE_REPORTS.get(role, [])
     })
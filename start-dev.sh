@@ -1,5 +1,7 @@
 #!/bin/bash
 
+python manage.py createcachetable
+
 echo "Starting Django backend on port 8000..."
 python manage.py runserver 0.0.0.0:8000 &
 DJANGO_PID=$!